@@ -2,15 +2,26 @@
 
 from __future__ import annotations
 
-from .core import TrueLinkResolver
+from .core import ResolveHandle, TrueLinkResolver
 from .exceptions import TrueLinkException, UnsupportedProviderException
-from .types import FolderResult, LinkResult
+from .filters import CrawlFilter
+from .proxy import ProxyPool
+from .source import SourceAddressPool
+from .types import CrawlProgress, FolderResult, LinkResult, Usage
+from .usage import Budget
 
 __version__ = "1.4.8"
 __all__ = [
+    "Budget",
+    "CrawlFilter",
+    "CrawlProgress",
     "FolderResult",
     "LinkResult",
+    "ProxyPool",
+    "ResolveHandle",
+    "SourceAddressPool",
     "TrueLinkException",
     "TrueLinkResolver",
     "UnsupportedProviderException",
+    "Usage",
 ]
@@ -3,22 +3,64 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import contextvars
+import dataclasses
+import functools
 import importlib
 import pkgutil
 import time
-from collections import OrderedDict
+from collections import Counter, OrderedDict, deque
+from contextvars import ContextVar
 from typing import TYPE_CHECKING, ClassVar
 from urllib.parse import urlparse
 
 from . import resolvers
 from .exceptions import (
+    BudgetExceededException,
     ExtractionFailedException,
     InvalidURLException,
+    RateLimitedException,
     UnsupportedProviderException,
 )
+from .executor import ParsePool, SyncExecutor
+from .limiter import AdaptiveLimiter
+from .monitor import LoopLagMonitor
+from .probe import ProbeEngine
+from .resolvers.base import (
+    PROBE_POLICIES,
+    DeferredResolve,
+    crawl_progress,
+    defer_waits,
+    folder_filter,
+    load_cursor,
+    probe_policy,
+    proxy_route,
+    source_route,
+    usage_meter,
+)
+from .usage import Budget, UsageMeter
 
 if TYPE_CHECKING:
-    from .types import FolderResult, LinkResult
+    from collections.abc import (
+        AsyncIterator,
+        Awaitable,
+        Callable,
+        Generator,
+        Iterable,
+    )
+
+    from .filters import CrawlFilter
+    from .proxy import ProxyPool
+    from .source import SourceAddressPool
+    from .types import CrawlProgress, FolderPage, FolderResult, LinkResult
+
+# Concurrency limit of the resolve_many batch running in the current context
+_batch_limiter: ContextVar[asyncio.Semaphore | None] = ContextVar(
+    "batch_limiter", default=None
+)
+# Highest adaptive limit per provider in that batch, 0 if it does not adapt
+_adaptive_batch: ContextVar[int] = ContextVar("adaptive_batch", default=0)
 
 
 class _CacheEntry:
@@ -108,20 +150,228 @@ class _LRUCache:
         return len(expired_keys)
 
 
+class ResolveHandle:
+    """A resolve submitted with ``TrueLinkResolver.submit``.
+
+    Await the handle for the result. Cancelling it, or cancelling a task that
+    awaits it, drops the resolve from the queue, or stops it if it is already
+    running, folder sub-crawl included.
+    """
+
+    def __init__(
+        self,
+        scheduler: _ResolveScheduler,
+        url: str,
+        priority: int,
+        tenant: str | None,
+        **kwargs: object,
+    ) -> None:
+        """Initialize the handle.
+
+        Args:
+            scheduler: The scheduler the resolve is queued on
+            url: The URL to resolve
+            priority: Lower values run first
+            tenant: Key of the tenant the resolve is for
+            **kwargs: Further keyword arguments for TrueLinkResolver.resolve
+
+        """
+        self.url = url
+        self.priority = priority
+        self.tenant = tenant
+        self._scheduler = scheduler
+        self._kwargs = kwargs
+        # Resolves run in the context they were submitted from
+        self._context = contextvars.copy_context()
+        self._task: asyncio.Task | None = None
+        self._future = asyncio.get_running_loop().create_future()
+        self._future.add_done_callback(self._on_done)
+
+    def _on_done(self, future: asyncio.Future) -> None:
+        if future.cancelled():
+            self._scheduler.discard(self)
+
+    def cancel(self) -> bool:
+        """Cancel the resolve.
+
+        Returns:
+            False if it had already finished, True otherwise
+
+        """
+        return self._future.cancel()
+
+    def done(self) -> bool:
+        """Return whether the resolve finished, failed or was cancelled."""
+        return self._future.done()
+
+    def cancelled(self) -> bool:
+        """Return whether the resolve was cancelled."""
+        return self._future.cancelled()
+
+    def result(self) -> LinkResult | FolderResult:
+        """Return the result of a finished resolve.
+
+        Returns:
+            A LinkResult or FolderResult object
+
+        Raises:
+            asyncio.InvalidStateError: If the resolve has not finished
+            asyncio.CancelledError: If the resolve was cancelled
+
+        """
+        return self._future.result()
+
+    def __await__(self) -> Generator[object, None, LinkResult | FolderResult]:
+        """Wait for the resolve and return its result."""
+        return self._future.__await__()
+
+
+class _ResolveScheduler:
+    """Runs submitted resolves by priority, fairly between tenants.
+
+    Lower priority values run first. Within a priority, tenants take turns in
+    proportion to their weights (stride scheduling): the tenant with the lowest
+    pass value goes next and its pass grows by 1/weight. A tenant that was idle
+    resumes at the pass of the latest dispatch, so idling earns no extra turns.
+    """
+
+    def __init__(
+        self,
+        run: Callable[..., Awaitable[LinkResult | FolderResult]],
+        concurrency: int = 8,
+        tenant_weights: dict[str, float] | None = None,
+    ) -> None:
+        self.run = run
+        self.concurrency = concurrency
+        self.tenant_weights = dict(tenant_weights or {})
+        # Non-empty queues only, per priority and tenant
+        self._queues: dict[int, dict[str | None, deque[ResolveHandle]]] = {}
+        self._passes: dict[tuple[int, str | None], float] = {}
+        self._clock: dict[int, float] = {}
+        self._running: set[ResolveHandle] = set()
+        self._counters = dict.fromkeys(("submitted", "completed", "cancelled"), 0)
+
+    def submit(self, handle: ResolveHandle) -> None:
+        tenants = self._queues.setdefault(handle.priority, {})
+        if handle.tenant not in tenants:
+            key = (handle.priority, handle.tenant)
+            self._passes[key] = max(
+                self._passes.get(key, 0.0), self._clock.get(handle.priority, 0.0)
+            )
+            tenants[handle.tenant] = deque()
+        tenants[handle.tenant].append(handle)
+        self._counters["submitted"] += 1
+        self._dispatch()
+
+    def discard(self, handle: ResolveHandle) -> None:
+        self._counters["cancelled"] += 1
+        if handle._task is not None:  # noqa: SLF001
+            handle._task.cancel()  # noqa: SLF001
+            return
+        tenants = self._queues[handle.priority]
+        tenants[handle.tenant].remove(handle)
+        self._drop_if_empty(handle.priority, handle.tenant)
+
+    def _drop_if_empty(self, priority: int, tenant: str | None) -> None:
+        tenants = self._queues[priority]
+        if tenants[tenant]:
+            return
+        del tenants[tenant]
+        if not tenants:
+            del self._queues[priority]
+        # A pass behind the clock would be raised to it on return anyway
+        if self._passes[priority, tenant] <= self._clock.get(priority, 0.0):
+            del self._passes[priority, tenant]
+
+    def _next(self) -> ResolveHandle | None:
+        if not self._queues:
+            return None
+        priority = min(self._queues)
+        tenant = min(self._queues[priority], key=lambda t: self._passes[priority, t])
+        handle = self._queues[priority][tenant].popleft()
+        self._clock[priority] = self._passes[priority, tenant]
+        self._passes[priority, tenant] += 1 / self.tenant_weights.get(tenant, 1.0)
+        self._drop_if_empty(priority, tenant)
+        return handle
+
+    def _dispatch(self) -> None:
+        while len(self._running) < self.concurrency:
+            handle = self._next()
+            if handle is None:
+                return
+            self._running.add(handle)
+            loop = asyncio.get_running_loop()
+            handle._task = handle._context.run(  # noqa: SLF001
+                loop.create_task, self._execute(handle)
+            )
+
+    async def _execute(self, handle: ResolveHandle) -> None:
+        future = handle._future  # noqa: SLF001
+        try:
+            result = await self.run(
+                handle.url,
+                tenant=handle.tenant,
+                **handle._kwargs,  # noqa: SLF001
+            )
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:  # noqa: BLE001 - handed to the awaiting caller
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(result)
+        finally:
+            self._running.discard(handle)
+            if not future.cancelled():
+                self._counters["completed"] += 1
+            self._dispatch()
+
+    def stats(self) -> dict[str, object]:
+        """Return queue depths and dispatch counts.
+
+        Returns:
+            Dictionary of metric names to values
+
+        """
+        by_tenant: Counter[str | None] = Counter()
+        for tenants in self._queues.values():
+            for tenant, queue in tenants.items():
+                by_tenant[tenant] += len(queue)
+        return {
+            "concurrency": self.concurrency,
+            "running": len(self._running),
+            "queued": {
+                priority: sum(len(queue) for queue in tenants.values())
+                for priority, tenants in sorted(self._queues.items())
+            },
+            "queued_by_tenant": dict(by_tenant),
+            **self._counters,
+        }
+
+
 class TrueLinkResolver:
     """Main resolver class for extracting direct download links."""
 
     _resolvers: ClassVar[dict[str, type]] = {}
     _resolver_instances: ClassVar[dict[str, object]] = {}
     _cache: ClassVar[_LRUCache] = _LRUCache(max_size=1000, ttl=3600)
+    # Samples event loop lag while resolves run, see get_metrics
+    loop_monitor: ClassVar[LoopLagMonitor] = LoopLagMonitor()
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         timeout: int = 30,
         max_retries: int = 3,
         proxy: str | None = None,
         cache_max_size: int = 1000,
         cache_ttl: int = 3600,
+        *,
+        probe: str = "missing",
+        proxy_pool: ProxyPool | None = None,
+        source_pool: SourceAddressPool | None = None,
+        budget: Budget | None = None,
     ) -> None:
         """Initialize TrueLinkResolver.
 
@@ -131,15 +381,51 @@ class TrueLinkResolver:
             proxy (str): Proxy URL (optional)
             cache_max_size (int): Maximum number of entries in cache (default: 1000)
             cache_ttl (int): Cache time-to-live in seconds (default: 3600)
+            probe (str): Default metadata probe policy, one of ``"none"``,
+                ``"missing"`` or ``"always"`` (default: ``"missing"``)
+            proxy_pool (ProxyPool): Pool of proxies to rotate resolves over,
+                instead of a single ``proxy`` (optional)
+            source_pool (SourceAddressPool): Local addresses to spread outbound
+                connections over (optional)
+            budget (Budget): Default limits on the requests, files and bytes of
+                each resolve (optional)
 
         """
+        self._check_probe_policy(probe)
+        if proxy and proxy_pool:
+            msg = "Pass either proxy or proxy_pool, not both"
+            raise ValueError(msg)
         self.timeout = timeout
         self.max_retries = max_retries
         self.proxy = proxy
+        self.proxy_pool = proxy_pool
+        self.source_pool = source_pool
+        self.budget = budget
         self._cache_max_size = cache_max_size
         self._cache_ttl = cache_ttl
+        self.probe = probe
+        self._inflight: dict[
+            tuple[str, Budget | None, object, str | None], asyncio.Future
+        ] = {}
+        self._waiters: Counter[asyncio.Future] = Counter()
+        # Ready times of resolves parked by a provider-imposed wait
+        self._parked: dict[object, float] = {}
+        self._defer_counters = dict.fromkeys(
+            ("deferred", "coalesced", "requeued"), 0
+        )
+        # Adaptive concurrency limits per resolver class, kept across batches
+        self._limiters: dict[type, AdaptiveLimiter] = {}
+        self._scheduler = _ResolveScheduler(self.resolve)
+        # What the resolves of each tenant used, see get_metrics
+        self._tenant_usage: dict[str | None, Counter[str]] = {}
         self._register_resolvers()
 
+    @staticmethod
+    def _check_probe_policy(probe: str) -> None:
+        if probe not in PROBE_POLICIES:
+            msg = f"Invalid probe policy {probe!r}, expected one of {PROBE_POLICIES}"
+            raise ValueError(msg)
+
     @classmethod
     def _register_resolvers(cls) -> None:
         """Dynamically register resolvers."""
@@ -196,49 +482,639 @@ class TrueLinkResolver:
         msg = f"No resolver found for domain: {domain}"
         raise UnsupportedProviderException(msg)
 
-    async def resolve(
-        self, url: str, *, use_cache: bool = False
+    async def resolve(  # noqa: PLR0913
+        self,
+        url: str,
+        *,
+        use_cache: bool = False,
+        probe: str | None = None,
+        budget: Budget | None = None,
+        tenant: str | None = None,
+        crawl_filter: CrawlFilter | None = None,
+        progress: Callable[[CrawlProgress], object] | None = None,
     ) -> LinkResult | FolderResult:
         """Resolve a URL to direct download link(s) and return as a LinkResult or FolderResult object.
 
         Args:
             url: The URL to resolve
             use_cache: Whether to use the cache
+            probe: Metadata probe policy for this resolve. ``"none"`` skips the
+                HEAD/ranged-GET requests used to learn filename, size and MIME type,
+                ``"missing"`` only makes them when the provider did not report the
+                filename or size, and ``"always"`` always makes them. Defaults to
+                the policy given to the constructor.
+            budget: Limits on the requests, files and bytes of this resolve.
+                A folder resolve that runs out returns the files found so far,
+                with ``usage.exhausted`` set. Defaults to the budget given to
+                the constructor.
+            tenant: Key of the tenant whose usage the resolve counts towards,
+                see get_metrics (optional)
+            crawl_filter: Files of a folder to resolve. Files and subfolders
+                it rules out are skipped during the crawl, without probing
+                them, and a folder with no matching files gives an empty
+                result (optional)
+            progress: Called with a CrawlProgress as a folder crawl lists
+                folders and finds files (optional)
 
         Returns:
-            A LinkResult or FolderResult object.
+            A LinkResult or FolderResult object, with the requests, bytes and
+            time the resolve used in its ``usage``.
 
         Raises:
             InvalidURLException: If URL is invalid
             UnsupportedProviderException: If provider is not supported
             ExtractionFailedException: If extraction fails after all retries
+            BudgetExceededException: If the budget runs out before a result
 
         """
+        probe = probe or self.probe
+        self._check_probe_policy(probe)
+        cache_key = f"{probe}:{url}"
+        if crawl_filter is not None:
+            cache_key += f"|{crawl_filter!r}"
         if use_cache:
-            cached_result = self._cache.get(url)
+            cached_result = self._cache.get(cache_key)
             if cached_result is not None:
                 return cached_result
 
         resolver_instance = self._get_resolver(url)
+        budget = budget or self.budget
+        # Identical resolves in flight share one task, and so share its waits.
+        # Usage is billed to the tenant of the task, so tenants never share one
+        inflight_key = (cache_key, budget, progress, tenant)
+        task = self._inflight.get(inflight_key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(
+                self._resolve_shared(
+                    resolver_instance,
+                    url,
+                    probe,
+                    cache_key if use_cache else None,
+                    budget=budget,
+                    tenant=tenant,
+                    crawl_filter=crawl_filter,
+                    progress=progress,
+                )
+            )
+            self._inflight[inflight_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(inflight_key, None))
+        else:
+            self._defer_counters["coalesced"] += 1
+        # Shielded so one cancelled caller does not cancel the others, but the
+        # last one to give up cancels the resolve, folder sub-crawl included
+        self._waiters[task] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[task] == 1:
+                task.cancel()
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+
+    async def resolve_many(  # noqa: PLR0913
+        self,
+        urls: Iterable[str],
+        *,
+        concurrency: int = 8,
+        use_cache: bool = False,
+        probe: str | None = None,
+        max_wait: float = 300,
+        adaptive: bool = False,
+        budget: Budget | None = None,
+        tenant: str | None = None,
+        crawl_filter: CrawlFilter | None = None,
+    ) -> list[LinkResult | FolderResult | Exception]:
+        """Resolve several URLs concurrently.
+
+        At most ``concurrency`` resolves run at a time. A resolve waiting on a
+        provider-imposed delay (MediaFile's 60 seconds, for example) is parked
+        and does not count against the limit, so the rest of the batch keeps
+        going. Duplicate URLs are resolved once.
+
+        A URL whose host answers with RateLimitedException is re-queued for when
+        the host allows it again, and other URLs of that host wait as well. This
+        happens as long as the URL's total wait stays within ``max_wait``.
+
+        With ``adaptive``, each provider also gets its own limit within
+        ``concurrency``, which grows while its resolves stay fast and successful
+        and is cut when it rate limits, times out or slows down. The limits are
+        kept for later batches and reported by get_metrics.
+
+        Args:
+            urls: The URLs to resolve
+            concurrency: Maximum number of resolves running at a time
+            use_cache: Whether to use the cache
+            probe: Metadata probe policy, see resolve
+            max_wait: Seconds a URL may spend waiting on rate limits before its
+                RateLimitedException is returned instead (default: 300)
+            adaptive: Whether to limit each provider's concurrency adaptively
+            budget: Limits for each resolve, see resolve
+            tenant: Key of the tenant the resolves count towards, see resolve
+            crawl_filter: Files of each folder to resolve, see resolve
+
+        Returns:
+            One entry per URL, in order: the result, or the exception that
+            resolving it raised
 
+        """
+        urls = list(urls)
+        unique = list(dict.fromkeys(urls))
+        # Monotonic time until which each rate-limited host is left alone
+        blocked_until: dict[str, float] = {}
+        limiter_token = _batch_limiter.set(asyncio.Semaphore(concurrency))
+        adaptive_token = _adaptive_batch.set(concurrency if adaptive else 0)
+        try:
+            results = await asyncio.gather(
+                *(
+                    self._resolve_queued(
+                        url,
+                        blocked_until,
+                        max_wait,
+                        use_cache=use_cache,
+                        probe=probe,
+                        budget=budget,
+                        tenant=tenant,
+                        crawl_filter=crawl_filter,
+                    )
+                    for url in unique
+                ),
+                return_exceptions=True,
+            )
+        finally:
+            _adaptive_batch.reset(adaptive_token)
+            _batch_limiter.reset(limiter_token)
+        by_url = dict(zip(unique, results, strict=True))
+        return [by_url[url] for url in urls]
+
+    def submit(  # noqa: PLR0913
+        self,
+        url: str,
+        *,
+        priority: int = 0,
+        tenant: str | None = None,
+        use_cache: bool = False,
+        probe: str | None = None,
+        budget: Budget | None = None,
+        crawl_filter: CrawlFilter | None = None,
+    ) -> ResolveHandle:
+        """Queue a URL on the scheduler and return a handle to its resolve.
+
+        Resolves with a lower ``priority`` run first, so interactive requests
+        submitted at 0 overtake a backfill submitted at 10. Within a priority,
+        tenants share the slots in proportion to their weights (see
+        configure_scheduler), so one tenant's bulk work cannot crowd out
+        another's. Must be called with an event loop running.
+
+        Args:
+            url: The URL to resolve
+            priority: Lower values run first (default: 0)
+            tenant: Key of the tenant the resolve is for (optional)
+            use_cache: Whether to use the cache
+            probe: Metadata probe policy, see resolve
+            budget: Limits for the resolve, see resolve
+            crawl_filter: Files of a folder to resolve, see resolve
+
+        Returns:
+            A ResolveHandle; await it for the result, or cancel it
+
+        """
+        self._check_probe_policy(probe or self.probe)
+        handle = ResolveHandle(
+            self._scheduler,
+            url,
+            priority,
+            tenant,
+            use_cache=use_cache,
+            probe=probe,
+            budget=budget,
+            crawl_filter=crawl_filter,
+        )
+        self._scheduler.submit(handle)
+        return handle
+
+    async def resolve_page(  # noqa: PLR0913
+        self,
+        url: str,
+        cursor: str | None = None,
+        *,
+        limit: int = 100,
+        probe: str | None = None,
+        budget: Budget | None = None,
+        tenant: str | None = None,
+        crawl_filter: CrawlFilter | None = None,
+    ) -> FolderPage:
+        """Resolve one page of the files of a large folder.
+
+        Pages continue from each other through their cursors, so a folder can
+        be split across calls, jobs or processes, each resolving a page and
+        handing its cursor on. Supported for GoFile, LinkBox and MediaFire
+        folders. Pages are not cached.
+
+        Args:
+            url: The folder URL
+            cursor: The ``cursor`` of the previous page, or None for the first
+            limit: Files per page at most (default: 100)
+            probe: Metadata probe policy, see resolve
+            budget: Limits for the page, see resolve. A page that runs out
+                returns the files found so far, with a cursor for the rest.
+            tenant: Key of the tenant the page counts towards, see resolve
+            crawl_filter: Files of the folder to resolve, see resolve. Its
+                ``max_files`` does not apply; use ``limit``.
+
+        Returns:
+            A FolderPage; its ``cursor`` is None after the last page
+
+        Raises:
+            ValueError: If the cursor is malformed or from another URL, or the
+                limit is below 1
+            UnsupportedProviderException: If the provider does not support
+                paged folders
+
+        """
+        probe = probe or self.probe
+        self._check_probe_policy(probe)
+        if limit < 1:
+            msg = f"Page limit must be at least 1, got {limit}"
+            raise ValueError(msg)
+        state = load_cursor(url, cursor)
+        resolver_instance = self._get_resolver(url)
+        if not resolver_instance.PAGES_FOLDERS:
+            msg = f"{type(resolver_instance).__name__} does not support paged folder resolves"
+            raise UnsupportedProviderException(msg)
+        if crawl_filter is not None and crawl_filter.max_files is not None:
+            crawl_filter = dataclasses.replace(crawl_filter, max_files=None)
+        return await self._resolve_shared(
+            resolver_instance,
+            url,
+            probe,
+            None,
+            budget=budget or self.budget,
+            tenant=tenant,
+            crawl_filter=crawl_filter,
+            call=functools.partial(
+                resolver_instance.resolve_page, url, state, limit
+            ),
+        )
+
+    def configure_scheduler(
+        self,
+        concurrency: int = 8,
+        tenant_weights: dict[str, float] | None = None,
+    ) -> None:
+        """Configure the scheduler behind submit.
+
+        Args:
+            concurrency: Maximum number of submitted resolves running at a time
+                (default: 8)
+            tenant_weights: Share of the slots each tenant gets relative to the
+                others; tenants not listed, and resolves without a tenant, weigh
+                1 (optional)
+
+        """
+        self._scheduler.concurrency = concurrency
+        self._scheduler.tenant_weights = dict(tenant_weights or {})
+
+    async def _resolve_queued(
+        self,
+        url: str,
+        blocked_until: dict[str, float],
+        max_wait: float,
+        **kwargs: object,
+    ) -> LinkResult | FolderResult:
+        host = urlparse(url).hostname or ""
+        deadline = time.monotonic() + max_wait
+        while True:
+            delay = blocked_until.get(host, 0) - time.monotonic()
+            if delay > 0:
+                await self._park(delay)
+            try:
+                return await self.resolve(url, **kwargs)
+            except RateLimitedException as e:
+                if e.retry_after is None:
+                    raise
+                # At least a second, so a host sending Retry-After: 0 is not
+                # hammered until the deadline
+                ready = time.monotonic() + max(e.retry_after, 1.0)
+                if ready > deadline:
+                    raise
+                blocked_until[host] = max(blocked_until.get(host, 0), ready)
+                self._defer_counters["requeued"] += 1
+
+    async def _resolve_shared(  # noqa: PLR0913
+        self,
+        resolver_instance: object,
+        url: str,
+        probe: str,
+        cache_key: str | None,
+        *,
+        budget: Budget | None,
+        tenant: str | None,
+        crawl_filter: CrawlFilter | None,
+        call: Callable[[], Awaitable[FolderPage]] | None = None,
+        progress: Callable[[CrawlProgress], object] | None = None,
+    ) -> LinkResult | FolderResult | FolderPage:
+        # Runs as its own task, in a copy of the caller's context
+        probe_policy.set(probe)
+        folder_filter.set(crawl_filter)
+        crawl_progress.set(progress)
+        defer_waits.set(True)
+        meter = UsageMeter(budget)
+        usage_meter.set(meter)
+        try:
+            async with self.loop_monitor.track():
+                try:
+                    result = await self._resolve_with_retries(
+                        resolver_instance, url, cache_key, call
+                    )
+                except Exception as e:
+                    if meter.exhausted is None:
+                        raise
+                    result = self._partial_result(meter, e)
+            # On a copy, so the cached result does not carry this resolve's usage
+            return dataclasses.replace(result, usage=meter.usage(result))
+        finally:
+            self._charge(tenant, meter)
+
+    @staticmethod
+    def _partial_result(meter: UsageMeter, error: Exception) -> FolderResult:
+        # A folder crawl cut short by the budget returns what it found so far
+        if meter.partial is not None and meter.partial.contents:
+            return meter.partial
+        if isinstance(error, BudgetExceededException):
+            raise error
+        msg = f"Resolve budget exhausted ({meter.exhausted}) before any result"
+        raise BudgetExceededException(msg) from error
+
+    @staticmethod
+    def _budget_spent() -> bool:
+        meter = usage_meter.get()
+        return meter is not None and meter.exhausted is not None
+
+    def _charge(self, tenant: str | None, meter: UsageMeter) -> None:
+        usage = self._tenant_usage.setdefault(tenant, Counter())
+        usage["resolves"] += 1
+        usage["requests"] += meter.requests
+        usage["bytes_read"] += meter.bytes_read
+        usage["files"] += meter.files
+        usage["wall_time"] += meter.elapsed()
+        usage["exhausted"] += meter.exhausted is not None
+
+    async def _resolve_with_retries(
+        self,
+        resolver_instance: object,
+        url: str,
+        cache_key: str | None,
+        call: Callable[[], Awaitable[FolderPage]] | None = None,
+    ) -> LinkResult | FolderResult | FolderPage:
         for attempt in range(self.max_retries):
             try:
-                async with resolver_instance:
-                    result = await resolver_instance.resolve(url)
-                    if use_cache:
-                        self._cache.set(url, result)
-                    return result
+                result = await self._run_resolver(resolver_instance, url, call)
+            except RateLimitedException:
+                # Retrying within seconds only spends the quota again
+                raise
             except ExtractionFailedException:
-                if attempt == self.max_retries - 1:
+                # Retrying cannot help once the budget is spent
+                if attempt == self.max_retries - 1 or self._budget_spent():
                     raise
                 await asyncio.sleep(1 * (attempt + 1))
             except Exception as e:
+                if self._budget_spent():
+                    raise
                 if attempt == self.max_retries - 1:
                     msg = f"Failed to resolve URL after {self.max_retries} attempts: {e!s}"
                     raise ExtractionFailedException(msg) from e
                 await asyncio.sleep(1 * (attempt + 1))
+            else:
+                # A result truncated by the budget or missing subfolders is not
+                # complete enough to reuse
+                if (
+                    cache_key is not None
+                    and not self._budget_spent()
+                    and not getattr(result, "errors", None)
+                ):
+                    self._cache.set(cache_key, result)
+                return result
         return None
 
+    async def _run_resolver(
+        self,
+        resolver_instance: object,
+        url: str,
+        call: Callable[[], Awaitable[FolderPage]] | None = None,
+    ) -> LinkResult | FolderResult | FolderPage:
+        call = call or functools.partial(resolver_instance.resolve, url)
+        routed = False
+        # The resolver context spans the waits: a deferred step needs the
+        # cookies the earlier steps collected in the session
+        with contextlib.ExitStack() as route_stack:
+            async with resolver_instance:
+                while True:
+                    try:
+                        async with self._batch_slot(resolver_instance):
+                            if not routed:
+                                self._route(url, route_stack)
+                                routed = True
+                            return await call()
+                    except DeferredResolve as deferred:
+                        delay, call = deferred.delay, deferred.callback
+                    # Parked outside the limiters, so no batch or provider slot
+                    # is held while waiting
+                    await self._park(delay)
+
+    @contextlib.asynccontextmanager
+    async def _batch_slot(self, resolver_instance: object) -> AsyncIterator[None]:
+        batch = _batch_limiter.get() or contextlib.nullcontext()
+        max_limit = _adaptive_batch.get()
+        if not max_limit:
+            async with batch:
+                yield
+            return
+
+        provider = self._limiters.get(type(resolver_instance))
+        if provider is None:
+            provider = self._limiters[type(resolver_instance)] = AdaptiveLimiter()
+        # Beyond the batch limit a provider would only grow on resolves waiting
+        # for a batch slot
+        provider.max_limit = max_limit
+        provider.limit = min(provider.limit, max_limit)
+        # The provider slot comes first, so URLs of a provider at its limit do
+        # not hold batch slots other providers could use
+        await provider.acquire()
+        outcome = None
+        start = time.monotonic()
+        try:
+            async with batch:
+                start = time.monotonic()
+                try:
+                    yield
+                except DeferredResolve:
+                    # The wait is the provider's policy, not a sign of load
+                    raise
+                except Exception as e:
+                    outcome = "overload" if self._is_overload(e) else "error"
+                    raise
+                outcome = "ok"
+        finally:
+            provider.release(outcome, time.monotonic() - start)
+
+    @staticmethod
+    def _is_overload(error: BaseException | None) -> bool:
+        # Resolvers often wrap the timeout in an ExtractionFailedException
+        while error is not None:
+            if isinstance(error, RateLimitedException | TimeoutError):
+                return True
+            error = error.__cause__ or error.__context__
+        return False
+
+    def _route(self, url: str, route_stack: contextlib.ExitStack) -> None:
+        # Picked once a slot is free, so the picks reflect the latest health
+        # reports and load. They are kept for continuations, so cookies and
+        # tokens of the attempt stay on one proxy and address.
+        if self.proxy_pool is not None:
+            proxy_route.set((self.proxy_pool, self.proxy_pool.select(url)))
+        if self.source_pool is not None:
+            address = self.source_pool.select(url)
+            source_route.set((self.source_pool, address))
+            route_stack.enter_context(self.source_pool.use(address, url))
+
+    async def _park(self, delay: float) -> None:
+        token = object()
+        self._parked[token] = time.monotonic() + delay
+        self._defer_counters["deferred"] += 1
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            del self._parked[token]
+
+    @classmethod
+    def configure_sync_executor(
+        cls, max_workers: int = 8, max_scrapers: int = 8
+    ) -> None:
+        """Replace the thread pool used for blocking scraper work.
+
+        Args:
+            max_workers: Maximum number of worker threads (default: 8)
+            max_scrapers: Maximum number of warm scrapers kept per proxy and
+                source address (default: 8)
+
+        """
+        previous = resolvers.BaseResolver.sync_executor
+        resolvers.BaseResolver.sync_executor = SyncExecutor(
+            max_workers=max_workers, max_scrapers=max_scrapers
+        )
+        previous.shutdown()
+
+    @classmethod
+    def configure_parse_pool(
+        cls, max_workers: int = 0, inline_bytes: int = 128 * 1024
+    ) -> None:
+        """Configure where large pages are parsed.
+
+        Pages up to ``inline_bytes`` are parsed on the event loop. Larger ones are
+        parsed on a worker thread, or in a worker process when ``max_workers`` is
+        set. Worker processes import the program's main module, which must then
+        guard its entry point with ``if __name__ == "__main__"``.
+
+        Args:
+            max_workers: Maximum number of parser processes, 0 to parse on
+                threads only (default: 0)
+            inline_bytes: Largest page parsed on the event loop (default: 128 KiB)
+
+        """
+        previous = resolvers.BaseResolver.parse_pool
+        resolvers.BaseResolver.parse_pool = ParsePool(max_workers=max_workers)
+        resolvers.BaseResolver.INLINE_PARSE_BYTES = inline_bytes
+        previous.shutdown()
+
+    @classmethod
+    def configure_probe_engine(
+        cls,
+        per_host_limit: int = 8,
+        cache_ttl: float = 60,
+        cache_max_size: int = 1000,
+        sniff_bytes: int = 0,
+    ) -> None:
+        """Replace the engine used for filename/size/MIME type probes.
+
+        Args:
+            per_host_limit: Maximum number of concurrent probes per host (default: 8)
+            cache_ttl: Seconds a probe result is reused (default: 60)
+            cache_max_size: Maximum number of cached probe results (default: 1000)
+            sniff_bytes: Leading bytes fetched to identify the content type when
+                the server sends none or ``application/octet-stream``. 4096 covers
+                common video, archive, image and PDF files; ISO images need
+                32774. 0 disables sniffing (default: 0)
+
+        """
+        resolvers.BaseResolver.probe_engine = ProbeEngine(
+            per_host_limit=per_host_limit,
+            cache_ttl=cache_ttl,
+            cache_max_size=cache_max_size,
+            sniff_bytes=sniff_bytes,
+        )
+
+    def get_metrics(self) -> dict[str, dict]:
+        """Get runtime metrics.
+
+        Returns:
+            Dictionary with one entry per component:
+
+            - ``sync_executor``: queue depth, wait times and scraper reuse of the
+              blocking-work pool
+            - ``probe``: probe cache hits, coalesced probes and skipped HEAD
+              requests
+            - ``event_loop``: event loop lag in seconds while resolves run
+            - ``parse``: documents parsed inline, on worker threads and in
+              worker processes
+            - ``deferred``: resolves parked by a provider-imposed wait or a rate
+              limit, seconds until the earliest is ready, identical resolves
+              that shared one in flight and rate-limited URLs re-queued by
+              resolve_many
+            - ``proxy``: health of each proxy in the pool
+            - ``source_address``: usage of each local address in the pool
+            - ``adaptive``: concurrency limit, in-flight and waiting resolves,
+              average latency and limit changes per resolver class
+            - ``scheduler``: resolves queued per priority and per tenant,
+              running, and submitted, completed and cancelled through submit
+            - ``usage``: resolves, requests, bytes read, files, wall time and
+              resolves cut short by their budget, per tenant
+
+        Notes:
+            ``proxy`` and ``source_address`` are empty without a pool.
+            ``adaptive`` only lists resolver classes limited by
+            ``resolve_many(adaptive=True)``. In ``usage``, resolves without a
+            tenant are counted under None.
+
+        """
+        return {
+            "sync_executor": resolvers.BaseResolver.sync_executor.stats(),
+            "probe": resolvers.BaseResolver.probe_engine.stats(),
+            "event_loop": self.loop_monitor.stats(),
+            "parse": dict(resolvers.BaseResolver.parse_counters),
+            "deferred": {
+                **self._defer_counters,
+                "parked": len(self._parked),
+                "earliest_ready": max(
+                    0.0, min(self._parked.values()) - time.monotonic()
+                )
+                if self._parked
+                else None,
+            },
+            "proxy": self.proxy_pool.stats() if self.proxy_pool else {},
+            "source_address": self.source_pool.stats() if self.source_pool else {},
+            "adaptive": {
+                resolver_class.__name__: limiter.stats()
+                for resolver_class, limiter in self._limiters.items()
+            },
+            "scheduler": self._scheduler.stats(),
+            "usage": {
+                tenant: dict(usage) for tenant, usage in self._tenant_usage.items()
+            },
+        }
+
     @classmethod
     def clear_cache(cls) -> None:
         """Clear all entries from the cache."""
@@ -17,3 +17,25 @@ class InvalidURLException(TrueLinkException):
 
 class ExtractionFailedException(TrueLinkException):
     """Raised when link extraction fails."""
+
+
+class RateLimitedException(ExtractionFailedException):
+    """Raised when the provider asks to retry later.
+
+    Attributes:
+        retry_after: Seconds to wait before retrying, or None if unknown
+
+    """
+
+    def __init__(self, msg: str, retry_after: float | None = None) -> None:
+        """Initialize with a message and the delay the provider asked for."""
+        super().__init__(msg)
+        self.retry_after = retry_after
+
+
+class BudgetExceededException(TrueLinkException):
+    """Raised when a resolve runs out of its budget before finding anything.
+
+    A folder resolve that found files before its budget ran out returns them
+    instead, see ``Usage.exhausted``.
+    """
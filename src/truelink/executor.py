@@ -0,0 +1,346 @@
+"""Dedicated pools for blocking and CPU-bound work, and scraper reuse."""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager, contextmanager
+from typing import TYPE_CHECKING, TypeVar
+
+import cloudscraper
+from requests.adapters import HTTPAdapter
+
+from truelink.exceptions import TrueLinkException
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable, Iterator
+
+T = TypeVar("T")
+
+
+class _SourceAdapter(HTTPAdapter):
+    """Plain HTTP adapter whose connections are made from a local address."""
+
+    def __init__(self, source_address: str) -> None:
+        self.source_address = (source_address, 0)
+        super().__init__()
+
+    def init_poolmanager(self, *args: object, **kwargs: object) -> None:
+        kwargs["source_address"] = self.source_address
+        super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, *args: object, **kwargs: object) -> object:
+        kwargs["source_address"] = self.source_address
+        return super().proxy_manager_for(*args, **kwargs)
+
+
+class SyncExecutor:
+    """Bounded thread pool for blocking calls with a pool of warm scrapers.
+
+    Blocking work (cloudscraper requests) runs on a dedicated pool instead of the
+    event loop's default executor. Scraper sessions are kept after use so that
+    Cloudflare clearance cookies and connection pools survive between resolves.
+    """
+
+    def __init__(self, max_workers: int = 8, max_scrapers: int = 8) -> None:
+        """Initialize the executor.
+
+        Args:
+            max_workers: Maximum number of worker threads
+            max_scrapers: Maximum number of idle scrapers kept per proxy and
+                source address
+
+        """
+        self.max_workers = max_workers
+        self.max_scrapers = max_scrapers
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._idle: dict[
+            tuple[str | None, str | None], list[cloudscraper.CloudScraper]
+        ] = {}
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._scrapers_created = 0
+        self._scrapers_reused = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="truelink-sync",
+                )
+            return self._executor
+
+    async def run(
+        self, func: Callable[..., T], *args: object, **kwargs: object
+    ) -> T:
+        """Run a blocking callable on the pool and await its result.
+
+        Args:
+            func: Callable to run
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            The value returned by func
+
+        """
+        submitted = time.monotonic()
+
+        def call() -> T:
+            waited = time.monotonic() - submitted
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+
+        def on_done(future: Future) -> None:
+            # Jobs cancelled while still queued never reach call()
+            if future.cancelled():
+                with self._lock:
+                    self._queued -= 1
+
+        with self._lock:
+            self._queued += 1
+        future = self._get_executor().submit(call)
+        future.add_done_callback(on_done)
+        return await asyncio.wrap_future(future)
+
+    @asynccontextmanager
+    async def scraper(
+        self, proxy: str | None = None, source_address: str | None = None
+    ) -> AsyncIterator[cloudscraper.CloudScraper]:
+        """Borrow a scraper session from the pool.
+
+        Scrapers are pooled per proxy and source address. The scraper is returned
+        to the pool afterwards. It is discarded instead if the body raises
+        anything other than a TrueLink error, since its state may be unusable
+        after a transport failure.
+
+        Args:
+            proxy: Proxy URL the scraper should use (optional)
+            source_address: Local address to connect from (optional)
+
+        Yields:
+            A cloudscraper session
+
+        """
+        key = (proxy, source_address)
+        scraper = self._checkout(key)
+        if scraper is None:
+            scraper = await self.run(self._create_scraper, proxy, source_address)
+        try:
+            yield scraper
+        except TrueLinkException:
+            self._checkin(key, scraper)
+            raise
+        except BaseException:
+            scraper.close()
+            raise
+        self._checkin(key, scraper)
+
+    def _create_scraper(
+        self, proxy: str | None, source_address: str | None
+    ) -> cloudscraper.CloudScraper:
+        # cloudscraper binds its own HTTPS adapter; plain HTTP gets one here
+        scraper = cloudscraper.create_scraper(source_address=source_address)
+        if source_address:
+            scraper.mount("http://", _SourceAdapter(source_address))
+        if proxy:
+            scraper.proxies = {"http": proxy, "https": proxy}
+        with self._lock:
+            self._scrapers_created += 1
+        return scraper
+
+    def _checkout(
+        self, key: tuple[str | None, str | None]
+    ) -> cloudscraper.CloudScraper | None:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                self._scrapers_reused += 1
+                return idle.pop()
+        return None
+
+    def _checkin(
+        self, key: tuple[str | None, str | None], scraper: cloudscraper.CloudScraper
+    ) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_scrapers:
+                idle.append(scraper)
+                return
+        scraper.close()
+
+    def stats(self) -> dict[str, int | float]:
+        """Return queue-depth, wait-time and scraper reuse metrics.
+
+        Returns:
+            Dictionary of metric names to values
+
+        """
+        with self._lock:
+            started = self._completed + self._running
+            return {
+                "max_workers": self.max_workers,
+                "queued": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+                "wait_avg": self._wait_total / started if started else 0.0,
+                "wait_max": self._wait_max,
+                "scrapers_idle": sum(len(idle) for idle in self._idle.values()),
+                "scrapers_created": self._scrapers_created,
+                "scrapers_reused": self._scrapers_reused,
+            }
+
+    def shutdown(self) -> None:
+        """Close idle scrapers and stop the worker threads."""
+        with self._lock:
+            scrapers = [s for idle in self._idle.values() for s in idle]
+            self._idle.clear()
+            executor, self._executor = self._executor, None
+        for scraper in scrapers:
+            scraper.close()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ThreadLanes:
+    """Fixed set of single-thread executors for work pinned to one thread.
+
+    An incremental parser must not be used from several threads, so all calls
+    of one parse go to the same lane. Lanes are shared between parses and
+    started on first use; a parse takes the lane with the fewest parses on it.
+    """
+
+    def __init__(self, lanes: int = 4) -> None:
+        """Initialize the lanes.
+
+        Args:
+            lanes: Number of lanes, each running one thread
+
+        """
+        self._executors: list[ThreadPoolExecutor | None] = [None] * lanes
+        self._users = [0] * lanes
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def lane(self) -> Iterator[ThreadPoolExecutor]:
+        """Borrow the least busy lane for the duration of a parse.
+
+        Yields:
+            A single-thread executor
+
+        """
+        with self._lock:
+            index = min(range(len(self._users)), key=self._users.__getitem__)
+            executor = self._executors[index]
+            if executor is None:
+                executor = self._executors[index] = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="truelink-parse"
+                )
+            self._users[index] += 1
+        try:
+            yield executor
+        finally:
+            with self._lock:
+                self._users[index] -= 1
+
+    def shutdown(self) -> None:
+        """Stop the lane threads."""
+        with self._lock:
+            executors, self._executors = self._executors, [None] * len(self._users)
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ParsePool:
+    """Process pool for CPU-bound parsing of large documents.
+
+    Regex scans and pure-Python parsers hold the GIL, so running them on a worker
+    thread would still stall the event loop. They run in worker processes
+    instead, which means the function and its arguments must be picklable:
+    module-level functions, static methods and class methods qualify.
+
+    Worker processes import the main module of the program, so a script using
+    the pool must guard its entry point with ``if __name__ == "__main__"``. The
+    pool is disabled with ``max_workers=0``.
+    """
+
+    def __init__(self, max_workers: int = 0) -> None:
+        """Initialize the pool.
+
+        Args:
+            max_workers: Maximum number of worker processes, 0 to disable
+
+        """
+        self.max_workers = max_workers
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Forking a process that runs threads can deadlock the child
+                methods = multiprocessing.get_all_start_methods()
+                method = "forkserver" if "forkserver" in methods else "spawn"
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(method),
+                )
+            return self._executor
+
+    def _start(self) -> ProcessPoolExecutor:
+        executor = self._get_executor()
+        for future in [executor.submit(int) for _ in range(self.max_workers)]:
+            future.result()
+        return executor
+
+    async def run(self, func: Callable[..., T], *args: object) -> T:
+        """Run a function in a worker process and await its result.
+
+        If the pool is broken (a worker died), the function runs inline and the
+        pool is replaced for the next call.
+
+        Args:
+            func: Picklable callable to run
+            *args: Picklable positional arguments for func
+
+        Returns:
+            The value returned by func
+
+        """
+        executor = self._executor
+        if executor is None:
+            # Starting the worker processes blocks, keep that off the loop
+            executor = await asyncio.to_thread(self._start)
+        try:
+            return await asyncio.wrap_future(executor.submit(func, *args))
+        except BrokenProcessPool:
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            return func(*args)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
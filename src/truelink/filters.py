@@ -0,0 +1,110 @@
+"""Filters applied to folder contents while they are crawled."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+
+
+def _parts(path: str) -> tuple[str, ...]:
+    return tuple(part for part in path.split("/") if part)
+
+
+def _within(path: str, prefix: str) -> bool:
+    """Whether ``path`` is ``prefix`` or lies below it."""
+    parts, prefix_parts = _parts(path), _parts(prefix)
+    return parts[: len(prefix_parts)] == prefix_parts
+
+
+@dataclass(frozen=True)
+class CrawlFilter:
+    """Which files of a folder to resolve; None and empty mean no restriction.
+
+    Folder resolvers check the filter as they walk a share, before they probe a
+    file or request its download token, and skip subfolders it rules out
+    without listing them. Paths are relative to the top of the share, with
+    ``/`` between folder names.
+
+    Patterns are shell-style globs matched case-insensitively. A pattern with a
+    ``/`` is matched against the file's path and name (``Season 1/*.mkv``),
+    others against the name alone.
+
+    Attributes:
+        include (tuple[str, ...]): Resolve only files matching one of these.
+        exclude (tuple[str, ...]): Skip files matching one of these, and
+            subfolders whose name or path matches one.
+        min_size (int, optional): Skip files smaller than this many bytes.
+            Files whose size the provider does not list are probed first.
+        path_prefix (str, optional): Resolve only files in this subfolder.
+        max_files (int, optional): Stop the crawl after this many files.
+        max_depth (int, optional): Subfolder levels to descend into; 0 keeps
+            to the top folder.
+
+    """
+
+    include: tuple[str, ...] = ()
+    exclude: tuple[str, ...] = ()
+    min_size: int | None = None
+    path_prefix: str | None = None
+    max_files: int | None = None
+    max_depth: int | None = None
+
+    def __post_init__(self) -> None:
+        """Accept a single pattern or any iterable of patterns."""
+        for name in ("include", "exclude"):
+            value = getattr(self, name)
+            patterns = (value,) if isinstance(value, str) else tuple(value)
+            object.__setattr__(self, name, tuple(p.lower() for p in patterns))
+
+    @staticmethod
+    def _match(patterns: tuple[str, ...], name: str, path: str) -> bool:
+        full = f"{path}/{name}" if path else name
+        return any(
+            fnmatchcase((full if "/" in pattern else name).lower(), pattern)
+            for pattern in patterns
+        )
+
+    def visits(self, path: str) -> bool:
+        """Whether to crawl the subfolder at a path.
+
+        Args:
+            path: Path of the subfolder, including its name
+
+        Returns:
+            False if no file below the subfolder can pass the filter
+
+        """
+        parts = _parts(path)
+        if self.max_depth is not None and len(parts) > self.max_depth:
+            return False
+        if self.path_prefix and not (
+            _within(path, self.path_prefix) or _within(self.path_prefix, path)
+        ):
+            return False
+        parent = "/".join(parts[:-1])
+        return not (parts and self._match(self.exclude, parts[-1], parent))
+
+    def accepts(
+        self, filename: str | None, size: int | None, path: str = ""
+    ) -> bool:
+        """Whether to resolve a file.
+
+        Args:
+            filename: Name of the file, or None if not known yet
+            size: Size of the file in bytes, or None if not known yet
+            path: Path of the folder holding the file
+
+        Returns:
+            False if the file fails a check that could be made; checks on an
+            unknown name or size pass
+
+        """
+        if self.path_prefix and not _within(path, self.path_prefix):
+            return False
+        if self.min_size is not None and size is not None and size < self.min_size:
+            return False
+        if filename is None:
+            return True
+        if self.include and not self._match(self.include, filename, path):
+            return False
+        return not self._match(self.exclude, filename, path)
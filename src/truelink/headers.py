@@ -0,0 +1,181 @@
+"""Parsing of HTTP headers that carry file metadata.
+
+Main functions:
+- parse_content_disposition(value) -- split a Content-Disposition header
+- content_disposition_filename(value) -- the filename a header suggests
+- parse_retry_after(value) -- the delay a Retry-After header asks for
+"""
+
+from __future__ import annotations
+
+import codecs
+import functools
+import re
+from datetime import UTC, datetime
+from email.header import decode_header, make_header
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING
+from urllib.parse import unquote
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+__all__ = [
+    "content_disposition_filename",
+    "parse_content_disposition",
+    "parse_retry_after",
+]
+
+# One parameter: name, then a quoted-string or a bare value up to the next ";".
+# Bare values are allowed to contain spaces, which many servers send unquoted.
+_PARAM_RE = re.compile(
+    r"""
+    (?:^|;)\s*
+    ([^\s;="]+)\s*=\s*
+    (?:"((?:[^"\\]|\\.)*)"\s*(?=;|$)|([^;]*))
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+# The common case: a disposition type and one plain quoted filename
+_PLAIN_FILENAME_RE = re.compile(
+    r'[\w.+-]*\s*;\s*filename\s*=\s*"([^"\\]*)"\s*;?\s*', re.IGNORECASE
+)
+_ESCAPE_RE = re.compile(r"\\(.)", re.DOTALL)
+# RFC 5987 ext-value: charset "'" [ language ] "'" value-chars
+_EXT_VALUE_RE = re.compile(r"([\w!#$%&+^`{}~-]*)'[\w-]*'(.*)", re.DOTALL)
+
+
+def parse_content_disposition(value: str) -> tuple[str | None, dict[str, str]]:
+    """Parse a Content-Disposition header as described in RFC 6266.
+
+    Parameter names are lowercased. Extended parameters (``name*``, RFC 5987)
+    are decoded and take precedence over their plain counterpart, under the
+    plain name.
+
+    Args:
+        value: The header value
+
+    Returns:
+        tuple: (disposition type or None, parameters)
+
+    """
+    head, _, _ = value.partition(";")
+    disposition = head.strip().lower()
+    if not disposition or "=" in disposition:
+        disposition = None
+
+    params: dict[str, str] = {}
+    extended: dict[str, str] = {}
+    for name, param in _iter_params(value):
+        if name.endswith("*"):
+            decoded = _decode_ext_value(param)
+            if decoded is not None:
+                extended.setdefault(name[:-1], decoded)
+        else:
+            params.setdefault(name, _decode_encoded_words(param))
+
+    params.update(extended)
+    return disposition, params
+
+
+def content_disposition_filename(value: str) -> str | None:
+    """Return the filename suggested by a Content-Disposition header.
+
+    ``filename*`` is preferred over ``filename``. Directory parts are dropped, as
+    RFC 6266 asks of recipients.
+
+    Args:
+        value: The header value
+
+    Returns:
+        The filename, or None if the header has none
+
+    """
+    match = _PLAIN_FILENAME_RE.fullmatch(value)
+    if match is not None and not match.group(1).startswith("=?"):
+        return _basename(match.group(1))
+
+    filename = None
+    for name, param in _iter_params(value):
+        if name == "filename*":
+            decoded = _decode_ext_value(param)
+            if decoded:
+                filename = decoded
+                break
+        elif name == "filename" and filename is None:
+            filename = _decode_encoded_words(param)
+
+    return _basename(filename) if filename else None
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (RFC 9110), in seconds or as an HTTP date.
+
+    Args:
+        value: The header value, or None if the header is missing
+
+    Returns:
+        Seconds to wait, 0 for dates in the past, or None if the value is missing
+        or invalid
+
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=UTC)
+    return max(0.0, (when - datetime.now(UTC)).total_seconds())
+
+
+def _basename(filename: str) -> str | None:
+    filename = filename[max(filename.rfind("/"), filename.rfind("\\")) + 1 :]
+    return filename.strip() or None
+
+
+def _iter_params(value: str) -> Iterator[tuple[str, str]]:
+    for match in _PARAM_RE.finditer(value):
+        name, quoted, token = match.groups()
+        if quoted is None:
+            param = token.rstrip()
+        elif "\\" in quoted:
+            param = _ESCAPE_RE.sub(r"\1", quoted)
+        else:
+            param = quoted
+        yield name.lower(), param
+
+
+def _decode_ext_value(value: str) -> str | None:
+    match = _EXT_VALUE_RE.fullmatch(value)
+    if match is None:
+        # Not an ext-value, but servers do send bare percent-encoded UTF-8
+        return unquote(value, errors="replace") if value else None
+
+    charset, encoded = match.groups()
+    charset = _lookup_charset(charset or "utf-8")
+    if charset is None:
+        return None
+    return unquote(encoded, encoding=charset, errors="replace")
+
+
+@functools.lru_cache(maxsize=64)
+def _lookup_charset(charset: str) -> str | None:
+    try:
+        return codecs.lookup(charset).name
+    except LookupError:
+        return None
+
+
+def _decode_encoded_words(value: str) -> str:
+    # RFC 2047 words (=?UTF-8?B?...?=) are not allowed here, but are common
+    if not value.startswith("=?") or not value.endswith("?="):
+        return value
+    try:
+        return str(make_header(decode_header(value)))
+    except (LookupError, ValueError):
+        return value
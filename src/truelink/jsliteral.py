@@ -0,0 +1,232 @@
+"""Tolerant parser for JavaScript object and array literals.
+
+Pages often embed their data as JavaScript rather than JSON, with single-quoted
+strings, bare keys, trailing commas and comments. This module reads such
+literals in a single pass, without rewriting them into JSON first.
+
+Main functions:
+- parse_js_literal(text, pos) -- parse the literal starting at pos
+- find_js_assignment(text, name) -- parse the literal assigned to a variable
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+import sys
+from typing import Any
+
+__all__ = ["JSLiteralError", "find_js_assignment", "parse_js_literal"]
+
+# Whitespace and comments between tokens
+_SKIP_RE = re.compile(r"(?:\s+|//[^\n]*|/\*.*?\*/)*", re.DOTALL)
+_NUMBER_RE = re.compile(
+    r"[+-]?(?:0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)"
+)
+# Bare keys are allowed to start with a digit, as in {1080p: [...]}
+_KEY_RE = re.compile(r"[\w$]+")
+_WORD_RE = re.compile(r"[A-Za-z_$][\w$]*")
+_STRING_RES = {
+    '"': re.compile(r'"((?:[^"\\\n]|\\.)*)"', re.DOTALL),
+    "'": re.compile(r"'((?:[^'\\\n]|\\.)*)'", re.DOTALL),
+    "`": re.compile(r"`((?:[^`\\]|\\.)*)`", re.DOTALL),
+}
+_ESCAPE_RE = re.compile(
+    r"\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|\r\n|.)", re.DOTALL
+)
+_SIMPLE_ESCAPES = {
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+    "v": "\v",
+    "0": "\0",
+    "\n": "",
+    "\r\n": "",
+}
+_WORDS = {
+    "true": True,
+    "false": False,
+    "null": None,
+    "undefined": None,
+    "NaN": float("nan"),
+    "Infinity": float("inf"),
+}
+
+
+class JSLiteralError(ValueError):
+    """Raised when text is not a supported JavaScript literal."""
+
+    def __init__(self, msg: str, pos: int) -> None:
+        """Initialize with a message and the offset it refers to."""
+        super().__init__(f"{msg} at offset {pos}")
+        self.pos = pos
+
+
+def parse_js_literal(text: str, pos: int = 0) -> tuple[Any, int]:
+    """Parse a JavaScript literal.
+
+    Objects, arrays, strings in any quote style (template strings without
+    substitutions), numbers, ``true``/``false``/``null``/``undefined``, comments
+    and trailing commas are supported. Objects become dicts and arrays lists.
+
+    Args:
+        text: Text containing the literal
+        pos: Offset at which the literal starts, leading whitespace allowed
+
+    Returns:
+        tuple: (parsed value, offset just past the literal)
+
+    Raises:
+        JSLiteralError: If the text at pos is not a supported literal
+
+    """
+    try:
+        return _parse_value(text, _SKIP_RE.match(text, pos).end())
+    except RecursionError:
+        msg = "Literal is nested too deeply"
+        raise JSLiteralError(msg, pos) from None
+
+
+def find_js_assignment(text: str, name: str) -> object:
+    """Find and parse the literal assigned to a variable or property.
+
+    Matches ``var name = ...``, ``let``/``const`` declarations and
+    ``obj.name = ...``. Assignments whose value does not parse are skipped.
+
+    Args:
+        text: Page or script text to search
+        name: Variable or property name
+
+    Returns:
+        The parsed value of the first assignment that parses, or None
+
+    """
+    for match in _assignment_re(name).finditer(text):
+        start = match.start()
+        if start and (text[start - 1].isalnum() or text[start - 1] in "_$"):
+            continue
+        try:
+            return parse_js_literal(text, match.end())[0]
+        except JSLiteralError:
+            continue
+    return None
+
+
+@functools.lru_cache(maxsize=32)
+def _assignment_re(name: str) -> re.Pattern[str]:
+    # Checking the character before the name separately keeps the literal
+    # prefix, which lets the regex engine scan for it quickly
+    return re.compile(rf"{re.escape(name)}\s*=(?![=>])")
+
+
+def _parse_value(text: str, pos: int) -> tuple[Any, int]:
+    char = text[pos : pos + 1]
+    if char == "{":
+        return _parse_object(text, pos + 1)
+    if char == "[":
+        return _parse_array(text, pos + 1)
+    if char in _STRING_RES:
+        return _parse_string(text, pos)
+
+    match = _NUMBER_RE.match(text, pos)
+    if match:
+        return _to_number(match.group()), match.end()
+    match = _WORD_RE.match(text, pos)
+    if match and match.group() in _WORDS:
+        return _WORDS[match.group()], match.end()
+
+    msg = "Expected a value"
+    raise JSLiteralError(msg, pos)
+
+
+def _parse_object(text: str, pos: int) -> tuple[dict[str, Any], int]:
+    result: dict[str, Any] = {}
+    while True:
+        pos = _SKIP_RE.match(text, pos).end()
+        char = text[pos : pos + 1]
+        if char == "}":
+            return result, pos + 1
+
+        if char in _STRING_RES:
+            key, pos = _parse_string(text, pos)
+        else:
+            match = _KEY_RE.match(text, pos)
+            if not match:
+                msg = "Expected a key"
+                raise JSLiteralError(msg, pos)
+            key, pos = match.group(), match.end()
+
+        pos = _SKIP_RE.match(text, pos).end()
+        if text[pos : pos + 1] != ":":
+            msg = "Expected ':'"
+            raise JSLiteralError(msg, pos)
+        value, pos = _parse_value(text, _SKIP_RE.match(text, pos + 1).end())
+        result[key] = value
+
+        pos = _SKIP_RE.match(text, pos).end()
+        char = text[pos : pos + 1]
+        if char == ",":
+            pos += 1
+        elif char != "}":
+            msg = "Expected ',' or '}'"
+            raise JSLiteralError(msg, pos)
+
+
+def _parse_array(text: str, pos: int) -> tuple[list[Any], int]:
+    result: list[Any] = []
+    while True:
+        pos = _SKIP_RE.match(text, pos).end()
+        if text[pos : pos + 1] == "]":
+            return result, pos + 1
+
+        value, pos = _parse_value(text, pos)
+        result.append(value)
+
+        pos = _SKIP_RE.match(text, pos).end()
+        char = text[pos : pos + 1]
+        if char == ",":
+            pos += 1
+        elif char != "]":
+            msg = "Expected ',' or ']'"
+            raise JSLiteralError(msg, pos)
+
+
+def _parse_string(text: str, pos: int) -> tuple[str, int]:
+    match = _STRING_RES[text[pos]].match(text, pos)
+    if not match:
+        msg = "Unterminated string"
+        raise JSLiteralError(msg, pos)
+    value = match.group(1)
+    if "\\" in value:
+        value = _ESCAPE_RE.sub(functools.partial(_unescape, offset=pos + 1), value)
+        if "\\u" in match.group(1):
+            # Join \uXXXX surrogate pairs into one character
+            value = value.encode("utf-16", "surrogatepass").decode(
+                "utf-16", "replace"
+            )
+    return value, match.end()
+
+
+def _unescape(match: re.Match[str], offset: int) -> str:
+    escape = match.group(1)
+    if escape in _SIMPLE_ESCAPES:
+        return _SIMPLE_ESCAPES[escape]
+    if len(escape) > 1 and escape[0] in "ux":
+        code = int(escape.strip("ux{}"), 16)
+        if code > sys.maxunicode:
+            msg = "Code point out of range"
+            raise JSLiteralError(msg, offset + match.start())
+        return chr(code)
+    return escape
+
+
+def _to_number(token: str) -> int | float:
+    unsigned = token.lstrip("+-")
+    if unsigned[:2] in ("0x", "0X"):
+        value = int(unsigned, 16)
+        return -value if token[0] == "-" else value
+    if "." in token or "e" in token or "E" in token:
+        return float(token)
+    return int(token)
@@ -0,0 +1,134 @@
+"""Adaptive concurrency limiting."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+
+
+class AdaptiveLimiter:
+    """Concurrency limit that adapts to a provider's responses (AIMD).
+
+    While resolves succeed at a normal latency and the limit is in use, the
+    limit grows by one per round of resolves. A rate limit, a timeout or a
+    latency spike (``latency_tolerance`` times the moving average) cuts it by
+    ``backoff``, at most once per average latency, since resolves in flight at
+    the time saw the same congestion.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        initial: float = 4,
+        *,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        smoothing: float = 0.1,
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            initial: Starting limit
+            min_limit: Lowest limit
+            max_limit: Highest limit
+            backoff: Factor the limit is multiplied by on overload
+            latency_tolerance: Latency, relative to the moving average, that
+                counts as a spike
+            smoothing: Weight of the newest sample in the moving average
+
+        """
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._latency: float | None = None
+        self._last_decrease = 0.0
+        self._counters = dict.fromkeys(("increases", "decreases", "overloads"), 0)
+
+    def _capacity(self) -> int:
+        return max(self.min_limit, min(self.max_limit, int(self.limit)))
+
+    async def acquire(self) -> None:
+        """Wait until the limit allows one more resolve."""
+        if not self._waiters and self._in_flight < self._capacity():
+            self._in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted just before the cancellation; hand the slot on
+                self._in_flight -= 1
+                self._wake()
+            raise
+
+    def release(self, outcome: str | None, latency: float) -> None:
+        """Free a slot and adapt the limit to how the resolve went.
+
+        Args:
+            outcome: ``"ok"``, ``"error"`` (failed, but not from overload),
+                ``"overload"`` (rate limited or timed out), or None to leave the
+                limit alone
+            latency: Seconds the resolve took
+
+        """
+        was_full = self._in_flight >= self._capacity()
+        self._in_flight -= 1
+        if outcome is not None:
+            self._adapt(outcome, latency, was_full=was_full)
+        self._wake()
+
+    def _adapt(self, outcome: str, latency: float, *, was_full: bool) -> None:
+        average = self._latency
+        if outcome == "ok":
+            self._latency = (
+                latency
+                if average is None
+                else average + self.smoothing * (latency - average)
+            )
+        spike = (
+            outcome == "ok"
+            and average is not None
+            and latency > average * self.latency_tolerance
+        )
+        if outcome == "overload" or spike:
+            self._counters["overloads"] += 1
+            now = time.monotonic()
+            if now - self._last_decrease >= (average or 0.0):
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self._last_decrease = now
+                self._counters["decreases"] += 1
+        elif outcome == "ok" and was_full and self.limit < self.max_limit:
+            # +1/limit per resolve adds up to +1 per round of resolves
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._counters["increases"] += 1
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < self._capacity():
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    def stats(self) -> dict[str, int | float | None]:
+        """Return the current limit and its history.
+
+        Returns:
+            Dictionary of metric names to values
+
+        """
+        return {
+            "limit": self._capacity(),
+            "in_flight": self._in_flight,
+            "waiting": len(self._waiters),
+            "latency_avg": self._latency,
+            **self._counters,
+        }
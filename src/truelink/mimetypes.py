@@ -2,57 +2,180 @@
 
 This module provides basic MIME type guessing functionality.
 
-Main function:
+Main functions:
 - guess_type(url) -- guess the MIME type and encoding of a URL
+- sniff_type(data) -- identify the MIME type of file content from magic bytes
 """
 
 from __future__ import annotations
 
+import functools
 import urllib.parse
-from pathlib import Path
 
-__all__ = ["guess_type"]
+__all__ = ["guess_type", "sniff_type"]
+
+_SCHEME_CHARS = frozenset(
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789+-."
+)
+
+# Types servers send when they do not know better
+GENERIC_TYPES = frozenset(
+    {
+        "",
+        "application/octet-stream",
+        "application/binary",
+        "application/download",
+        "application/force-download",
+        "application/x-download",
+        "binary/octet-stream",
+    }
+)
 
 
 def guess_type(url: str) -> tuple[str | None, str | None]:
     """Guess the type of a file based on its URL or path."""
-    p = urllib.parse.urlparse(url)
+    colon = url.find(":")
+    if colon > 1 and _SCHEME_CHARS.issuperset(url[:colon]) and url[0].isalpha():
+        scheme = url[:colon].lower()
+        rest = url[colon + 1 :]
+        if scheme == "data":
+            return _data_type(rest), None
 
-    if p.scheme and len(p.scheme) > 1:
-        if p.scheme == "data":
-            comma = url.find(",")
-            if comma < 0:
+        start = 0
+        if rest.startswith("//"):
+            # The authority ends at the first "/", "?" or "#"
+            start = rest.find("/", 2)
+            netloc = rest[2:start]
+            if start < 0 or "?" in netloc or "#" in netloc:
                 return None, None
-            semi = url.find(";", 0, comma)
-            mime_type = url[:semi] if semi >= 0 else url[:comma]
-            if "=" in mime_type or "/" not in mime_type:
-                mime_type = "text/plain"
-            return mime_type, None
-
-        path = Path(p.path)
-        base, ext = path.stem, path.suffix
+        path = rest[start:]
+        end = len(path)
+        for sep in "?#":
+            pos = path.find(sep, 0, end)
+            if pos >= 0:
+                end = pos
+        if scheme in urllib.parse.uses_params:
+            semi = path.find(";", path.rfind("/", 0, end), end)
+            if semi >= 0:
+                end = semi
+        path = path[:end]
     else:
-        path = Path(url)
-        base, ext = path.stem, path.suffix
+        path = url
+
+    path = path.rstrip("/")
+    return _guess_name(_name_key(path[path.rfind("/") + 1 :]))
+
+
+def _data_type(rest: str) -> str | None:
+    comma = rest.find(",")
+    if comma < 0:
+        return None
+    semi = rest.find(";", 0, comma)
+    mime_type = rest[:semi] if semi >= 0 else rest[:comma]
+    if "=" in mime_type or "/" not in mime_type:
+        return "text/plain"
+    return mime_type
+
 
-    ext = ext.lower()
+def _name_key(name: str) -> str:
+    # The result only depends on the last two suffixes and on whether the name
+    # starts with a dot, so names are reduced to that for memoization
+    last = name.rfind(".")
+    if last <= 0:
+        return ""
+    prev = name.rfind(".", 0, last)
+    if prev > 0:
+        return "x" + name[prev:].lower()
+    if prev == 0:
+        return name.lower()
+    return "x" + name[last:].lower()
 
+
+def _split_ext(name: str) -> tuple[str, str]:
+    # Same split as Path.stem/Path.suffix, without building a Path
+    dot = name.rfind(".")
+    if 0 < dot < len(name) - 1:
+        return name[:dot], name[dot:]
+    return name, ""
+
+
+@functools.lru_cache(maxsize=1024)
+def _guess_name(name: str) -> tuple[str | None, str | None]:
+    base, ext = _split_ext(name)
     while ext in _suffix_map:
-        path = Path(base + _suffix_map[ext])
-        base, ext = path.stem, path.suffix
-        ext = ext.lower()
-
-    if ext in _encodings_map:
-        encoding = _encodings_map[ext]
-        path = Path(base)
-        base, ext = path.stem, path.suffix
-        ext = ext.lower()
-    else:
-        encoding = None
+        base, ext = _split_ext(base + _suffix_map[ext])
+
+    encoding = _encodings_map.get(ext)
+    if encoding is not None:
+        base, ext = _split_ext(base)
 
     return _types_map.get(ext), encoding
 
 
+def sniff_type(data: bytes) -> str | None:
+    """Identify common containers from the first bytes of a file.
+
+    ISO images are only recognised when at least 32774 bytes are given, since
+    their signature sits after the system area.
+    """
+    for offset, magic, mime_type in _magic_numbers:
+        if data.startswith(magic, offset):
+            return _refine_container(mime_type, data)
+    if data[0x8001:0x8006] == b"CD001":
+        return "application/x-iso9660-image"
+    if len(data) > 188 and data[0] == data[188] == 0x47:
+        return "video/mp2t"
+    return None
+
+
+def _refine_container(mime_type: str, data: bytes) -> str | None:
+    # Containers shared by several formats carry the real type in their header
+    if mime_type == "video/matroska" and b"webm" in data[:64]:
+        return "video/webm"
+    if mime_type == "video/mp4":
+        return _ftyp_brands.get(data[8:11], mime_type)
+    if mime_type == "RIFF":
+        return _riff_types.get(data[8:12])
+    return mime_type
+
+
+_magic_numbers = (
+    (0, b"\x1aE\xdf\xa3", "video/matroska"),
+    (4, b"ftyp", "video/mp4"),
+    (0, b"RIFF", "RIFF"),
+    (0, b"FLV\x01", "video/x-flv"),
+    (0, b"OggS", "audio/ogg"),
+    (0, b"fLaC", "audio/flac"),
+    (0, b"ID3", "audio/mpeg"),
+    (0, b"PK\x03\x04", "application/zip"),
+    (0, b"PK\x05\x06", "application/zip"),
+    (0, b"Rar!\x1a\x07", "application/vnd.rar"),
+    (0, b"7z\xbc\xaf\x27\x1c", "application/x-7z-compressed"),
+    (0, b"\x1f\x8b", "application/gzip"),
+    (0, b"BZh", "application/x-bzip2"),
+    (0, b"\xfd7zXZ\x00", "application/x-xz"),
+    (0, b"%PDF-", "application/pdf"),
+    (0, b"\x89PNG\r\n\x1a\n", "image/png"),
+    (0, b"\xff\xd8\xff", "image/jpeg"),
+    (0, b"GIF8", "image/gif"),
+)
+
+_ftyp_brands = {
+    b"qt ": "video/quicktime",
+    b"M4A": "audio/mp4",
+    b"M4B": "audio/mp4",
+    b"3gp": "video/3gpp",
+    b"3g2": "video/3gpp2",
+    b"avi": "image/avif",
+    b"hei": "image/heic",
+}
+
+_riff_types = {
+    b"AVI ": "video/vnd.avi",
+    b"WAVE": "audio/vnd.wave",
+    b"WEBP": "image/webp",
+}
+
 _suffix_map = {
     ".svgz": ".svg.gz",
     ".tgz": ".tar.gz",
@@ -75,6 +198,8 @@ _types_map = {
     ".mjs": "text/javascript",
     ".epub": "application/epub+zip",
     ".gz": "application/gzip",
+    ".jar": "application/java-archive",
+    ".mobi": "application/x-mobipocket-ebook",
     ".json": "application/json",
     ".webmanifest": "application/manifest+json",
     ".doc": "application/msword",
@@ -89,6 +214,7 @@ _types_map = {
     ".o": "application/octet-stream",
     ".obj": "application/octet-stream",
     ".so": "application/octet-stream",
+    ".img": "application/octet-stream",
     ".oda": "application/oda",
     ".ogx": "application/ogg",
     ".pdf": "application/pdf",
@@ -115,8 +241,21 @@ _types_map = {
     ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
     ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
     ".rar": "application/vnd.rar",
+    ".cbr": "application/vnd.comicbook-rar",
+    ".cbz": "application/vnd.comicbook+zip",
+    ".msi": "application/x-msi",
+    ".azw3": "application/vnd.amazon.ebook",
+    ".torrent": "application/x-bittorrent",
     ".wasm": "application/wasm",
     ".7z": "application/x-7z-compressed",
+    ".dmg": "application/x-apple-diskimage",
+    ".bz2": "application/x-bzip2",
+    ".iso": "application/x-iso9660-image",
+    ".lz": "application/x-lzip",
+    ".lzma": "application/x-lzma",
+    ".xz": "application/x-xz",
+    ".zst": "application/zstd",
+    ".appimage": "application/vnd.appimage",
     ".bcpio": "application/x-bcpio",
     ".cpio": "application/x-cpio",
     ".csh": "application/x-csh",
@@ -172,8 +311,14 @@ _types_map = {
     ".au": "audio/basic",
     ".snd": "audio/basic",
     ".flac": "audio/flac",
+    ".ape": "audio/x-ape",
+    ".wv": "audio/x-wavpack",
+    ".dts": "audio/vnd.dts",
+    ".ac3": "audio/ac3",
+    ".amr": "audio/amr",
     ".mka": "audio/matroska",
     ".m4a": "audio/mp4",
+    ".m4b": "audio/mp4",
     ".mp3": "audio/mpeg",
     ".mp2": "audio/mpeg",
     ".ogg": "audio/ogg",
@@ -182,6 +327,7 @@ _types_map = {
     ".aifc": "audio/x-aiff",
     ".aiff": "audio/x-aiff",
     ".ra": "audio/x-pn-realaudio",
+    ".wma": "audio/x-ms-wma",
     ".wav": "audio/vnd.wave",
     ".otf": "font/otf",
     ".ttf": "font/ttf",
@@ -199,12 +345,15 @@ _types_map = {
     ".jpg": "image/jpeg",
     ".jpe": "image/jpeg",
     ".jpeg": "image/jpeg",
+    ".jfif": "image/jpeg",
+    ".jxl": "image/jxl",
     ".jpm": "image/jpm",
     ".jpx": "image/jpx",
     ".heic": "image/heic",
     ".heif": "image/heif",
     ".png": "image/png",
     ".svg": "image/svg+xml",
+    ".psd": "image/vnd.adobe.photoshop",
     ".t38": "image/t38",
     ".tiff": "image/tiff",
     ".tif": "image/tiff",
@@ -242,6 +391,9 @@ _types_map = {
     ".ksh": "text/plain",
     ".pl": "text/plain",
     ".srt": "text/plain",
+    ".nfo": "text/plain",
+    ".log": "text/plain",
+    ".ssa": "text/x-ssa",
     ".rtx": "text/richtext",
     ".tsv": "text/tab-separated-values",
     ".vtt": "text/vtt",
@@ -255,17 +407,25 @@ _types_map = {
     ".mkv": "video/matroska",
     ".mk3d": "video/matroska-3d",
     ".mp4": "video/mp4",
+    ".ts": "video/mp2t",
+    ".m2ts": "video/mp2t",
+    ".mts": "video/mp2t",
     ".mpeg": "video/mpeg",
     ".m1v": "video/mpeg",
     ".mpa": "video/mpeg",
     ".mpe": "video/mpeg",
     ".mpg": "video/mpeg",
+    ".vob": "video/mpeg",
     ".ogv": "video/ogg",
     ".mov": "video/quicktime",
     ".qt": "video/quicktime",
     ".webm": "video/webm",
     ".avi": "video/vnd.avi",
     ".m4v": "video/x-m4v",
+    ".flv": "video/x-flv",
+    ".f4v": "video/mp4",
+    ".rmvb": "application/vnd.rn-realmedia-vbr",
+    ".asf": "video/x-ms-asf",
     ".wmv": "video/x-ms-wmv",
     ".movie": "video/x-sgi-movie",
     ".rtf": "application/rtf",
@@ -0,0 +1,87 @@
+"""Event loop lag monitoring."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop runs its scheduled callbacks.
+
+    While at least one resolve is tracked, a background task sleeps for
+    ``interval`` seconds at a time and records how much later than that it woke
+    up. Lag comes from synchronous work holding the loop, such as parsing a large
+    page inline.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.05,
+        window: int = 1000,
+        stall_threshold: float = 0.1,
+    ) -> None:
+        """Initialize the monitor.
+
+        Args:
+            interval: Seconds between lag samples
+            window: Number of recent samples kept for the average and p99
+            stall_threshold: Lag in seconds counted as a stall
+
+        """
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self._samples: deque[float] = deque(maxlen=window)
+        self._max = 0.0
+        self._stalls = 0
+        self._active = 0
+        self._task: asyncio.Task | None = None
+
+    @asynccontextmanager
+    async def track(self) -> AsyncIterator[None]:
+        """Sample the running loop for as long as the body runs."""
+        loop = asyncio.get_running_loop()
+        self._active += 1
+        if (
+            self._task is None
+            or self._task.done()
+            or self._task.get_loop() is not loop
+        ):
+            self._task = loop.create_task(self._sample())
+        try:
+            yield
+        finally:
+            self._active -= 1
+
+    async def _sample(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._active:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - start - self.interval)
+            self._samples.append(lag)
+            self._max = max(self._max, lag)
+            if lag >= self.stall_threshold:
+                self._stalls += 1
+
+    def stats(self) -> dict[str, int | float]:
+        """Return lag metrics in seconds.
+
+        Returns:
+            Dictionary of metric names to values
+
+        """
+        samples = sorted(self._samples)
+        count = len(samples)
+        return {
+            "samples": count,
+            "lag_avg": sum(samples) / count if count else 0.0,
+            "lag_p99": samples[min(count - 1, int(count * 0.99))] if count else 0.0,
+            "lag_max": self._max,
+            "stalls": self._stalls,
+        }
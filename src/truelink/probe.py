@@ -0,0 +1,215 @@
+"""Shared engine for file metadata probes."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import Counter, OrderedDict
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Hashable
+
+    FileDetails = tuple[str | None, int | None, str | None]
+    ProbeRequest = Callable[
+        [str, str, dict[str, str], int], Awaitable[FileDetails | None]
+    ]
+
+EMPTY_DETAILS: FileDetails = (None, None, None)
+
+
+class _HostState:
+    """What has been learned about a host."""
+
+    __slots__ = ("head_ok", "learned_at", "semaphore")
+
+    def __init__(self, limit: int) -> None:
+        self.head_ok: bool | None = None
+        self.learned_at = 0.0
+        self.semaphore = asyncio.Semaphore(limit)
+
+
+class ProbeEngine:
+    """Runs metadata probes shared by all resolvers.
+
+    Identical probes in flight from the same scope are coalesced and finished
+    probes are cached for a short time. Probes are limited per host, and the engine remembers per host
+    whether HEAD works, so hosts that reject it go straight to a ranged GET.
+
+    With ``sniff_bytes`` set, probes always use a ranged GET for the first bytes
+    of the file, so a missing or generic Content-Type can be replaced by the type
+    identified from its magic bytes.
+    """
+
+    def __init__(
+        self,
+        per_host_limit: int = 8,
+        cache_ttl: float = 60,
+        cache_max_size: int = 1000,
+        method_ttl: float = 3600,
+        sniff_bytes: int = 0,
+    ) -> None:
+        """Initialize the engine.
+
+        Args:
+            per_host_limit: Maximum number of concurrent probes per host
+            cache_ttl: Seconds a probe result is reused
+            cache_max_size: Maximum number of cached probe results
+            method_ttl: Seconds a learned HEAD/GET choice is kept for a host
+            sniff_bytes: Number of leading bytes fetched to identify the content
+                type, 0 to disable sniffing
+
+        """
+        self.per_host_limit = per_host_limit
+        self.cache_ttl = cache_ttl
+        self.cache_max_size = cache_max_size
+        self.method_ttl = method_ttl
+        self.sniff_bytes = sniff_bytes
+        self._cache: OrderedDict[tuple, tuple[float, FileDetails]] = OrderedDict()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._hosts: dict[str, _HostState] = {}
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self._waiters: Counter[asyncio.Future] = Counter()
+        self._counters = dict.fromkeys(
+            ("probes", "cache_hits", "coalesced", "head_skipped", "requests"), 0
+        )
+
+    def _bind_loop(self) -> None:
+        # Semaphores and futures belong to one event loop
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._hosts = {}
+            self._inflight = {}
+            self._waiters = Counter()
+
+    def _host_state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.per_host_limit)
+        return state
+
+    async def probe(
+        self,
+        url: str,
+        headers: dict[str, str] | None,
+        request: ProbeRequest,
+        scope: Hashable = None,
+    ) -> FileDetails:
+        """Probe a URL for filename, size and MIME type.
+
+        A probe in flight runs ``request`` of the caller that started it, so it
+        is only shared with callers of the same ``scope``: the session, route
+        and budget the requests are made and counted with.
+
+        Args:
+            url: The URL to probe
+            headers: Extra request headers
+            request: Callable making one probe request with the given method
+                (``"HEAD"`` or ``"GET"``) and number of bytes to sniff, returning
+                None if it failed
+            scope: Identity of what ``request`` makes its requests through
+
+        Returns:
+            tuple: (filename, size, mime_type)
+
+        """
+        self._bind_loop()
+        self._counters["probes"] += 1
+        headers = headers or {}
+        key = (url, tuple(sorted(headers.items())))
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            if time.monotonic() - cached[0] <= self.cache_ttl:
+                self._counters["cache_hits"] += 1
+                self._cache.move_to_end(key)
+                return cached[1]
+            del self._cache[key]
+
+        inflight_key = (key, scope)
+        task = self._inflight.get(inflight_key)
+        if task is None:
+            task = asyncio.ensure_future(self._run(key, url, headers, request))
+            self._inflight[inflight_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(inflight_key, None))
+        else:
+            self._counters["coalesced"] += 1
+        # Shielded so one cancelled caller does not cancel the others, but the
+        # last one to give up cancels the probe
+        self._waiters[task] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[task] == 1:
+                task.cancel()
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+
+    async def _run(
+        self,
+        key: tuple,
+        url: str,
+        headers: dict[str, str],
+        request: ProbeRequest,
+    ) -> FileDetails:
+        state = self._host_state(urlparse(url).hostname or "")
+        async with state.semaphore:
+            use_head = not self.sniff_bytes and (
+                state.head_ok is not False
+                or time.monotonic() - state.learned_at > self.method_ttl
+            )
+            if not use_head:
+                self._counters["head_skipped"] += 1
+
+            result = None
+            if use_head:
+                self._counters["requests"] += 1
+                result = await request("HEAD", url, headers, 0)
+                if result is not None:
+                    self._learn(state, head_ok=True)
+            if result is None:
+                self._counters["requests"] += 1
+                result = await request("GET", url, headers, self.sniff_bytes)
+                if use_head and result is not None:
+                    # The server answers, it just does not like HEAD
+                    self._learn(state, head_ok=False)
+
+        if result is None:
+            return EMPTY_DETAILS
+        self._cache[key] = (time.monotonic(), result)
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.cache_max_size:
+            self._cache.popitem(last=False)
+        return result
+
+    @staticmethod
+    def _learn(state: _HostState, *, head_ok: bool) -> None:
+        state.head_ok = head_ok
+        state.learned_at = time.monotonic()
+
+    def clear(self) -> None:
+        """Forget cached results and learned host methods."""
+        self._cache.clear()
+        for state in self._hosts.values():
+            state.head_ok = None
+
+    def stats(self) -> dict[str, int]:
+        """Return probe counters.
+
+        Returns:
+            Dictionary of metric names to values
+
+        """
+        return {
+            **self._counters,
+            "cached": len(self._cache),
+            "inflight": len(self._inflight),
+            "hosts_head_unsupported": sum(
+                state.head_ok is False for state in self._hosts.values()
+            ),
+        }
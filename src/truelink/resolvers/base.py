@@ -2,20 +2,209 @@
 
 from __future__ import annotations
 
+import asyncio
+import base64
+import binascii
+import bisect
+import codecs
 import contextlib
-import re
+import functools
+import hashlib
+import json
+import time
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Any, ClassVar, Self
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, ClassVar, NamedTuple, Self, TypeVar
 from urllib.parse import unquote, urlparse
 
 import aiohttp
+from lxml import etree
+from lxml.html import HtmlElementClassLookup
 
-from truelink.exceptions import ExtractionFailedException, InvalidURLException
+from truelink import mimetypes
+from truelink.exceptions import (
+    BudgetExceededException,
+    ExtractionFailedException,
+    InvalidURLException,
+    RateLimitedException,
+    UnsupportedProviderException,
+)
+from truelink.executor import ParsePool, SyncExecutor, ThreadLanes
+from truelink.headers import content_disposition_filename, parse_retry_after
+from truelink.probe import ProbeEngine
+from truelink.types import CrawlProgress, FolderError, FolderPage
 
 if TYPE_CHECKING:
+    import re
+    from collections.abc import Awaitable, Callable, Iterable, Sequence
+    from concurrent.futures import ThreadPoolExecutor
     from types import TracebackType
 
-    from truelink.types import FolderResult, LinkResult
+    from lxml.html import HtmlElement
+
+    from truelink.filters import CrawlFilter
+    from truelink.proxy import ProxyPool
+    from truelink.source import SourceAddressPool
+    from truelink.types import FileItem, FolderResult, LinkResult
+    from truelink.usage import UsageMeter
+
+T = TypeVar("T")
+
+PROBE_POLICIES = ("none", "missing", "always")
+
+# Metadata probe policy of the resolve running in the current context
+probe_policy: ContextVar[str] = ContextVar("probe_policy", default="missing")
+# Whether the caller schedules deferred continuations, see BaseResolver._defer
+defer_waits: ContextVar[bool] = ContextVar("defer_waits", default=False)
+# Proxy pool and the proxy (None for direct) picked for the current resolve
+proxy_route: ContextVar[tuple[ProxyPool, str | None] | None] = ContextVar(
+    "proxy_route", default=None
+)
+# Source address pool and the local address picked for the current resolve
+source_route: ContextVar[tuple[SourceAddressPool, str] | None] = ContextVar(
+    "source_route", default=None
+)
+# Accounting and budget of the current resolve
+usage_meter: ContextVar[UsageMeter | None] = ContextVar("usage_meter", default=None)
+# Folder contents the current resolve is limited to
+folder_filter: ContextVar[CrawlFilter | None] = ContextVar(
+    "folder_filter", default=None
+)
+# Callback told about the progress of the current resolve's folder crawl
+crawl_progress: ContextVar[Callable[[CrawlProgress], object] | None] = ContextVar(
+    "crawl_progress", default=None
+)
+
+
+async def _count_body(
+    _session: aiohttp.ClientSession,
+    _context: object,
+    params: aiohttp.TraceResponseChunkReceivedParams,
+) -> None:
+    # Sent for whole bodies read by read(), text() and json(); streamed reads
+    # are counted by the helpers doing them
+    meter = usage_meter.get()
+    if meter is not None:
+        meter.read(len(params.chunk))
+
+
+class DeferredResolve(Exception):
+    """Signals that a resolve must continue after a delay.
+
+    Raised by ``BaseResolver._defer`` when the caller schedules waits itself. The
+    caller should release the concurrency slots the resolve holds, wait
+    ``delay`` seconds and then await ``callback()`` for the result. The session
+    must stay open, since the callback may rely on its cookies.
+    """
+
+    def __init__(
+        self,
+        delay: float,
+        callback: Callable[[], Awaitable[LinkResult | FolderResult]],
+    ) -> None:
+        """Initialize with the delay and the continuation."""
+        super().__init__(f"Resolve continues in {delay} seconds")
+        self.delay = delay
+        self.callback = callback
+
+
+@dataclass
+class FolderEntry:
+    """File or subfolder on a listing page of a folder.
+
+    Attributes:
+        name: Name of the file or subfolder
+        node: Provider ID of a subfolder; None for a file
+        size: Size of a file in bytes, if listed
+        data: Provider fields needed to resolve a file
+
+    """
+
+    name: str
+    node: str | None = None
+    size: int | None = None
+    data: dict = field(default_factory=dict)
+
+
+class FolderListing(NamedTuple):
+    """One listing page of a folder, see BaseResolver._list_folder."""
+
+    entries: list[FolderEntry]
+    has_more: bool
+    title: str | None = None
+
+
+def _cursor_check(url: str) -> str:
+    return hashlib.sha256(url.encode()).hexdigest()[:16]
+
+
+def dump_cursor(url: str, state: dict) -> str:
+    """Encode the position of a paged folder resolve as an opaque cursor.
+
+    Args:
+        url: The folder URL the cursor belongs to
+        state: JSON-serializable position
+
+    Returns:
+        URL-safe cursor string
+
+    """
+    payload = json.dumps(
+        {"v": 1, "u": _cursor_check(url), "s": state}, separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def load_cursor(url: str, cursor: str | None) -> dict | None:
+    """Decode a cursor made by dump_cursor for the same URL.
+
+    Args:
+        url: The folder URL being paged
+        cursor: The cursor, or None for the first page
+
+    Returns:
+        The position, or None for the first page
+
+    Raises:
+        ValueError: If the cursor is malformed or belongs to another URL
+
+    """
+    if cursor is None:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError) as e:
+        msg = "Malformed folder cursor"
+        raise ValueError(msg) from e
+    if (
+        not isinstance(payload, dict)
+        or payload.get("v") != 1
+        or not isinstance(payload.get("s"), dict)
+    ):
+        msg = "Malformed folder cursor"
+        raise ValueError(msg)
+    if payload.get("u") != _cursor_check(url):
+        msg = f"Folder cursor does not belong to {url}"
+        raise ValueError(msg)
+    return payload["s"]
+
+
+@dataclass
+class _CrawlState:
+    """Shared state of one folder crawl, see BaseResolver._crawl_folder."""
+
+    folder: FolderResult
+    context: dict
+    queue: asyncio.Queue = field(default_factory=asyncio.Queue)
+    visited: set[str] = field(default_factory=set)
+    # Files by their position in the listings, to order the result
+    found: list[tuple[tuple[int, ...], FileItem]] = field(default_factory=list)
+    # Files being resolved or found, counted against max_files
+    reserved: int = 0
+    progress: CrawlProgress = field(default_factory=CrawlProgress)
 
 
 class BaseResolver(ABC):
@@ -24,14 +213,53 @@ class BaseResolver(ABC):
     DOMAINS: ClassVar[list[str]] = []
     USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:122.0) Gecko/20100101 Firefox/122.0"
 
+    # Whether _get and _post raise RateLimitedException, see _check_rate_limit
+    RAISE_ON_RATE_LIMIT: ClassVar[bool] = True
+
+    # Upper bound on the bytes read from a page by _read_until and _parse_until
+    MAX_PAGE_BYTES: ClassVar[int] = 8 * 1024 * 1024
+    READ_CHUNK_SIZE: ClassVar[int] = 64 * 1024
+    PARSE_CHUNK_SIZE: ClassVar[int] = 256 * 1024
+    # Documents larger than this are parsed off the event loop, see _parse
+    INLINE_PARSE_BYTES: ClassVar[int] = 128 * 1024
+    # Whether the resolver implements the folder listing hooks of resolve_page
+    PAGES_FOLDERS: ClassVar[bool] = False
+    # Listings and file resolves a folder crawl runs at a time
+    CRAWL_CONCURRENCY: ClassVar[int] = 4
+    # Subfolder levels a folder crawl descends at most
+    MAX_CRAWL_DEPTH: ClassVar[int] = 32
+    # Extra attempts at a subfolder that fails mid-crawl, see _crawl_subtree
+    SUBTREE_RETRIES: ClassVar[int] = 2
+    SUBTREE_RETRY_DELAY: ClassVar[float] = 1.0
+
+    # How many documents were parsed inline, on a thread and in a process
+    parse_counters: ClassVar[dict[str, int]] = {
+        "inline": 0,
+        "thread": 0,
+        "process": 0,
+    }
+
+    # Shared pool for blocking work, see TrueLinkResolver.configure_sync_executor
+    sync_executor: ClassVar[SyncExecutor] = SyncExecutor()
+    # Process pool for parsing large documents, see configure_parse_pool
+    parse_pool: ClassVar[ParsePool] = ParsePool()
+    # Threads that feed large pages to incremental parsers, see _parse_until
+    parse_lanes: ClassVar[ThreadLanes] = ThreadLanes()
+    # Shared metadata probe engine, see TrueLinkResolver.configure_probe_engine
+    probe_engine: ClassVar[ProbeEngine] = ProbeEngine()
+
     def __init__(self, proxy: str | None = None) -> None:
         """Initialize the resolver."""
         self.session: aiohttp.ClientSession | None = None
         self.proxy = proxy
+        self._users = 0
+        # Sessions bound to a local address, see _source_session
+        self._source_sessions: dict[str, aiohttp.ClientSession] = {}
 
     async def __aenter__(self) -> Self:
         """Enter the async context."""
         await self._create_session()
+        self._users += 1
         return self
 
     async def __aexit__(
@@ -40,39 +268,862 @@ class BaseResolver(ABC):
         exc_val: BaseException | None,
         exc_tb: TracebackType | None,
     ) -> None:
-        """Exit the async context."""
-        await self._close_session()
+        """Exit the async context.
+
+        Instances are shared between concurrent resolves, so the session is only
+        closed when the last one exits.
+        """
+        self._users -= 1
+        if not self._users:
+            await self._close_session()
 
     async def _create_session(self) -> None:
         """Create HTTP session."""
         if not self.session:
-            self.session = aiohttp.ClientSession(
-                headers={"User-Agent": self.USER_AGENT},
-                timeout=aiohttp.ClientTimeout(total=30),
-                proxy=self.proxy,
+            self.session = self._new_session()
+
+    def _new_session(self, **kwargs: object) -> aiohttp.ClientSession:
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_response_chunk_received.append(_count_body)
+        return aiohttp.ClientSession(
+            headers={"User-Agent": self.USER_AGENT},
+            timeout=aiohttp.ClientTimeout(total=30),
+            proxy=self.proxy,
+            trace_configs=[trace_config],
+            **kwargs,
+        )
+
+    def _source_session(self, address: str) -> aiohttp.ClientSession:
+        """Return a session whose connections are made from a local address.
+
+        It shares the cookies of the main session, so a resolve keeps its
+        cookies whichever address it runs from.
+        """
+        session = self._source_sessions.get(address)
+        if session is None:
+            session = self._source_sessions[address] = self._new_session(
+                connector=aiohttp.TCPConnector(local_addr=(address, 0)),
+                cookie_jar=self.session.cookie_jar,
             )
+        return session
 
     async def _close_session(self) -> None:
         """Close HTTP session."""
-        if self.session:
-            await self.session.close()
-            self.session = None
+        # Detached first, so a resolve starting during the close gets a new one
+        session, self.session = self.session, None
+        sessions = list(self._source_sessions.values())
+        self._source_sessions = {}
+        if session:
+            sessions.append(session)
+        for session in sessions:
+            await session.close()
+
+    def _current_proxy(self) -> str | None:
+        """Return the proxy requests of the current resolve go through."""
+        route = proxy_route.get()
+        return self.proxy if route is None else route[1]
+
+    async def _request(
+        self, method: str, url: str, **kwargs: object
+    ) -> aiohttp.ClientResponse:
+        """Make a request from the address and proxy picked for the resolve.
+
+        With a proxy or source address pool in use, the outcome of the request
+        is reported to the pool, and its latency to the proxy pool. The request
+        is counted against the budget of the resolve first.
+        """
+        self._count_request()
+        if not self.session:
+            await self._create_session()
+        session = self.session
+        source = source_route.get()
+        if source is not None:
+            session = self._source_session(source[1])
+        route = proxy_route.get()
+        proxy = None if route is None else route[1]
+        if proxy is not None:
+            kwargs.setdefault("proxy", proxy)
+
+        start = time.monotonic()
+        try:
+            response = await session.request(method, url, **kwargs)
+        except (
+            aiohttp.ClientConnectionError,
+            aiohttp.ClientHttpProxyError,
+            TimeoutError,
+        ):
+            if proxy is not None:
+                route[0].report(proxy, ok=False)
+            if source is not None:
+                source[0].report(source[1], ok=False)
+            raise
+        if proxy is not None:
+            # 407: the proxy rejected its credentials
+            route[0].report(
+                proxy, ok=response.status != 407, latency=time.monotonic() - start
+            )
+        if source is not None:
+            source[0].report(source[1], ok=True)
+        return response
+
+    @staticmethod
+    def _count_request() -> None:
+        """Count a request against the budget of the current resolve.
+
+        Requests made through ``_request`` are counted already; call this for
+        others, such as cloudscraper requests.
+
+        Raises:
+            BudgetExceededException: If the budget has no room for it
+
+        """
+        meter = usage_meter.get()
+        if meter is not None:
+            meter.request()
+
+    @staticmethod
+    def _count_read(size: int) -> None:
+        """Count response bytes received outside of an aiohttp read()."""
+        meter = usage_meter.get()
+        if meter is not None:
+            meter.read(size)
+
+    @staticmethod
+    def _count_file() -> None:
+        """Count a folder file against the budget, before resolving it.
+
+        Raises:
+            BudgetExceededException: If the budget has no room for it
+
+        """
+        meter = usage_meter.get()
+        if meter is not None:
+            meter.file()
+
+    @staticmethod
+    def _keep_partial(folder: FolderResult) -> FolderResult:
+        """Register the folder result being built by the current resolve.
+
+        If the budget runs out during the crawl, the resolve returns the files
+        added so far instead of failing.
+
+        Args:
+            folder: The folder result files are added to
+
+        Returns:
+            The same folder result
+
+        """
+        meter = usage_meter.get()
+        if meter is not None:
+            meter.partial = folder
+        return folder
+
+    @staticmethod
+    def _filtering() -> bool:
+        """Whether the current resolve has a crawl filter.
+
+        A filtered folder with no matching files is a valid, empty result
+        rather than an extraction failure.
+        """
+        return folder_filter.get() is not None
+
+    @staticmethod
+    def _wants_subfolder(path: str) -> bool:
+        """Whether the crawl filter lets the crawl descend into a subfolder.
+
+        Args:
+            path: Path of the subfolder from the top of the share, including
+                its name
+
+        """
+        flt = folder_filter.get()
+        return flt is None or flt.visits(path)
+
+    @staticmethod
+    def _wants_file(filename: str | None, size: int | None, path: str = "") -> bool:
+        """Whether the crawl filter lets a folder file through.
+
+        Call it before probing the file or requesting a token for it, with what
+        the listing tells, and again after probing if the name or size was not
+        known.
+
+        Args:
+            filename: Name of the file, or None if not known yet
+            size: Size of the file in bytes, or None if not known yet
+            path: Path of its folder from the top of the share
+
+        """
+        flt = folder_filter.get()
+        return flt is None or flt.accepts(filename, size, path)
+
+    @staticmethod
+    def _files_left(folder: FolderResult | None = None) -> int | None:
+        """Return how many more files the crawl filter allows.
+
+        Args:
+            folder: The folder result files are added to, if any yet
+
+        Returns:
+            The number of files, or None without a limit
+
+        """
+        flt = folder_filter.get()
+        if flt is None or flt.max_files is None:
+            return None
+        return max(0, flt.max_files - len(folder.contents if folder else ()))
 
     async def _get(
         self, url: str, **kwargs: dict[str, Any]
     ) -> aiohttp.ClientResponse:
         """Make GET request."""
-        if not self.session:
-            await self._create_session()
-        return await self.session.get(url, **kwargs)
+        response = await self._request("GET", url, **kwargs)
+        if self.RAISE_ON_RATE_LIMIT:
+            self._check_rate_limit(response)
+        return response
 
     async def _post(
         self, url: str, **kwargs: dict[str, Any]
     ) -> aiohttp.ClientResponse:
         """Make POST request."""
-        if not self.session:
-            await self._create_session()
-        return await self.session.post(url, **kwargs)
+        response = await self._request("POST", url, **kwargs)
+        if self.RAISE_ON_RATE_LIMIT:
+            self._check_rate_limit(response)
+        return response
+
+    def _check_rate_limit(self, response: aiohttp.ClientResponse) -> None:
+        """Raise RateLimitedException if a response asks to slow down.
+
+        A 429, or a 503 with a Retry-After header, counts as rate limiting. The
+        response is released before raising.
+
+        Args:
+            response: The response to check
+
+        Raises:
+            RateLimitedException: If the response is a rate limit
+
+        """
+        retry_after = response.headers.get("Retry-After")
+        if response.status == 429 or (
+            response.status == 503 and retry_after is not None
+        ):
+            response.release()
+            msg = f"Rate limited by {response.url.host} (HTTP {response.status})"
+            raise RateLimitedException(
+                msg, retry_after=parse_retry_after(retry_after)
+            )
+
+    async def _run_sync(
+        self, func: Callable[..., T], *args: object, **kwargs: object
+    ) -> T:
+        """Run a blocking callable on the dedicated sync executor."""
+        return await BaseResolver.sync_executor.run(func, *args, **kwargs)
+
+    async def _defer(
+        self,
+        delay: float,
+        func: Callable[..., Awaitable[LinkResult | FolderResult]],
+        *args: object,
+    ) -> LinkResult | FolderResult:
+        """Continue the resolve with ``func(*args)`` after a delay.
+
+        Use this for waits a provider imposes before the next step. Under
+        ``TrueLinkResolver``, the resolve is parked instead: its concurrency
+        slots are released while it waits, while the session and its cookies
+        are kept for ``func``. Otherwise this sleeps.
+
+        Args:
+            delay: Seconds to wait
+            func: Coroutine function that finishes the resolve
+            *args: Arguments for func
+
+        Returns:
+            The result of func
+
+        Raises:
+            DeferredResolve: If the caller schedules the wait
+
+        """
+        if defer_waits.get():
+            raise DeferredResolve(delay, functools.partial(func, *args))
+        await asyncio.sleep(delay)
+        return await func(*args)
+
+    async def _parse(
+        self, func: Callable[..., T], data: str | bytes, *args: object
+    ) -> T:
+        """Run a parsing function on a document, off the event loop if large.
+
+        Documents up to ``INLINE_PARSE_BYTES`` characters or bytes are parsed
+        inline, where handing them off would cost more than the parse. Larger
+        ones run in a worker process of the parse pool if it is enabled, since
+        regex and pure-Python parsing hold the GIL. Otherwise they run on the
+        sync executor, which lets the event loop in between bytecodes but not
+        during a single long regex call.
+
+        Args:
+            func: Picklable callable, called as ``func(data, *args)``; use a
+                static or class method rather than a bound method
+            data: The document to parse
+            *args: Further picklable arguments for func
+
+        Returns:
+            The value returned by func
+
+        """
+        if len(data) <= self.INLINE_PARSE_BYTES:
+            BaseResolver.parse_counters["inline"] += 1
+            return func(data, *args)
+        if BaseResolver.parse_pool.max_workers:
+            BaseResolver.parse_counters["process"] += 1
+            return await BaseResolver.parse_pool.run(func, data, *args)
+        BaseResolver.parse_counters["thread"] += 1
+        return await self._run_sync(func, data, *args)
+
+    async def _gather_limited(
+        self, aws: Iterable[Awaitable[T]], limit: int
+    ) -> list[T | BaseException]:
+        """Await awaitables with at most ``limit`` of them running at once.
+
+        Results keep the input order. Exceptions are returned in place of the
+        results that raised them, so one failing item does not abort the rest.
+        """
+        semaphore = asyncio.Semaphore(limit)
+
+        async def run(aw: Awaitable[T]) -> T:
+            try:
+                async with semaphore:
+                    return await aw
+            except asyncio.CancelledError:
+                # Items still queued when the crawl is cancelled never start
+                if asyncio.iscoroutine(aw):
+                    aw.close()
+                raise
+
+        return await asyncio.gather(*(run(aw) for aw in aws), return_exceptions=True)
+
+    async def _gather_files(
+        self,
+        folder: FolderResult,
+        aws: Iterable[Awaitable[FileItem | None]],
+        limit: int,
+    ) -> list[BaseException]:
+        """Resolve the files of a flat folder into ``folder``.
+
+        Runs like _gather_limited. The folder is registered with _keep_partial
+        first and each file the crawl filter accepts is added as soon as it
+        resolves, in input order, so the files found are kept if the budget
+        runs out. Files are reserved against the filter's ``max_files`` before
+        resolving, like in a folder crawl. A file that fails or that the filter
+        rejects once resolved frees its place for the next one, so the folder
+        fills up to ``max_files`` whenever enough files qualify.
+
+        Args:
+            folder: The folder result to add the files to
+            aws: Awaitables resolving one file each, or to None to skip it
+            limit: Files resolved at a time
+
+        Returns:
+            The exceptions raised, in input order
+
+        """
+        self._keep_partial(folder)
+        positions: list[int] = []
+        left = self._files_left()
+        reserved = 0
+        freed = asyncio.Condition()
+
+        def settled() -> bool:
+            return reserved < left or len(folder.contents) >= left
+
+        async def add(index: int, aw: Awaitable[FileItem | None]) -> None:
+            nonlocal reserved
+            if left is not None:
+                # Wait for the files in flight before giving up on this one
+                async with freed:
+                    await freed.wait_for(settled)
+                if len(folder.contents) >= left:
+                    if asyncio.iscoroutine(aw):
+                        aw.close()
+                    return
+                reserved += 1
+            accepted = False
+            try:
+                item = await aw
+                accepted = item is not None and self._wants_file(
+                    item.filename, item.size
+                )
+            finally:
+                if left is not None and not accepted:
+                    reserved -= 1
+                    async with freed:
+                        freed.notify_all()
+            if not accepted:
+                return
+            at = bisect.bisect(positions, index)
+            positions.insert(at, index)
+            folder.contents.insert(at, item)
+            folder.total_size += item.size or 0
+            if left is not None:
+                async with freed:
+                    freed.notify_all()
+
+        aws = list(aws)
+        try:
+            results = await self._gather_limited(
+                (add(index, aw) for index, aw in enumerate(aws)), limit
+            )
+        except asyncio.CancelledError:
+            # Files still queued when the resolve is cancelled never start
+            for aw in aws:
+                if asyncio.iscoroutine(aw):
+                    aw.close()
+            raise
+        return [e for e in results if isinstance(e, BaseException)]
+
+    async def _crawl_subtree(
+        self,
+        folder: FolderResult,
+        path: str,
+        node: str,
+        crawl: Callable[[], Awaitable[object]],
+    ) -> None:
+        """Crawl a subfolder, retrying only that subfolder if it fails.
+
+        A subfolder that still fails after ``SUBTREE_RETRIES`` more attempts is
+        recorded in ``folder.errors`` and the crawl goes on, so the files found
+        elsewhere are kept. Rate limits are recorded without retrying.
+
+        Args:
+            folder: The folder result being built
+            path: Path of the subfolder within the folder structure
+            node: Provider ID of the subfolder
+            crawl: Lists the subfolder and adds its files to ``folder``. It must
+                fail, if at all, before adding any, and crawl deeper subfolders
+                through this method too.
+
+        """
+        for attempt in range(self.SUBTREE_RETRIES + 1):
+            try:
+                await crawl()
+            except RateLimitedException as e:
+                # Retrying within seconds only spends the quota again
+                error = e
+                break
+            except (
+                ExtractionFailedException,
+                aiohttp.ClientError,
+                TimeoutError,
+            ) as e:
+                meter = usage_meter.get()
+                if meter is not None and meter.exhausted is not None:
+                    # Resolvers may wrap the BudgetExceededException
+                    raise
+                error = e
+                if attempt < self.SUBTREE_RETRIES:
+                    await asyncio.sleep(self.SUBTREE_RETRY_DELAY * (attempt + 1))
+            else:
+                return
+        folder.errors.append(FolderError(path=path, node=node, error=str(error)))
+
+    async def _crawl_folder(
+        self,
+        url: str,
+        folder: FolderResult,
+        opened: tuple[list[str], str | None, dict] | None = None,
+    ) -> FolderResult:
+        """Crawl a whole folder into ``folder`` through the listing hooks.
+
+        Listings and file resolves go through a shared work queue,
+        breadth-first, with ``CRAWL_CONCURRENCY`` of them running at a time.
+        The files end up in listing order however the work interleaves.
+        Subfolders already crawled are skipped, so links between folders
+        cannot loop, and crawling stops ``MAX_CRAWL_DEPTH`` levels down and at
+        the crawl filter's limits. A subfolder whose listing keeps failing is
+        recorded in ``folder.errors``, see _crawl_subtree, and so is a file that
+        fails to resolve. Any other error, a failing top folder, a rate limited
+        file or an exhausted budget included, cancels the rest of the crawl and
+        is raised.
+
+        Args:
+            url: The folder URL
+            folder: The folder result to add the files to; register it with
+                _keep_partial first to keep them if the budget runs out
+            opened: What _open_folder returns, if the resolver already has it
+
+        Returns:
+            The same folder result
+
+        """
+        roots, title, context = opened or await self._open_folder(url)
+        folder.title = folder.title or title or ""
+        if context.get("headers"):
+            folder.headers = context["headers"]
+        state = _CrawlState(folder, context)
+        for index, root in enumerate(roots):
+            state.visited.add(root)
+            self._queue_crawl(state, self._crawl_listing, root, "", 1, 0, (index,))
+        workers = [
+            asyncio.ensure_future(self._crawl_worker(state))
+            for _ in range(self.CRAWL_CONCURRENCY)
+        ]
+        drained = asyncio.ensure_future(state.queue.join())
+        try:
+            await asyncio.wait(
+                [drained, *workers], return_when=asyncio.FIRST_COMPLETED
+            )
+            for worker in workers:
+                if worker.done():
+                    # A worker only stops on an error; the rest is cancelled
+                    worker.result()
+        finally:
+            for task in (drained, *workers):
+                task.cancel()
+            await asyncio.gather(drained, *workers, return_exceptions=True)
+            folder.contents[:] = [item for _, item in sorted(state.found)]
+        return folder
+
+    @staticmethod
+    def _queue_crawl(
+        state: _CrawlState, job: Callable[..., Awaitable[None]], *args: object
+    ) -> None:
+        state.queue.put_nowait(functools.partial(job, state, *args))
+        state.progress.pending += 1
+
+    async def _crawl_worker(self, state: _CrawlState) -> None:
+        while True:
+            job = await state.queue.get()
+            try:
+                await job()
+            finally:
+                state.progress.pending -= 1
+                state.queue.task_done()
+            self._report_progress(state)
+
+    @staticmethod
+    def _report_progress(state: _CrawlState) -> None:
+        callback = crawl_progress.get()
+        if callback is not None:
+            state.progress.errors = len(state.folder.errors)
+            callback(state.progress)
+
+    def _crawl_full(self, state: _CrawlState) -> bool:
+        limit = self._files_left()
+        return limit is not None and state.reserved >= limit
+
+    async def _crawl_listing(  # noqa: PLR0913, PLR0917
+        self,
+        state: _CrawlState,
+        node: str,
+        path: str,
+        page: int,
+        depth: int,
+        key: tuple[int, ...],
+    ) -> None:
+        if self._crawl_full(state):
+            return
+        listed: list[FolderListing] = []
+
+        async def fetch() -> None:
+            listed.append(await self._list_folder(node, page, state.context))
+
+        if path:
+            await self._crawl_subtree(state.folder, path, node, fetch)
+            if not listed:
+                return
+        else:
+            # The top folder failing fails the resolve
+            await fetch()
+        listing = listed[0]
+        state.progress.folders += 1
+        if not path and not state.folder.title:
+            state.folder.title = listing.title or ""
+        for index, entry in enumerate(listing.entries):
+            entry_key = (*key, page, index)
+            if entry.node is None:
+                if self._wants_file(entry.name, entry.size, path):
+                    self._queue_crawl(
+                        state, self._crawl_file, entry, path, entry_key
+                    )
+                continue
+            sub_path = f"{path}/{entry.name}" if path else entry.name
+            if entry.node in state.visited or not self._wants_subfolder(sub_path):
+                continue
+            state.visited.add(entry.node)
+            if depth >= self.MAX_CRAWL_DEPTH:
+                state.folder.errors.append(
+                    FolderError(
+                        path=sub_path,
+                        node=entry.node,
+                        error=f"Deeper than {self.MAX_CRAWL_DEPTH} levels",
+                    )
+                )
+                continue
+            self._queue_crawl(
+                state,
+                self._crawl_listing,
+                entry.node,
+                sub_path,
+                1,
+                depth + 1,
+                entry_key,
+            )
+        if listing.has_more:
+            self._queue_crawl(
+                state, self._crawl_listing, node, path, page + 1, depth, key
+            )
+
+    async def _crawl_file(
+        self,
+        state: _CrawlState,
+        entry: FolderEntry,
+        path: str,
+        key: tuple[int, ...],
+    ) -> None:
+        if self._crawl_full(state):
+            return
+        # Reserved before resolving, so concurrent resolves stop at max_files
+        state.reserved += 1
+        self._count_file()
+        try:
+            item = await self._resolve_entry(entry, path, state.context)
+        except RateLimitedException:
+            # Ends the crawl, so the resolve can be queued again
+            state.reserved -= 1
+            raise
+        except (ExtractionFailedException, aiohttp.ClientError, TimeoutError) as e:
+            state.reserved -= 1
+            meter = usage_meter.get()
+            if meter is not None and meter.exhausted is not None:
+                # Resolvers may wrap the BudgetExceededException
+                raise
+            # One file failing leaves the rest of the crawl going
+            file_path = f"{path}/{entry.name}" if path else entry.name
+            state.folder.errors.append(
+                FolderError(path=file_path, node=None, error=str(e))
+            )
+            return
+        if item is None or not self._wants_file(item.filename, item.size, path):
+            state.reserved -= 1
+            return
+        state.found.append((key, item))
+        state.folder.contents.append(item)
+        state.folder.total_size += item.size or 0
+        state.progress.files += 1
+
+    async def resolve_page(
+        self, url: str, state: dict | None, limit: int
+    ) -> FolderPage:
+        """Resolve one page of the files of a folder URL.
+
+        Walks the folder breadth-first from the position in ``state``, listing
+        it through _list_folder and resolving its files through _resolve_entry,
+        until ``limit`` files are found. The position reached is returned as the
+        page's cursor. A file that fails to resolve is recorded in the page's
+        ``errors`` and skipped. A rate limit ends the page early, with the
+        cursor at the file or listing it hit. Resolvers of providers that list
+        folders page by page implement _open_folder, _list_folder and
+        _resolve_entry to support it.
+
+        Args:
+            url: The folder URL
+            state: Position decoded from the previous page's cursor, or None
+                for the first page
+            limit: Files to return at most
+
+        Returns:
+            FolderPage with the files and the cursor of the next page
+
+        Raises:
+            UnsupportedProviderException: If the resolver does not page folders
+            BudgetExceededException: If the budget runs out before any file
+            RateLimitedException: If the provider rate limits before any file
+
+        """
+        if not self.PAGES_FOLDERS:
+            msg = f"{type(self).__name__} does not support paged folder resolves"
+            raise UnsupportedProviderException(msg)
+        if state is None:
+            roots, title, context = await self._open_folder(url)
+            state = {
+                "title": title,
+                "context": context,
+                "queue": [[root, "", 1, 0] for root in roots],
+            }
+        else:
+            context = await self._resume_folder(url, state["context"])
+            state = {**state, "context": context}
+        title = state["title"]
+        context = state["context"]
+        # Entries of [node, path, listing page, index on that page]
+        queue = deque(list(position) for position in state["queue"])
+        contents: list[FileItem] = []
+        errors: list[FolderError] = []
+        try:
+            while queue and len(contents) < limit:
+                node, path, page, index = queue[0]
+                listing = await self._list_folder(node, page, context)
+                if not path and not title:
+                    title = listing.title
+                entries = listing.entries
+                while index < len(entries) and len(contents) < limit:
+                    # Kept up to date, so an exhausted budget or a rate limit
+                    # resumes here
+                    queue[0][3] = index
+                    item = await self._page_file(
+                        entries[index], path, context, queue, errors
+                    )
+                    if item is not None:
+                        contents.append(item)
+                    index += 1
+                if index < len(entries):
+                    queue[0][3] = index
+                else:
+                    queue.popleft()
+                    if listing.has_more:
+                        queue.appendleft([node, path, page + 1, 0])
+        except RateLimitedException:
+            if not contents and not errors:
+                raise
+        except Exception:
+            # Resolvers may wrap the BudgetExceededException, so the meter
+            # tells whether the budget ran out
+            meter = usage_meter.get()
+            if not contents or meter is None or meter.exhausted is None:
+                raise
+        cursor = None
+        if queue:
+            cursor = dump_cursor(
+                url,
+                {
+                    "title": title,
+                    "context": self._cursor_context(context),
+                    "queue": list(queue),
+                },
+            )
+        return FolderPage(
+            title=title or "",
+            contents=contents,
+            cursor=cursor,
+            total_size=sum(item.size or 0 for item in contents),
+            headers=context.get("headers"),
+            errors=errors,
+        )
+
+    async def _page_file(
+        self,
+        entry: FolderEntry,
+        path: str,
+        context: dict,
+        queue: deque,
+        errors: list[FolderError],
+    ) -> FileItem | None:
+        try:
+            return await self._page_entry(entry, path, context, queue)
+        except RateLimitedException:
+            raise
+        except (ExtractionFailedException, aiohttp.ClientError, TimeoutError) as e:
+            meter = usage_meter.get()
+            if meter is not None and meter.exhausted is not None:
+                # Resolvers may wrap the BudgetExceededException
+                raise
+            # One file failing leaves the rest of the page going
+            file_path = f"{path}/{entry.name}" if path else entry.name
+            errors.append(FolderError(path=file_path, node=None, error=str(e)))
+            return None
+
+    async def _page_entry(
+        self, entry: FolderEntry, path: str, context: dict, queue: deque
+    ) -> FileItem | None:
+        if entry.node is not None:
+            sub_path = f"{path}/{entry.name}" if path else entry.name
+            if self._wants_subfolder(sub_path):
+                queue.append([entry.node, sub_path, 1, 0])
+            return None
+        if not self._wants_file(entry.name, entry.size, path):
+            return None
+        self._count_file()
+        item = await self._resolve_entry(entry, path, context)
+        if item is None or not self._wants_file(item.filename, item.size, path):
+            return None
+        return item
+
+    async def _open_folder(self, url: str) -> tuple[list[str], str | None, dict]:
+        """Find the top of a folder for resolve_page.
+
+        Args:
+            url: The folder URL
+
+        Returns:
+            The provider IDs of the top folders, the folder title if known
+            (otherwise it is taken from the first listing) and a
+            JSON-serializable context handed to _list_folder and _resolve_entry.
+            A ``"headers"`` key in the context becomes the page's headers.
+
+        """
+        raise NotImplementedError
+
+    def _cursor_context(self, context: dict) -> dict:
+        """Return the part of a folder context to keep in a cursor.
+
+        Cursors are only encoded, not encrypted, so access tokens and passwords
+        should be left out here and restored by _resume_folder.
+
+        Args:
+            context: Context from _open_folder
+
+        Returns:
+            JSON-serializable context to store
+
+        """
+        return context
+
+    async def _resume_folder(
+        self,
+        url: str,  # noqa: ARG002
+        context: dict,
+    ) -> dict:
+        """Restore the folder context kept in a cursor.
+
+        Args:
+            url: The folder URL
+            context: Context stored by _cursor_context
+
+        Returns:
+            The context handed to _list_folder and _resolve_entry
+
+        """
+        return context
+
+    async def _list_folder(
+        self, node: str, page: int, context: dict
+    ) -> FolderListing:
+        """List one page of a folder's entries, in a stable order.
+
+        Args:
+            node: Provider ID of the folder
+            page: Listing page, from 1
+            context: Context from _open_folder
+
+        """
+        raise NotImplementedError
+
+    async def _resolve_entry(
+        self, entry: FolderEntry, path: str, context: dict
+    ) -> FileItem | None:
+        """Resolve a file entry of a listing to a FileItem.
+
+        Args:
+            entry: The file entry
+            path: Path of its folder from the top of the share
+            context: Context from _open_folder
+
+        Returns:
+            The file, or None if it cannot be downloaded
+
+        """
+        raise NotImplementedError
 
     @abstractmethod
     async def resolve(self, url: str) -> LinkResult | FolderResult:
@@ -91,18 +1142,14 @@ class BaseResolver(ABC):
 
     def _extract_filename(self, content_disposition: str) -> str | None:
         """Extract filename from Content-Disposition header."""
-        match = re.search(
-            r"filename\*=UTF-8''([^']+)$", content_disposition, re.IGNORECASE
-        )
-        if match:
-            return unquote(match.group(1))
-
-        match = re.search(
-            r"filename=\"([^\"]+)\"", content_disposition, re.IGNORECASE
-        )
-        if match:
-            return match.group(1)
+        return content_disposition_filename(content_disposition)
 
+    def _parse_size(self, size_val: str | float | None) -> int | None:
+        """Parse a size in bytes reported by a provider API."""
+        if isinstance(size_val, str) and size_val.isdigit():
+            return int(size_val)
+        if isinstance(size_val, int | float):
+            return int(size_val)
         return None
 
     def _get_filename_from_url(self, url: str) -> str | None:
@@ -117,17 +1164,61 @@ class BaseResolver(ABC):
         self,
         url: str,
         headers: dict[str, str] | None = None,
+        *,
+        filename: str | None = None,
+        size: int | None = None,
+        mime_type: str | None = None,
     ) -> tuple[str | None, int | None, str | None]:
         """Fetch filename, size, and mime_type from URL.
 
+        Values the provider already reported can be passed in. Whether a request
+        is made depends on the probe policy of the current resolve:
+
+        - ``"none"``: never probe; missing values are derived from the URL.
+        - ``"missing"``: probe only if the filename or size is unknown. Known
+          values take precedence over probed ones.
+        - ``"always"``: always probe. Probed values take precedence over known ones.
+
+        The MIME type is guessed from the filename when it is still unknown.
+
         Returns:
             tuple: (filename, size, mime_type)
 
         """
-        filename: str | None = None
-        size: int | None = None
-        mime_type: str | None = None
+        policy = probe_policy.get()
+        if policy == "always" or (
+            policy == "missing" and (not filename or size is None)
+        ):
+            probed = await self._probe_file_details(url, headers)
+            probed_filename, probed_size, probed_mime_type = probed
+            if policy == "always":
+                filename = probed_filename or filename
+                size = probed_size if probed_size is not None else size
+                mime_type = probed_mime_type or mime_type
+            else:
+                filename = filename or probed_filename
+                size = size if size is not None else probed_size
+                mime_type = mime_type or probed_mime_type
 
+        filename = filename or self._get_filename_from_url(url)
+        if not mime_type and filename:
+            mime_type, _ = mimetypes.guess_type(filename)
+        return filename, size, mime_type
+
+    async def _probe_file_details(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+    ) -> tuple[str | None, int | None, str | None]:
+        """Request filename, size, and mime_type from the server.
+
+        Probes go through the shared probe engine, which caches, coalesces and
+        rate-limits them per host.
+
+        Returns:
+            tuple: (filename, size, mime_type)
+
+        """
         session_created_here = False
         try:
             if not self.session:
@@ -137,71 +1228,241 @@ class BaseResolver(ABC):
             if not self.session:
                 return None, None, None
 
-            request_headers = headers.copy() if headers else {}
-
-            # Try HEAD request first
+            # Requests go through this resolver's session and the resolve's
+            # route, and count against its budget
+            scope = (self, proxy_route.get(), source_route.get(), usage_meter.get())
             try:
-                async with self.session.head(
-                    url, headers=request_headers, allow_redirects=True
-                ) as resp:
-                    if resp.status == 200:
-                        content_disposition = resp.headers.get("Content-Disposition")
-                        if content_disposition:
-                            filename = self._extract_filename(content_disposition)
+                return await BaseResolver.probe_engine.probe(
+                    url, headers, self._probe_request, scope
+                )
+            except BudgetExceededException:
+                meter = usage_meter.get()
+                if meter is not None and meter.exhausted is not None:
+                    raise
+                # Budget ran out for another resolve; the probe just failed here
+                return None, None, None
+        finally:
+            if session_created_here:
+                await self._close_session()
 
-                        if not filename:
-                            filename = self._get_filename_from_url(url)
+    async def _probe_request(
+        self, method: str, url: str, headers: dict[str, str], sniff_bytes: int = 0
+    ) -> tuple[str | None, int | None, str | None] | None:
+        """Make one HEAD or ranged GET probe request.
 
-                        content_length = resp.headers.get("Content-Length")
-                        if content_length and content_length.isdigit():
-                            size = int(content_length)
+        If ``sniff_bytes`` is set and the server reports no useful Content-Type,
+        the first bytes of a GET response are used to identify the type.
 
-                        mime_type = (
-                            resp.headers.get("Content-Type", "").split(";")[0].strip()
-                        )
+        Returns:
+            tuple: (filename, size, mime_type), or None if the request failed
 
-                        return filename, size, mime_type
+        """
+        request_headers = headers.copy()
+        if method == "GET":
+            request_headers["Range"] = f"bytes=0-{max(sniff_bytes, 1) - 1}"
 
-            except aiohttp.ClientError:
-                pass
+        try:
+            async with await self._request(
+                method, url, headers=request_headers, allow_redirects=True
+            ) as resp:
+                if resp.status not in ((200,) if method == "HEAD" else (200, 206)):
+                    return None
 
-            # Fallback to GET request with Range header
-            try:
-                range_headers = request_headers.copy()
-                range_headers["Range"] = "bytes=0-0"
-
-                async with self.session.get(
-                    url, headers=range_headers, allow_redirects=True
-                ) as resp:
-                    if resp.status in (200, 206):
-                        if not filename:
-                            content_disposition = resp.headers.get("Content-Disposition")
-                            if content_disposition:
-                                filename = self._extract_filename(content_disposition)
-
-                            if not filename:
-                                filename = self._get_filename_from_url(url)
-
-                        content_range = resp.headers.get("Content-Range")
-                        if content_range:
-                            with contextlib.suppress(ValueError, IndexError):
-                                size = int(content_range.split("/")[-1])
-
-                        if not mime_type:
-                            mime_type = (
-                                resp.headers.get("Content-Type", "")
-                                .split(";")[0]
-                                .strip()
-                            )
-
-            except aiohttp.ClientError:
-                pass
+                filename = None
+                content_disposition = resp.headers.get("Content-Disposition")
+                if content_disposition:
+                    filename = self._extract_filename(content_disposition)
+                if not filename:
+                    filename = self._get_filename_from_url(url)
 
-        finally:
-            if session_created_here:
-                await self._close_session()
+                size = None
+                content_range = resp.headers.get("Content-Range")
+                content_length = resp.headers.get("Content-Length")
+                if content_range:
+                    with contextlib.suppress(ValueError, IndexError):
+                        size = int(content_range.split("/")[-1])
+                elif (
+                    content_length
+                    and content_length.isdigit()
+                    and (method == "HEAD" or resp.status == 200)
+                ):
+                    # A 200 to a ranged GET means the range was ignored
+                    size = int(content_length)
 
-        return filename, size, mime_type
+                mime_type = (
+                    resp.headers.get("Content-Type", "").split(";")[0].strip()
+                )
+                if sniff_bytes and mime_type.lower() in mimetypes.GENERIC_TYPES:
+                    sniffed = mimetypes.sniff_type(
+                        await self._read_prefix(resp, sniff_bytes)
+                    )
+                    guessed = mimetypes.guess_type(filename or "")[0]
+                    # ZIP is also the container of docx, epub, apk, jar...
+                    if sniffed == "application/zip" and guessed:
+                        sniffed = guessed
+                    mime_type = sniffed or guessed or mime_type
+                return filename, size, mime_type
+
+        except (aiohttp.ClientError, TimeoutError, RuntimeError):
+            return None
+
+    async def _read_prefix(
+        self, response: aiohttp.ClientResponse, limit: int
+    ) -> bytes:
+        """Read at most ``limit`` bytes from the start of a response body."""
+        data = b""
+        while len(data) < limit:
+            chunk = await response.content.read(limit - len(data))
+            if not chunk:
+                break
+            self._count_read(len(chunk))
+            data += chunk
+        return data
+
+    async def _read_until(
+        self,
+        response: aiohttp.ClientResponse,
+        pattern: re.Pattern[str],
+        *,
+        max_bytes: int | None = None,
+        overlap: int = 4096,
+    ) -> tuple[re.Match[str] | None, str]:
+        """Read a response body until ``pattern`` matches.
+
+        The body is decoded as it arrives and only the newly read text, plus
+        ``overlap`` characters before it, is searched each time, so the work
+        stays linear in the size of the body. A match is accepted once
+        ``overlap`` characters follow it or the body has ended, so greedy
+        patterns see their full extent. Reading stops at the first accepted
+        match; leaving the response context then releases the rest. The match
+        is made on the searched window, not on the text returned.
+
+        Args:
+            response: The response to read
+            pattern: Compiled pattern to look for. It should not match more than
+                ``overlap`` characters.
+            max_bytes: Stop reading after this many bytes (default:
+                ``MAX_PAGE_BYTES``)
+            overlap: Characters kept in front of new text when searching
+
+        Returns:
+            tuple: (match or None, text read so far)
+
+        """
+        limit = self.MAX_PAGE_BYTES if max_bytes is None else max_bytes
+        try:
+            decoder_class = codecs.getincrementaldecoder(response.charset or "utf-8")
+        except LookupError:
+            decoder_class = codecs.getincrementaldecoder("utf-8")
+        decoder = decoder_class(errors="replace")
+        parts: list[str] = []
+        # Text still to be searched: the new text and what precedes it
+        window = ""
+        received = 0
+        done = False
+        while not done:
+            chunk = await response.content.read(
+                min(self.READ_CHUNK_SIZE, limit - received)
+            )
+            received += len(chunk)
+            self._count_read(len(chunk))
+            done = not chunk or received >= limit
+            text = decoder.decode(chunk, final=done)
+            parts.append(text)
+            window += text
+
+            match = pattern.search(window)
+            if match is None:
+                window = window[-overlap:] if overlap else ""
+            elif done or len(window) - match.end() >= overlap:
+                return match, "".join(parts)
+            else:
+                window = window[match.start() :]
+        return None, "".join(parts)
+
+    async def _parse_until(
+        self,
+        response: aiohttp.ClientResponse,
+        predicate: Callable[[HtmlElement], bool],
+        *,
+        tag: str | Sequence[str] | None = None,
+        max_bytes: int | None = None,
+    ) -> tuple[HtmlElement, HtmlElement | None]:
+        """Parse an HTML response as it streams in until an element matches.
+
+        Raw bytes are fed to an incremental parser and ``predicate`` is called for
+        every element (or every ``tag`` element) once its end tag is parsed.
+        Reading stops at the first match. The tree returned then holds the page
+        up to that point, with open elements closed.
+
+        If the first block read exceeds ``INLINE_PARSE_BYTES``, the page is fed to
+        the parser on one of the shared ``parse_lanes`` threads, since lxml
+        releases the GIL while parsing. A parser must not be used from several
+        threads, so the same lane parses the whole page.
+
+        Args:
+            response: The response to parse
+            predicate: Returns True for the element being looked for
+            tag: Only check elements with this tag name or names
+            max_bytes: Stop reading after this many bytes (default:
+                ``MAX_PAGE_BYTES``)
+
+        Returns:
+            tuple: (document root, matching element or None)
+
+        Raises:
+            ExtractionFailedException: If the page is empty
+
+        """
+        limit = self.MAX_PAGE_BYTES if max_bytes is None else max_bytes
+        try:
+            parser = etree.HTMLPullParser(
+                events=("end",), tag=tag, encoding=response.charset or "utf-8"
+            )
+        except LookupError:
+            parser = etree.HTMLPullParser(events=("end",), tag=tag, encoding="utf-8")
+        parser.set_element_class_lookup(HtmlElementClassLookup())
+
+        worker: ThreadPoolExecutor | None = None
+
+        async def call(func: Callable[..., T], *args: object) -> T:
+            if worker is None:
+                return func(*args)
+            return await asyncio.wrap_future(worker.submit(func, *args))
+
+        found = None
+        received = 0
+        with contextlib.ExitStack() as stack:
+            while found is None and received < limit:
+                # Each feed has a fixed cost in the parser, so feed larger blocks
+                try:
+                    chunk = await response.content.readexactly(
+                        min(self.PARSE_CHUNK_SIZE, limit - received)
+                    )
+                except asyncio.IncompleteReadError as e:
+                    chunk = e.partial
+                if not chunk:
+                    break
+                if not received:
+                    if len(chunk) > self.INLINE_PARSE_BYTES:
+                        BaseResolver.parse_counters["thread"] += 1
+                        worker = stack.enter_context(BaseResolver.parse_lanes.lane())
+                    else:
+                        BaseResolver.parse_counters["inline"] += 1
+                received += len(chunk)
+                self._count_read(len(chunk))
+                await call(parser.feed, chunk)
+                found = next(
+                    (el for _, el in parser.read_events() if predicate(el)), None
+                )
+
+            try:
+                root = await call(parser.close)
+            except etree.XMLSyntaxError:
+                root = None
+        if root is None:
+            self._raise_extraction_failed("Received an empty page")
+        return root, found
 
     def _raise_extraction_failed(self, msg: str) -> None:
         """Raise ExtractionFailedException with message.
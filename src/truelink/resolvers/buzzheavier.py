@@ -3,21 +3,33 @@
 from __future__ import annotations
 
 import re
-from typing import ClassVar
+from typing import TYPE_CHECKING, ClassVar
 
-from lxml.html import HtmlElement, fromstring
-
-from truelink.exceptions import ExtractionFailedException
+from truelink.exceptions import ExtractionFailedException, RateLimitedException
 from truelink.types import FileItem, FolderResult, LinkResult
 
 from .base import BaseResolver
 
+if TYPE_CHECKING:
+    from lxml.html import HtmlElement
+
 
 class BuzzHeavierResolver(BaseResolver):
     """Resolver for BuzzHeavier URLs."""
 
     DOMAINS: ClassVar[list[str]] = ["buzzheavier.com"]
 
+    # Maximum number of folder rows resolved at once
+    ROW_CONCURRENCY: ClassVar[int] = 8
+
+    @staticmethod
+    def _is_page_target(element: HtmlElement) -> bool:
+        # The file download button, or the whole table of a folder
+        if element.tag == "tbody":
+            return element.get("id") == "tbody"
+        classes = element.get("class", "")
+        return "link-button" in classes and "gay-button" in classes
+
     async def resolve(self, url: str) -> LinkResult | FolderResult:
         """Resolve BuzzHeavier URL."""
         pattern = r"^https?://buzzheavier.com/[a-zA-Z0-9]+$"
@@ -26,8 +38,9 @@ class BuzzHeavierResolver(BaseResolver):
 
         try:
             async with await self._get(url) as response:
-                html_content = await response.text()
-                tree = fromstring(html_content)
+                tree, _ = await self._parse_until(
+                    response, self._is_page_target, tag=("a", "tbody")
+                )
 
             link_elements = tree.xpath(
                 "//a[contains(@class, 'link-button') and contains(@class, 'gay-button')]/@hx-get",
@@ -62,6 +75,8 @@ class BuzzHeavierResolver(BaseResolver):
 
             self._raise_extraction_failed("No download link found")
 
+        except RateLimitedException:
+            raise
         except ExtractionFailedException as e:
             msg = f"Failed to resolve BuzzHeavier URL: {e}"
             raise ExtractionFailedException(
@@ -93,58 +108,60 @@ class BuzzHeavierResolver(BaseResolver):
         self, tree: HtmlElement, folder_elements: list[HtmlElement]
     ) -> FolderResult:
         """Process folder contents."""
-        contents = []
-        total_size = 0
-
+        file_ids = []
         for element in folder_elements:
-            try:
-                file_id = element.xpath(".//a")[0].get("href", "").strip()
-
-                download_url = await self._get_download_url(
-                    f"https://buzzheavier.com{file_id}",
-                    is_folder=True,
-                )
-
-                if download_url:
-                    referer = download_url.split("?")[0]
-                    buzz_headers = {
-                        "referer": referer,
-                        "hx-current-url": referer,
-                        "hx-request": "true",
-                        "priority": "u=1, i",
-                    }
-                    (
-                        actual_filename,
-                        item_size,
-                        mime_type,
-                    ) = await self._fetch_file_details(
-                        download_url,
-                        headers=buzz_headers,
-                    )
-
-                    contents.append(
-                        FileItem(
-                            url=download_url,
-                            filename=actual_filename,
-                            mime_type=mime_type,
-                            size=item_size,
-                            path="",
-                        ),
-                    )
-                    if item_size is not None:
-                        total_size += item_size
-
-            except ExtractionFailedException:
-                continue
+            anchors = element.xpath(".//a")
+            # The row shows the name; the size is only known after probing
+            if anchors and self._wants_file(
+                anchors[0].text_content().strip() or None, None
+            ):
+                file_ids.append(anchors[0].get("href", "").strip())
 
         title = (
             tree.xpath("//span/text()")[0].strip()
             if tree.xpath("//span/text()")
             else "BuzzHeavier Folder"
         )
+        folder = FolderResult(title=title, contents=[], total_size=0)
+        errors = await self._gather_files(
+            folder,
+            (self._process_folder_row(file_id) for file_id in file_ids),
+            self.ROW_CONCURRENCY,
+        )
+        for error in errors:
+            # A row that fails to resolve is skipped; rate limits, an exhausted
+            # budget and unexpected errors fail the folder
+            if isinstance(error, RateLimitedException) or not isinstance(
+                error, ExtractionFailedException
+            ):
+                raise error
+        return folder
+
+    async def _process_folder_row(self, file_id: str) -> FileItem | None:
+        """Resolve a single folder row to a file item."""
+        self._count_file()
+        download_url = await self._get_download_url(
+            f"https://buzzheavier.com{file_id}",
+            is_folder=True,
+        )
+        if not download_url:
+            return None
 
-        return FolderResult(
-            title=title,
-            contents=contents,
-            total_size=total_size,
+        referer = download_url.split("?")[0]
+        buzz_headers = {
+            "referer": referer,
+            "hx-current-url": referer,
+            "hx-request": "true",
+            "priority": "u=1, i",
+        }
+        filename, size, mime_type = await self._fetch_file_details(
+            download_url,
+            headers=buzz_headers,
+        )
+        return FileItem(
+            url=download_url,
+            filename=filename,
+            mime_type=mime_type,
+            size=size,
+            path="",
         )
@@ -3,15 +3,20 @@
 from __future__ import annotations
 
 import re
-from typing import ClassVar
+from typing import TYPE_CHECKING, ClassVar
 
-from lxml.html import fromstring
-
-from truelink.exceptions import ExtractionFailedException, InvalidURLException
+from truelink.exceptions import (
+    ExtractionFailedException,
+    InvalidURLException,
+    RateLimitedException,
+)
 from truelink.types import FolderResult, LinkResult
 
 from .base import BaseResolver
 
+if TYPE_CHECKING:
+    from lxml.html import HtmlElement
+
 PASSWORD_ERROR_MESSAGE_FICHIER = (
     "1Fichier link {} requires a password (append ::password to the URL)."  # noqa: S105
 )
@@ -22,6 +27,10 @@ class FichierResolver(BaseResolver):
 
     DOMAINS: ClassVar[list[str]] = ["1fichier.com"]
 
+    @staticmethod
+    def _is_download_link(element: HtmlElement) -> bool:
+        return element.get("class") == "ok btn-general btn-orange"
+
     async def resolve(self, url: str) -> LinkResult | FolderResult:
         """Resolve 1Fichier.com URL."""
         regex_1fichier = r"^https?://(?:www\.)?1fichier\.com/\?.+"
@@ -52,9 +61,9 @@ class FichierResolver(BaseResolver):
                     self._raise_extraction_failed(
                         f"1Fichier error: Unexpected status code {response.status}.",
                     )
-                response_text = await response.text()
-
-            html = fromstring(response_text)
+                html, _ = await self._parse_until(
+                    response, self._is_download_link, tag="a"
+                )
 
             dl_url_elements = html.xpath(
                 '//a[@class="ok btn-general btn-orange"]/@href',
@@ -76,7 +85,7 @@ class FichierResolver(BaseResolver):
             if not ct_warn_elements:
                 if (
                     "In order to access this file, you will have to validate a first download."
-                    in response_text
+                    in html.text_content()
                 ):
                     self._raise_extraction_failed(
                         "1Fichier error: Requires a prior validation download (often via browser). Link may be restricted.",
@@ -99,8 +108,9 @@ class FichierResolver(BaseResolver):
                         if numbers
                         else "Please wait a few minutes/hours."
                     )
-                    self._raise_extraction_failed(
-                        f"1Fichier error: Download limit reached. {wait_time_msg}",
+                    msg = f"1Fichier error: Download limit reached. {wait_time_msg}"
+                    raise RateLimitedException(
+                        msg, retry_after=numbers[0] * 60 if numbers else None
                     )
 
                 if "bad password" in last_warn_text_content:
@@ -5,7 +5,7 @@ from __future__ import annotations
 import re
 from typing import ClassVar
 
-from truelink.exceptions import ExtractionFailedException
+from truelink.exceptions import ExtractionFailedException, RateLimitedException
 from truelink.types import FolderResult, LinkResult
 
 from .base import BaseResolver
@@ -16,14 +16,15 @@ class FuckingFastResolver(BaseResolver):
 
     DOMAINS: ClassVar[list[str]] = ["fuckingfast.co"]
 
+    DOWNLOAD_PATTERN: ClassVar[re.Pattern] = re.compile(
+        r'window\.open\((["\'])(https://fuckingfast\.co/dl/[^"\']+)\1'
+    )
+
     async def resolve(self, url: str) -> LinkResult | FolderResult:
         """Resolve FuckingFast URL."""
         try:
             async with await self._get(url) as response:
-                content = await response.text()
-
-            pattern = r'window\.open\((["\'])(https://fuckingfast\.co/dl/[^"\']+)\1'
-            match = re.search(pattern, content)
+                match, _ = await self._read_until(response, self.DOWNLOAD_PATTERN)
 
             if not match:
                 self._raise_extraction_failed("Could not find download link in page")
@@ -35,9 +36,10 @@ class FuckingFastResolver(BaseResolver):
                 url=download_url, filename=filename, mime_type=mime_type, size=size
             )
 
+        except RateLimitedException:
+            raise
         except ExtractionFailedException as e:
             msg = f"Failed to resolve FuckingFast URL: {e}"
             raise ExtractionFailedException(
                 msg,
             ) from e
-
@@ -2,15 +2,15 @@
 
 from __future__ import annotations
 
+import time
 from hashlib import sha256
-from pathlib import Path
 from typing import TYPE_CHECKING, ClassVar
 from urllib.parse import urlparse
 
 from truelink.exceptions import ExtractionFailedException, InvalidURLException
 from truelink.types import FileItem, FolderResult, LinkResult
 
-from .base import BaseResolver
+from .base import BaseResolver, FolderEntry, FolderListing
 
 if TYPE_CHECKING:
     import aiohttp
@@ -24,14 +24,28 @@ class GoFileResolver(BaseResolver):
     """Resolver for GoFile.io URLs."""
 
     DOMAINS: ClassVar[list[str]] = ["gofile.io"]
+    PAGES_FOLDERS: ClassVar[bool] = True
+    # Children per contents request in resolve_page
+    LISTING_PAGE_SIZE: ClassVar[int] = 1000
+    # Seconds a guest account token is reused for, by resolves and pages alike
+    TOKEN_TTL: ClassVar[int] = 1800
 
     def __init__(self, proxy: str | None = None) -> None:
-        """Initialize the GoFileResolver."""
-        super().__init__(proxy=proxy)
-        self._folder_details: FolderResult | None = None
-        self._account_token: str | None = None
+        """Initialize the resolver."""
+        super().__init__(proxy)
+        # Guest account token and the monotonic time it was fetched
+        self._account_token: tuple[str, float] | None = None
 
     async def _get_account_token(self) -> str:
+        """Return the guest account token, creating a new account once expired."""
+        cached = self._account_token
+        if cached is not None and time.monotonic() - cached[1] < self.TOKEN_TTL:
+            return cached[0]
+        token = await self._create_account()
+        self._account_token = (token, time.monotonic())
+        return token
+
+    async def _create_account(self) -> str:
         api_url = "https://api.gofile.io/accounts"
         async with await self._post(api_url, data=None) as response:
             if response.status != 200:
@@ -53,26 +67,22 @@ class GoFileResolver(BaseResolver):
 
         return data["data"]["token"]
 
-    async def _fetch_folder_contents(
+    async def _get_contents(
         self,
+        account_token: str,
         content_id: str,
         password_hash: str,
-        current_path: str = "",
-    ) -> None:
-        if self._folder_details is None:
-            self._folder_details = FolderResult(title="", contents=[], total_size=0)
-
-        if not self._account_token:
-            msg = "GoFile: Missing account token."
-            raise ExtractionFailedException(msg)
-
+        page: int | None = None,
+    ) -> dict:
         api_url = (
             f"https://api.gofile.io/contents/{content_id}?wt=4fd6sg89d7s6&cache=true"
         )
         if password_hash:
             api_url += f"&password={password_hash}"
+        if page is not None:
+            api_url += f"&page={page}&pageSize={self.LISTING_PAGE_SIZE}"
 
-        headers = {"Authorization": f"Bearer {self._account_token}"}
+        headers = {"Authorization": f"Bearer {account_token}"}
 
         try:
             async with await self._get(api_url, headers=headers) as response:
@@ -91,45 +101,17 @@ class GoFileResolver(BaseResolver):
             )
             raise ExtractionFailedException(msg)
 
-        node = data.get("data")
-        if not node:
+        if not data.get("data"):
             msg = "GoFile API error: 'data' node missing."
             raise ExtractionFailedException(msg)
-
-        if not self._folder_details.title:
-            self._folder_details.title = node.get(
-                "name",
-                content_id if node.get("type") == "folder" else "GoFile Content",
-            )
-
-        for child_id, content in node.get("children", {}).items():
-            name = content.get("name", child_id)
-            if content.get("type") == "folder":
-                if not content.get("public", True):
-                    continue
-                next_path = str(Path(current_path) / name) if current_path else name
-                await self._fetch_folder_contents(child_id, password_hash, next_path)
-            else:
-                url = content.get("link")
-                if not url:
-                    continue
-                filename, size, mime_type = await self._fetch_file_details(
-                    url, {"Cookie": f"accountToken={self._account_token}"}
-                )
-                self._folder_details.contents.append(
-                    FileItem(
-                        url=url,
-                        filename=filename,
-                        mime_type=mime_type,
-                        size=size,
-                        path=current_path,
-                    )
-                )
-                self._folder_details.total_size += size
+        return data
 
     async def _handle_api_error(
         self, response: aiohttp.ClientResponse, content_id: str
     ) -> None:
+        if response.status == 401:
+            # The guest token was rejected; the next attempt gets a new one
+            self._account_token = None
         try:
             error_data = await response.json()
             status = error_data.get("status", "")
@@ -154,11 +136,8 @@ class GoFileResolver(BaseResolver):
             msg = f"GoFile API error {response.status}: {text[:200]}"
             raise ExtractionFailedException(msg) from None
 
-    async def resolve(self, url: str) -> LinkResult | FolderResult:
-        """Resolve GoFile.io URL."""
-        self._folder_details = FolderResult(title="", contents=[], total_size=0)
-        self._account_token = None
-
+    @staticmethod
+    def _parse_url(url: str) -> tuple[str, str, str]:
         request_url, password = ([*url.split("::", 1), ""])[:2]
         parsed = urlparse(request_url)
         content_id = parsed.path.strip("/").split("/")[-1]
@@ -168,12 +147,86 @@ class GoFileResolver(BaseResolver):
             raise InvalidURLException(msg)
 
         password_hash = sha256(password.encode()).hexdigest() if password else ""
+        return request_url, content_id, password_hash
+
+    async def _open_folder(self, url: str) -> tuple[list[str], str | None, dict]:
+        _, content_id, _ = self._parse_url(url)
+        return [content_id], None, await self._resume_folder(url, {})
+
+    def _cursor_context(self, context: dict) -> dict:  # noqa: ARG002
+        # Everything in the context is a credential
+        return {}
 
+    async def _resume_folder(
+        self,
+        url: str,
+        context: dict,  # noqa: ARG002
+    ) -> dict:
+        # The guest token is not in the cursor; pages share the cached one
+        _, _, password_hash = self._parse_url(url)
+        account_token = await self._get_account_token()
+        return {
+            "token": account_token,
+            "password_hash": password_hash,
+            "headers": {"Cookie": f"accountToken={account_token}"},
+        }
+
+    async def _list_folder(
+        self, node: str, page: int, context: dict
+    ) -> FolderListing:
+        data = await self._get_contents(
+            context["token"], node, context["password_hash"], page=page
+        )
+        entries = []
+        for child_id, content in data["data"].get("children", {}).items():
+            name = content.get("name", child_id)
+            if content.get("type") == "folder":
+                if content.get("public", True):
+                    entries.append(FolderEntry(name=name, node=child_id))
+            elif content.get("link"):
+                entries.append(
+                    FolderEntry(
+                        name=name,
+                        size=content.get("size"),
+                        data={
+                            "link": content["link"],
+                            "mimetype": content.get("mimetype"),
+                        },
+                    )
+                )
+        metadata = data.get("metadata") or data["data"].get("metadata") or {}
+        return FolderListing(
+            entries=entries,
+            has_more=bool(metadata.get("hasNextPage")),
+            title=data["data"].get("name"),
+        )
+
+    async def _resolve_entry(
+        self, entry: FolderEntry, path: str, context: dict
+    ) -> FileItem | None:
+        url = entry.data["link"]
+        filename, size, mime_type = await self._fetch_file_details(
+            url,
+            context["headers"],
+            filename=entry.name,
+            size=entry.size,
+            mime_type=entry.data["mimetype"],
+        )
+        return FileItem(
+            url=url, filename=filename, mime_type=mime_type, size=size, path=path
+        )
+
+    async def resolve(self, url: str) -> LinkResult | FolderResult:
+        """Resolve GoFile.io URL."""
+        request_url, content_id, password_hash = self._parse_url(url)
+
+        folder = self._keep_partial(
+            FolderResult(title="", contents=[], total_size=0)
+        )
         try:
-            self._account_token = await self._get_account_token()
-            await self._fetch_folder_contents(content_id, password_hash)
+            await self._crawl_folder(url, folder)
         except ExtractionFailedException as e:
-            if "passwordRequired" in str(e) and not password:
+            if "passwordRequired" in str(e) and not password_hash:
                 raise ExtractionFailedException(
                     PASSWORD_ERROR_MESSAGE.format(request_url)
                 ) from e
@@ -182,21 +235,19 @@ class GoFileResolver(BaseResolver):
             msg = f"GoFile resolution failed: {e}"
             raise ExtractionFailedException(msg) from e
 
-        headers = {"Cookie": f"accountToken={self._account_token}"}
-
-        if not self._folder_details.contents:
+        folder.title = folder.title or content_id
+        if not folder.contents and not self._filtering():
             msg = f"GoFile: No content found for ID '{content_id}'. It might be empty, private, or protected."
             raise ExtractionFailedException(msg)
 
-        if len(self._folder_details.contents) == 1:
-            item = self._folder_details.contents[0]
+        if len(folder.contents) == 1 and not folder.errors:
+            item = folder.contents[0]
             return LinkResult(
                 url=item.url,
                 filename=item.filename,
                 mime_type=item.mime_type,
                 size=item.size,
-                headers=headers,
+                headers=folder.headers,
             )
 
-        self._folder_details.headers = headers
-        return self._folder_details
+        return folder
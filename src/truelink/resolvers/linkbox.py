@@ -2,15 +2,13 @@
 
 from __future__ import annotations
 
-from pathlib import Path
 from typing import ClassVar
 from urllib.parse import urlparse
 
-from truelink import mimetypes
 from truelink.exceptions import ExtractionFailedException, InvalidURLException
 from truelink.types import FileItem, FolderResult, LinkResult
 
-from .base import BaseResolver
+from .base import BaseResolver, FolderEntry, FolderListing
 
 
 class LinkBoxResolver(BaseResolver):
@@ -24,15 +22,17 @@ class LinkBoxResolver(BaseResolver):
         "telbx.net",
     ]
     BASE_API = "https://www.linkbox.to/api/file"
-
-    def __init__(self, proxy: str | None = None) -> None:
-        """Initialize the LinkBoxResolver."""
-        super().__init__(proxy=proxy)
-        self._folder: FolderResult | None = None
+    PAGES_FOLDERS: ClassVar[bool] = True
+    # Items per share_out_list request in resolve_page
+    LISTING_PAGE_SIZE: ClassVar[int] = 1000
 
     async def resolve(self, url: str) -> LinkResult | FolderResult:
         """Resolve LinkBox.to URL."""
-        self._folder = FolderResult(title="", contents=[], total_size=0)
+        # The instance is shared between concurrent resolves, so the folder is
+        # passed along instead of kept on self
+        folder = self._keep_partial(
+            FolderResult(title="", contents=[], total_size=0)
+        )
         share_token = self._extract_share_token(url)
         initial_data = await self._api_call(
             "share_out_list", {"shareToken": share_token, "pageSize": 1, "pid": 0}
@@ -46,17 +46,24 @@ class LinkBoxResolver(BaseResolver):
             initial_data.get("shareType") == "singleItem"
             and "itemId" in initial_data
         ):
-            await self._fetch_item_detail(initial_data["itemId"])
+            await self._fetch_item_detail(folder, initial_data["itemId"])
         else:
-            self._folder.title = initial_data.get("dirName") or "LinkBox Content"
-            await self._fetch_list_recursive(share_token)
+            await self._crawl_folder(
+                url,
+                folder,
+                opened=(
+                    ["0"],
+                    initial_data.get("dirName") or "LinkBox Content",
+                    {"share_token": share_token},
+                ),
+            )
 
-        if not self._folder.contents:
+        if not folder.contents and not self._filtering():
             msg = "LinkBox: No files found in folder."
             raise ExtractionFailedException(msg)
 
-        if len(self._folder.contents) == 1:
-            file = self._folder.contents[0]
+        if len(folder.contents) == 1 and not folder.errors:
+            file = folder.contents[0]
             return LinkResult(
                 url=file.url,
                 filename=file.filename,
@@ -64,9 +71,9 @@ class LinkBoxResolver(BaseResolver):
                 size=file.size,
             )
 
-        return self._folder
+        return folder
 
-    async def _fetch_item_detail(self, item_id: str) -> None:
+    async def _fetch_item_detail(self, folder: FolderResult, item_id: str) -> None:
         data = await self._api_call("detail", {"itemId": item_id})
         item_info = data.get("itemInfo") if data else None
         if not item_info:
@@ -79,41 +86,74 @@ class LinkBoxResolver(BaseResolver):
             msg = "LinkBox API: Missing URL in item info."
             raise ExtractionFailedException(msg)
 
-        size = self._extract_size(item_info.get("size"))
-        self._folder.title = filename
-        self._add_file(filename, url, size)
+        filename, size, mime_type = await self._fetch_file_details(
+            url, filename=filename, size=self._extract_size(item_info.get("size"))
+        )
+        folder.title = filename
+        self._add_file(folder, filename, url, mime_type, size)
 
-    async def _fetch_list_recursive(
-        self, share_token: str, parent_id: int = 0, current_path: str = ""
-    ) -> None:
+    async def _open_folder(self, url: str) -> tuple[list[str], str | None, dict]:
+        share_token = self._extract_share_token(url)
         data = await self._api_call(
-            "share_out_list",
-            {"shareToken": share_token, "pageSize": 1000, "pid": parent_id},
+            "share_out_list", {"shareToken": share_token, "pageSize": 1, "pid": 0}
         )
+        if data.get("shareType") == "singleItem":
+            msg = f"LinkBox: {url} is a single file, not a folder."
+            raise InvalidURLException(msg)
+        return ["0"], data.get("dirName"), {"share_token": share_token}
 
-        if data.get("shareType") == "singleItem" and "itemId" in data:
-            await self._fetch_item_detail(data["itemId"])
-            return
-
-        self._folder.title = (
-            self._folder.title or data.get("dirName") or "LinkBox Folder"
+    async def _list_folder(
+        self, node: str, page: int, context: dict
+    ) -> FolderListing:
+        data = await self._api_call(
+            "share_out_list",
+            {
+                "shareToken": context["share_token"],
+                "pageSize": self.LISTING_PAGE_SIZE,
+                "pid": node,
+                "page": page,
+            },
         )
-        for item in data.get("list", []):
-            name = item.get("name", "unknown_item")
+        items = data.get("list") or []
+        entries = []
+        for item in items:
             if item.get("type") == "dir" and "url" not in item:
-                await self._fetch_list_recursive(
-                    share_token,
-                    item["id"],
-                    str(Path(current_path) / name) if current_path else name,
+                entries.append(
+                    FolderEntry(
+                        name=item.get("name", "unknown_item"), node=str(item["id"])
+                    )
                 )
             elif "url" in item:
-                filename = self._finalize_filename(item)
-                url = item["url"]
-                size = self._extract_size(item.get("size"))
-                mime_type, _ = mimetypes.guess_type(filename)
-                if mime_type is None:
-                    mime_type = "application/octet-stream"
-                self._add_file(filename, url, mime_type, size, current_path)
+                entries.append(
+                    FolderEntry(
+                        name=self._finalize_filename(item),
+                        size=self._extract_size(item.get("size")),
+                        data={"url": item["url"]},
+                    )
+                )
+        return FolderListing(
+            entries=entries,
+            has_more=len(items) >= self.LISTING_PAGE_SIZE,
+            title=data.get("dirName"),
+        )
+
+    async def _resolve_entry(
+        self,
+        entry: FolderEntry,
+        path: str,
+        context: dict,  # noqa: ARG002
+    ) -> FileItem | None:
+        url = entry.data["url"]
+        filename, size, mime_type = await self._fetch_file_details(
+            url, filename=entry.name, size=entry.size
+        )
+        return FileItem(
+            url=url,
+            filename=filename,
+            mime_type=mime_type or "application/octet-stream",
+            size=size,
+            path=path,
+        )
 
     async def _api_call(self, endpoint: str, params: dict) -> dict:
         try:
@@ -137,7 +177,6 @@ class LinkBoxResolver(BaseResolver):
             msg = f"LinkBox API ({endpoint}) failed: {e!s}"
             raise ExtractionFailedException(msg) from e
 
-
     def _extract_share_token(self, url: str) -> str:
         token = urlparse(url).path.strip("/").split("/")[-1]
         if not token:
@@ -159,18 +198,20 @@ class LinkBoxResolver(BaseResolver):
             name += f".{sub_type}"
         return name
 
-    def _add_file(
+    def _add_file(  # noqa: PLR0913
         self,
+        folder: FolderResult,
         filename: str,
         url: str,
         mime_type: str | None,
         size: int | None,
+        *,
         path: str = "",
     ) -> None:
-        self._folder.contents.append(
+        folder.contents.append(
             FileItem(
                 url=url, filename=filename, mime_type=mime_type, size=size, path=path
             )
         )
         if size:
-            self._folder.total_size += size
+            folder.total_size += size
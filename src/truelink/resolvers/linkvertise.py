@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import ClassVar
 
-from truelink.exceptions import ExtractionFailedException
+from truelink.exceptions import ExtractionFailedException, RateLimitedException
 from truelink.types import LinkResult
 
 from .base import BaseResolver
@@ -46,7 +46,8 @@ class LinkvertiseResolver(BaseResolver):
             # Optionally, fetch further details if needed
             return LinkResult(url=bypassed_url)
 
+        except RateLimitedException:
+            raise
         except Exception as e:
             msg = f"Failed to resolve Linkvertise URL: {e}"
             raise ExtractionFailedException(msg)
-
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import ClassVar
 
-from truelink.exceptions import ExtractionFailedException
+from truelink.exceptions import ExtractionFailedException, RateLimitedException
 from truelink.types import FolderResult, LinkResult
 
 from .base import BaseResolver
@@ -34,9 +34,10 @@ class LulaCloudResolver(BaseResolver):
                     url=location, filename=filename, mime_type=mime_type, size=size
                 )
 
+        except RateLimitedException:
+            raise
         except ExtractionFailedException as e:
             msg = f"Failed to resolve LulaCloud URL: {e}"
             raise ExtractionFailedException(
                 msg,
             ) from e
-
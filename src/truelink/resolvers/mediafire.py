@@ -2,36 +2,58 @@
 
 from __future__ import annotations
 
-import asyncio
 import base64
 import contextlib
+import json
 import re
+import time
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, ClassVar
+from typing import TYPE_CHECKING, ClassVar
 from urllib.parse import unquote, urlparse
 
 import cloudscraper
-from lxml.etree import HTML
-
-from truelink.exceptions import ExtractionFailedException, InvalidURLException
+import requests
+from lxml.etree import HTML, _Element
+
+from truelink.exceptions import (
+    ExtractionFailedException,
+    InvalidURLException,
+    RateLimitedException,
+)
 from truelink.types import FileItem, FolderResult, LinkResult
 
-from .base import BaseResolver
+from .base import (
+    BaseResolver,
+    FolderEntry,
+    FolderListing,
+    proxy_route,
+    source_route,
+)
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Mapping
 
 
 class MediaFireResolver(BaseResolver):
     """Resolver for MediaFire URLs (files and folders)."""
 
     DOMAINS: ClassVar[list[str]] = ["mediafire.com"]
-
-    async def _run_sync(
-        self, func: Callable[..., Any], *args: object, **kwargs: object
-    ) -> object:
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, lambda: func(*args, **kwargs))
+    PAGES_FOLDERS: ClassVar[bool] = True
+    # Files and subfolders per get_content chunk in resolve_page (100 to 1000)
+    LISTING_PAGE_SIZE: ClassVar[int] = 1000
+
+    # Seconds to go straight to cloudscraper for a host after it served a challenge
+    CHALLENGE_MEMORY: ClassVar[int] = 600
+    CHALLENGE_MARKERS: ClassVar[tuple[str, ...]] = (
+        "<title>Just a moment...</title>",
+        "window._cf_chl_opt",
+        "cf-browser-verification",
+    )
+
+    # host -> monotonic time of the last challenge seen
+    _challenged_hosts: ClassVar[dict[str, float]] = {}
+    # 429 and 503 may be Cloudflare challenges, see _get_content
+    RAISE_ON_RATE_LIMIT: ClassVar[bool] = False
 
     async def resolve(self, url: str) -> LinkResult | FolderResult:
         """Resolve a MediaFire URL."""
@@ -48,24 +70,104 @@ class MediaFireResolver(BaseResolver):
             self._resolve_folder if "/folder/" in base_url else self._resolve_file
         )(url, password)
 
+    def _is_challenge(
+        self, status: int, headers: Mapping[str, str], text: str
+    ) -> bool:
+        """Check whether a response is a Cloudflare challenge page."""
+        if headers.get("cf-mitigated", "").lower() == "challenge":
+            return True
+        if status not in (403, 429, 503):
+            return False
+        return "cloudflare" in headers.get("Server", "").lower() or any(
+            marker in text for marker in self.CHALLENGE_MARKERS
+        )
+
+    def _recently_challenged(self, host: str) -> bool:
+        seen = self._challenged_hosts.get(host)
+        return seen is not None and time.monotonic() - seen < self.CHALLENGE_MEMORY
+
+    @staticmethod
+    def _is_download_button(element: _Element) -> bool:
+        return element.get("id") == "downloadButton"
+
+    def _decode_content(
+        self, url: str, method: str, text: str, *, page: bool
+    ) -> dict | str | _Element:
+        if page:
+            return HTML(text)
+        return json.loads(text) if method == "post" or "api" in url else text
+
     async def _get_content(
         self,
-        scraper: cloudscraper.CloudScraper,
         url: str,
         method: str = "get",
         data: dict | None = None,
         params: dict | None = None,
-    ) -> dict | str:
-        func = scraper.post if method == "post" else scraper.get
-        response = await self._run_sync(
-            func, url, data=data, params=params, timeout=20
-        )
-        response.raise_for_status()
-        return response.json() if method == "post" or "api" in url else response.text
+        *,
+        page: bool = False,
+    ) -> dict | str | _Element:
+        """Fetch a page or API response, escalating to cloudscraper if challenged.
+
+        With ``page`` set, the response is returned as a parsed HTML tree. Pages
+        served without a challenge are parsed as they stream in, up to the
+        download button.
+        """
+        host = urlparse(url).hostname or ""
+        if not self._recently_challenged(host):
+            request = self._post if method == "post" else self._get
+            async with await request(url, data=data, params=params) as response:
+                if (
+                    page
+                    and response.status == 200
+                    and not self._is_challenge(response.status, response.headers, "")
+                ):
+                    html, _ = await self._parse_until(
+                        response, self._is_download_button, tag="a"
+                    )
+                    return html
+                text = await response.text()
+                challenged = self._is_challenge(
+                    response.status, response.headers, text
+                )
+                if not challenged:
+                    self._check_rate_limit(response)
+                    response.raise_for_status()
+            if not challenged:
+                return self._decode_content(url, method, text, page=page)
+            self._challenged_hosts[host] = time.monotonic()
+
+        route = proxy_route.get()
+        proxy = self._current_proxy()
+        source = source_route.get()
+        address = None if source is None else source[1]
+        async with self.sync_executor.scraper(proxy, address) as scraper:
+            scraper.headers.update({"User-Agent": BaseResolver.USER_AGENT})
+            func = scraper.post if method == "post" else scraper.get
+            self._count_request()
+            start = time.monotonic()
+            try:
+                response = await self._run_sync(
+                    func, url, data=data, params=params, timeout=20
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                if route is not None and proxy is not None:
+                    route[0].report(proxy, ok=False)
+                if source is not None:
+                    source[0].report(address, ok=False)
+                raise
+            if route is not None and proxy is not None:
+                route[0].report(
+                    proxy,
+                    ok=response.status_code != 407,
+                    latency=time.monotonic() - start,
+                )
+            if source is not None:
+                source[0].report(address, ok=True)
+            self._count_read(len(response.content))
+            response.raise_for_status()
+            return self._decode_content(url, method, response.text, page=page)
 
-    async def _decode_url(
-        self, html: HTML, scraper: cloudscraper.CloudScraper
-    ) -> str:
+    async def _decode_url(self, html: _Element) -> str:
         """Decode MediaFire download URL from HTML using new method."""
         enc_url = html.xpath('//a[@id="downloadButton"]')
         if not enc_url:
@@ -84,40 +186,30 @@ class MediaFireResolver(BaseResolver):
         elif final_link and final_link.startswith("http"):
             return final_link
         elif final_link and final_link.startswith("//"):
-            return await self._resolve_file(f"https:{final_link}", "", scraper)
+            return await self._resolve_file(f"https:{final_link}", "")
         else:
             msg = "No download link found"
             raise ExtractionFailedException(msg)
 
-    async def _repair_download(
-        self, scraper: cloudscraper.CloudScraper, url: str, password: str
-    ) -> LinkResult:
+    async def _repair_download(self, url: str, password: str) -> LinkResult:
         if url.startswith("//"):
             url = f"https:{url}"
         elif not url.startswith("http"):
             url = f"https://www.mediafire.com/{url.lstrip('/')}"
-        return await self._resolve_file(url, password, scraper)
+        return await self._resolve_file(url, password)
 
-    async def _resolve_file(
-        self,
-        url: str,
-        password: str,
-        scraper: cloudscraper.CloudScraper | None = None,
-    ) -> LinkResult:
+    async def _resolve_file(self, url: str, password: str) -> LinkResult:
         if re.search(r"https?://download\d+\.mediafire\.com/.+/.+/.+", url):
             filename, size, mime_type = await self._fetch_file_details(url)
             return LinkResult(
                 url=url, filename=filename, size=size, mime_type=mime_type
             )
 
-        scraper = scraper or cloudscraper.create_scraper()
-        scraper.headers.update({"User-Agent": BaseResolver.USER_AGENT})
-
         try:
             parsed_url = urlparse(url)
             url = f"{parsed_url.scheme}://{parsed_url.netloc}{parsed_url.path}"
 
-            html = HTML(await self._get_content(scraper, url))
+            html = await self._get_content(url, page=True)
             if error := html.xpath('//p[@class="notranslate"]/text()'):
                 self._raise_extraction_failed(f"MediaFire error: {error[0]}")
 
@@ -126,26 +218,22 @@ class MediaFireResolver(BaseResolver):
                     self._raise_extraction_failed(
                         f"ERROR: This link is password protected. Please provide the password for: {url}",
                     )
-                html = HTML(
-                    await self._get_content(
-                        scraper, url, method="post", data={"downloadp": password}
-                    )
+                html = await self._get_content(
+                    url, method="post", data={"downloadp": password}, page=True
                 )
                 if html.xpath("//div[@class='passwordPrompt']"):
                     self._raise_extraction_failed("MediaFire error: Wrong password.")
 
             # Use the new decoding method
-            final_link = await self._decode_url(html, scraper)
+            final_link = await self._decode_url(html)
 
             # Handle recursive cases
             if final_link.startswith("//"):
-                return await self._resolve_file(
-                    f"https:{final_link}", password, scraper
-                )
+                return await self._resolve_file(f"https:{final_link}", password)
             if "mediafire.com" in urlparse(final_link).hostname and not re.match(
                 r"https?://download\d+\.mediafire\.com", final_link
             ):
-                return await self._resolve_file(final_link, password, scraper)
+                return await self._resolve_file(final_link, password)
 
             filename, size, mime_type = await self._fetch_file_details(final_link)
             return LinkResult(
@@ -163,20 +251,16 @@ class MediaFireResolver(BaseResolver):
                 raise
             msg = f"Failed to resolve MediaFire file '{url}': {e}"
             raise ExtractionFailedException(msg) from e
-        finally:
-            if scraper and not isinstance(scraper, cloudscraper.CloudScraper):
-                await self._run_sync(scraper.close)
 
     async def _api_request(
         self,
-        scraper: cloudscraper.CloudScraper,
         method: str,
         url: str,
         data: dict | None = None,
         params: dict | None = None,
     ) -> dict:
         json_data = await self._get_content(
-            scraper, url, method=method, data=data, params=params
+            url, method=method, data=data, params=params
         )
         response_data = json_data.get("response", {})
         if response_data.get("result") == "Error" or "message" in response_data:
@@ -187,9 +271,7 @@ class MediaFireResolver(BaseResolver):
             raise ExtractionFailedException(msg)
         return response_data
 
-    async def _decode_folder_file_url(
-        self, html: HTML, scraper: cloudscraper.CloudScraper
-    ) -> str | None:
+    async def _decode_folder_file_url(self, html: _Element) -> str | None:
         """Decode URL for files within folders."""
         enc_url = html.xpath('//a[@id="downloadButton"]')
         if not enc_url:
@@ -205,141 +287,173 @@ class MediaFireResolver(BaseResolver):
             return final_link
         elif final_link and final_link.startswith("//"):
             with contextlib.suppress(Exception):
-                return await self._resolve_file(f"https:{final_link}", "", scraper)
+                return await self._resolve_file(f"https:{final_link}", "")
         return None
 
     async def _scrape_folder_file(
-        self, url: str, password: str, scraper: cloudscraper.CloudScraper
+        self,
+        url: str,
+        password: str,
+        filename: str | None = None,
+        size: int | None = None,
     ) -> LinkResult | None:
         """Scrape individual file from folder."""
         try:
             parsed_url = urlparse(url)
             url = f"{parsed_url.scheme}://{parsed_url.netloc}{parsed_url.path}"
 
-            html = HTML(await self._get_content(scraper, url))
+            html = await self._get_content(url, page=True)
 
             if html.xpath("//div[@class='passwordPrompt']"):
                 if not password:
                     self._raise_extraction_failed(
                         f"ERROR: This link is password protected. Please provide the password for: {url}",
                     )
-                html = HTML(
-                    await self._get_content(
-                        scraper, url, method="post", data={"downloadp": password}
-                    )
+                html = await self._get_content(
+                    url, method="post", data={"downloadp": password}, page=True
                 )
                 if html.xpath("//div[@class='passwordPrompt']"):
                     return None
 
-            final_link = await self._decode_folder_file_url(html, scraper)
+            final_link = await self._decode_folder_file_url(html)
             if not final_link:
                 return None
 
-            filename, size, mime_type = await self._fetch_file_details(final_link)
+            filename, size, mime_type = await self._fetch_file_details(
+                final_link, filename=filename, size=size
+            )
             return LinkResult(
                 url=final_link, filename=filename, size=size, mime_type=mime_type
             )
+        except RateLimitedException:
+            raise
         except (
             ExtractionFailedException,
             cloudscraper.exceptions.CloudflareException,
         ):
             return None
 
-    async def _resolve_folder(self, url: str, password: str) -> FolderResult:
-        scraper = cloudscraper.create_scraper()
-        scraper.headers.update({"User-Agent": BaseResolver.USER_AGENT})
-
-        try:
-            folder_keys = url.split("/", 4)[-1].split("/", 1)[0].split(",")
-            if not folder_keys[0]:
-                self._raise_invalid_url(f"Invalid folder key in URL: {url}")
-
-            folder_info = await self._api_request(
-                scraper,
-                "post",
-                "https://www.mediafire.com/api/1.5/folder/get_info.php",
-                data={
-                    "recursive": "yes",
-                    "folder_key": ",".join(folder_keys),
+    async def _open_folder(self, url: str) -> tuple[list[str], str | None, dict]:
+        url, _, password = url.partition("::")
+        if "/folder/" not in url:
+            self._raise_invalid_url(f"Not a MediaFire folder URL: {url}")
+        return await self._folder_roots(url, password)
+
+    def _cursor_context(self, context: dict) -> dict:
+        return {key: value for key, value in context.items() if key != "password"}
+
+    async def _resume_folder(self, url: str, context: dict) -> dict:
+        return {**context, "password": url.partition("::")[2]}
+
+    async def _folder_roots(
+        self, url: str, password: str
+    ) -> tuple[list[str], str | None, dict]:
+        folder_keys = url.split("/", 4)[-1].split("/", 1)[0].split(",")
+        if not folder_keys[0]:
+            self._raise_invalid_url(f"Invalid folder key in URL: {url}")
+
+        folder_info = await self._api_request(
+            "post",
+            "https://www.mediafire.com/api/1.5/folder/get_info.php",
+            data={
+                "recursive": "yes",
+                "folder_key": ",".join(folder_keys),
+                "response_format": "json",
+            },
+        )
+        folders = folder_info.get("folder_infos") or [folder_info.get("folder_info")]
+        if not folders or not folders[0]:
+            self._raise_extraction_failed("No folder info found from API.")
+        title = folders[0].get("name", "MediaFire Folder")
+        # A file's path starts with the name of the folder linked to
+        if len(folders) == 1:
+            context = {"password": password, "item_root": title}
+            return [folders[0]["folderkey"]], title, context
+        # A link to several folders is crawled from a node listing them, so the
+        # folder name already starts the path of their files
+        names = {info["folderkey"]: info["name"] for info in folders}
+        context = {"password": password, "item_root": "", "names": names}
+        return [",".join(names)], title, context
+
+    async def _list_folder(
+        self, node: str, page: int, context: dict
+    ) -> FolderListing:
+        if "," in node:
+            return FolderListing(
+                entries=[
+                    FolderEntry(name=context["names"][key], node=key)
+                    for key in node.split(",")
+                ],
+                has_more=False,
+            )
+        # get_content lists files and subfolders separately, so a listing page
+        # is the same chunk of both
+        entries = []
+        has_more = False
+        for content_type in ("files", "folders"):
+            data = await self._api_request(
+                "get",
+                "https://www.mediafire.com/api/1.5/folder/get_content.php",
+                params={
+                    "content_type": content_type,
+                    "folder_key": node,
+                    "chunk": page,
+                    "chunk_size": self.LISTING_PAGE_SIZE,
                     "response_format": "json",
                 },
             )
-
-            folders = folder_info.get("folder_infos") or [
-                folder_info.get("folder_info")
-            ]
-            if not folders:
-                self._raise_extraction_failed("No folder info found from API.")
-
-            folder_title = folders[0].get("name", "MediaFire Folder")
-            all_files: list[FileItem] = []
-            total_size = 0
-
-            async def collect_files(folder_key: str, path_prefix: str) -> None:
-                nonlocal total_size
-                files_data = await self._api_request(
-                    scraper,
-                    "get",
-                    "https://www.mediafire.com/api/1.5/folder/get_content.php",
-                    params={
-                        "content_type": "files",
-                        "folder_key": folder_key,
-                        "response_format": "json",
-                    },
+            content = data.get("folder_content", {})
+            has_more = has_more or content.get("more_chunks") == "yes"
+            if content_type == "folders":
+                entries.extend(
+                    FolderEntry(name=sub["name"], node=sub["folderkey"])
+                    for sub in content.get("folders", [])
                 )
-                files = files_data.get("folder_content", {}).get("files", [])
-                for file in files:
-                    url = file.get("links", {}).get("normal_download")
-                    if not url:
-                        continue
-                    try:
-                        # Use the new scraping method for folder files
-                        result = await self._scrape_folder_file(
-                            url, password, scraper
+                continue
+            for file in content.get("files", []):
+                url = file.get("links", {}).get("normal_download")
+                if url:
+                    entries.append(
+                        FolderEntry(
+                            name=file.get("filename"),
+                            size=self._parse_size(file.get("size")),
+                            data={"url": url},
                         )
-                        if result:
-                            file_item = FileItem(
-                                url=result.url,
-                                filename=result.filename,
-                                size=result.size,
-                                mime_type=result.mime_type,
-                                path=str(Path(path_prefix) / result.filename),
-                            )
-                            all_files.append(file_item)
-                            total_size += result.size or 0
-                    except ExtractionFailedException:
-                        continue
-
-                subfolders_data = await self._api_request(
-                    scraper,
-                    "get",
-                    "https://www.mediafire.com/api/1.5/folder/get_content.php",
-                    params={
-                        "content_type": "folders",
-                        "folder_key": folder_key,
-                        "response_format": "json",
-                    },
-                )
-                for subfolder in subfolders_data.get("folder_content", {}).get(
-                    "folders", []
-                ):
-                    await collect_files(
-                        subfolder["folderkey"],
-                        str(Path(path_prefix) / subfolder["name"]),
                     )
+        return FolderListing(entries=entries, has_more=has_more)
+
+    async def _resolve_entry(
+        self, entry: FolderEntry, path: str, context: dict
+    ) -> FileItem | None:
+        result = await self._scrape_folder_file(
+            entry.data["url"],
+            context["password"],
+            filename=entry.name,
+            size=entry.size,
+        )
+        if result is None:
+            return None
+        return FileItem(
+            url=result.url,
+            filename=result.filename,
+            size=result.size,
+            mime_type=result.mime_type,
+            path=str(Path(context["item_root"]) / path / result.filename),
+        )
 
-            for folder in folders:
-                await collect_files(folder["folderkey"], folder["name"])
+    async def _resolve_folder(self, url: str, password: str) -> FolderResult:
+        folder = self._keep_partial(
+            FolderResult(title="", contents=[], total_size=0)
+        )
+        try:
+            opened = await self._folder_roots(url, password)
+            await self._crawl_folder(url, folder, opened=opened)
 
-            if not all_files:
+            if not folder.contents and not self._filtering():
                 self._raise_extraction_failed(
                     f"No files found in MediaFire folder: {url}",
                 )
 
-            return FolderResult(
-                title=folder_title, contents=all_files, total_size=total_size
-            )
-
         except cloudscraper.exceptions.CloudflareException as e:
             msg = f"MediaFire Cloudflare challenge failed: {e}"
             raise ExtractionFailedException(msg) from e
@@ -351,6 +465,5 @@ class MediaFireResolver(BaseResolver):
                 raise
             msg = f"Failed to resolve MediaFire folder '{url}': {e}"
             raise ExtractionFailedException(msg) from e
-        finally:
-            await self._run_sync(scraper.close)
-
+        else:
+            return folder
@@ -105,19 +105,15 @@ class OneDriveResolver(BaseResolver):
 
             direct_link = json_resp["@content.downloadUrl"]
 
-            filename = json_resp.get("name")
-            size = json_resp.get("size")
-
-            if not filename or size is None:
-                details_filename, details_size, _ = await self._fetch_file_details(
-                    direct_link,
-                )
-                if details_filename and not filename:
-                    filename = details_filename
-                if details_size is not None and size is None:
-                    size = details_size
-
-            return LinkResult(url=direct_link, filename=filename, size=size)
+            filename, size, mime_type = await self._fetch_file_details(
+                direct_link,
+                filename=json_resp.get("name"),
+                size=json_resp.get("size"),
+            )
+
+            return LinkResult(
+                url=direct_link, filename=filename, mime_type=mime_type, size=size
+            )
 
         except (ExtractionFailedException, InvalidURLException) as e:
             if isinstance(e, ExtractionFailedException | InvalidURLException):
@@ -18,87 +18,101 @@ class PCloudResolver(BaseResolver):
 
     DOMAINS: ClassVar[list[str]] = ["u.pcloud.link", "pcloud.com"]
 
-    async def resolve(self, url: str) -> LinkResult | FolderResult:
-        """Resolve pCloud.link URL."""
-        try:
-            async with await self._get(url) as response:
-                response_text = await response.text()
+    # Present both in the page metadata script and in inline assignments
+    DOWNLOAD_LINK_PATTERN: ClassVar[re.Pattern] = re.compile(
+        r"""["']?download(?:L|l)ink["']?\s*[:=]\s*\(?["']https:"""
+    )
+
+    @staticmethod
+    def _find_direct_link(response_text: str) -> str | None:
+        """Find the download link in the page source."""
+        direct_link = None
+
+        script_json_match = re.search(
+            r"<script[^>]*>\s*(?:var\s+|window\.)?\w+\s*=\s*(\{.*?\});?\s*</script>",
+            response_text,
+            re.DOTALL | re.IGNORECASE,
+        )
+        if script_json_match:
+            try:
+                json_str = script_json_match.group(1)
+                metadata = json.loads(json_str)
+                if "downloadlink" in metadata and isinstance(
+                    metadata["downloadlink"],
+                    str,
+                ):
+                    direct_link = metadata["downloadlink"]
+                elif "downloadLink" in metadata and isinstance(
+                    metadata["downloadLink"],
+                    str,
+                ):
+                    direct_link = metadata["downloadLink"]
+
+                if direct_link and r"\/" in direct_link:
+                    direct_link = direct_link.replace(r"\/", "/")
+
+            except json.JSONDecodeError:
+                pass
+            except TypeError:
+                pass
+
+        if not direct_link:
+            matches = re.findall(
+                r"""
+                (?:["']?download(?:L|l)ink["']?\s*[:=]\s*["'](https:[^"']+)["'])
+                |
+                (?:downloadlink\s*=\s*\(?(["']https:[^"']+)["']\)?)
+                """,
+                response_text,
+                re.VERBOSE,
+            )
 
-            direct_link = None
+            if matches:
+                for match_tuple in matches:
+                    for link_candidate in match_tuple:
+                        if link_candidate:
+                            direct_link = link_candidate
+                            break
+                    if direct_link:
+                        break
 
-            script_json_match = re.search(
-                r"<script[^>]*>\s*(?:var\s+|window\.)?\w+\s*=\s*(\{.*?\});?\s*</script>",
+        if not direct_link:
+            cdn_links = re.findall(
+                r'["\'](https://[a-zA-Z0-9.-]+\.pcloud.com/[^"\']+)["\']',
                 response_text,
-                re.DOTALL | re.IGNORECASE,
             )
-            if script_json_match:
-                try:
-                    json_str = script_json_match.group(1)
-                    metadata = json.loads(json_str)
-                    if "downloadlink" in metadata and isinstance(
-                        metadata["downloadlink"],
-                        str,
-                    ):
-                        direct_link = metadata["downloadlink"]
-                    elif "downloadLink" in metadata and isinstance(
-                        metadata["downloadLink"],
-                        str,
+            if cdn_links:
+                for cdn_link in cdn_links:
+                    if (
+                        any(
+                            ext in cdn_link.lower()
+                            for ext in [
+                                ".zip",
+                                ".rar",
+                                ".exe",
+                                ".iso",
+                                ".mp4",
+                                ".mkv",
+                            ]
+                        )
+                        or "download=1" in cdn_link
                     ):
-                        direct_link = metadata["downloadLink"]
+                        direct_link = cdn_link
+                        break
+                if not direct_link and cdn_links:
+                    direct_link = cdn_links[0]
 
-                    if direct_link and r"\/" in direct_link:
-                        direct_link = direct_link.replace(r"\/", "/")
-
-                except json.JSONDecodeError:
-                    pass
-                except TypeError:
-                    pass
+        return direct_link
 
-            if not direct_link:
-                matches = re.findall(
-                    r"""
-                    (?:["']?download(?:L|l)ink["']?\s*[:=]\s*["'](https:[^"']+)["'])
-                    |
-                    (?:downloadlink\s*=\s*\(?(["']https:[^"']+)["']\)?)
-                    """,
-                    response_text,
-                    re.VERBOSE,
+    async def resolve(self, url: str) -> LinkResult | FolderResult:
+        """Resolve pCloud.link URL."""
+        try:
+            async with await self._get(url) as response:
+                _, response_text = await self._read_until(
+                    response, self.DOWNLOAD_LINK_PATTERN
                 )
 
-                if matches:
-                    for match_tuple in matches:
-                        for link_candidate in match_tuple:
-                            if link_candidate:
-                                direct_link = link_candidate
-                                break
-                        if direct_link:
-                            break
-
-            if not direct_link:
-                cdn_links = re.findall(
-                    r'["\'](https://[a-zA-Z0-9.-]+\.pcloud.com/[^"\']+)["\']',
-                    response_text,
-                )
-                if cdn_links:
-                    for cdn_link in cdn_links:
-                        if (
-                            any(
-                                ext in cdn_link.lower()
-                                for ext in [
-                                    ".zip",
-                                    ".rar",
-                                    ".exe",
-                                    ".iso",
-                                    ".mp4",
-                                    ".mkv",
-                                ]
-                            )
-                            or "download=1" in cdn_link
-                        ):
-                            direct_link = cdn_link
-                            break
-                    if not direct_link and cdn_links:
-                        direct_link = cdn_links[0]
+            direct_link = await self._parse(self._find_direct_link, response_text)
 
             if not direct_link:
                 self._raise_extraction_failed(
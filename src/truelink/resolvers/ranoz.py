@@ -5,8 +5,7 @@ from __future__ import annotations
 from typing import ClassVar
 from urllib.parse import urlparse
 
-from truelink import mimetypes
-from truelink.exceptions import ExtractionFailedException
+from truelink.exceptions import ExtractionFailedException, RateLimitedException
 from truelink.types import FolderResult, LinkResult
 
 from .base import BaseResolver
@@ -27,19 +26,22 @@ class RanozResolver(BaseResolver):
                 response.raise_for_status()
                 data = (await response.json(content_type=None))["data"]
 
-                file_name = data["filename"]
-                file_size = data["size"]
-                download_url = f"https://st1.ranoz.gg/{file_id}-{file_name}"
-
-                mime_type, _ = mimetypes.guess_type(file_name)
-
-                return LinkResult(
-                    url=download_url,
-                    filename=file_name,
-                    mime_type=mime_type,
-                    size=file_size,
-                )
-
+            file_name = data["filename"]
+            file_size = data["size"]
+            download_url = f"https://st1.ranoz.gg/{file_id}-{file_name}"
+
+            file_name, file_size, mime_type = await self._fetch_file_details(
+                download_url, filename=file_name, size=file_size
+            )
+            return LinkResult(
+                url=download_url,
+                filename=file_name,
+                mime_type=mime_type,
+                size=file_size,
+            )
+
+        except RateLimitedException:
+            raise
         except (ExtractionFailedException, ValueError) as e:
             msg = f"Failed to resolve Ranoz URL: {e}"
             raise ExtractionFailedException(msg) from e
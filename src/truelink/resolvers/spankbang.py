@@ -2,15 +2,15 @@
 # ---------------
 from __future__ import annotations
 
-import json
 import re
 from typing import TYPE_CHECKING, ClassVar
 from urllib.parse import urlparse, urlunparse
 
-from truelink.exceptions import ExtractionFailedException
+from truelink.exceptions import ExtractionFailedException, RateLimitedException
+from truelink.jsliteral import find_js_assignment
 from truelink.types import FolderResult, LinkResult
 
-from .base import BaseResolver
+from .base import BaseResolver, probe_policy
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
@@ -37,12 +37,10 @@ class SpankBangResolver(BaseResolver):
     # Quality order for selection
     PREFERRED_QUALITIES: ClassVar[list[str]] = ["1080p", "720p", "480p"]
 
-    # Regex patterns to find the JS object assignment in variable contexts [web:90]
-    STREAM_BLOCK_PATTERNS: ClassVar[list[re.Pattern]] = [
-        re.compile(r"var\s+stream_data\s*=\s*\{.*?\};", re.IGNORECASE | re.DOTALL),
-        re.compile(r"window\.stream_data\s*=\s*\{.*?\};", re.IGNORECASE | re.DOTALL),
-        re.compile(r"\bstream_data\s*=\s*\{.*?\};", re.IGNORECASE | re.DOTALL),
-    ]
+    # Start of the stream_data assignment; the page is read up to it
+    STREAM_DATA_PATTERN: ClassVar[re.Pattern] = re.compile(r"\bstream_data\s*=\s*\{")
+    # Characters read past the assignment start, enough for the whole object
+    STREAM_DATA_MAX_LENGTH: ClassVar[int] = 64 * 1024
 
     # Fallback direct URL scraping for typical quality-marked MP4s
     FALLBACK_PATTERNS: ClassVar[dict[str, re.Pattern]] = {
@@ -105,64 +103,16 @@ class SpankBangResolver(BaseResolver):
         return None
 
     @staticmethod
-    def _strip_trailing_commas(js_obj: str) -> str:
-        # Remove trailing commas inside objects/arrays to make it JSONable [web:90]
-        return re.sub(r",\s*([}\]])", r"\1", js_obj)
-
-    @staticmethod
-    def _single_to_double_quoted_strings(js_obj: str) -> str:
-        # Convert single-quoted JS strings to JSON double quoted with escaping
-        def repl(m: re.Match) -> str:
-            s = m[1]
-            s = s.replace('\\"', '"').replace("\\'", "'")
-            s = s.replace("\\", "\\\\").replace('"', '\\"')
-            return f'"{s}"'
-
-        return re.sub(r"'([^'\\]*(?:\\.[^'\\]*)*)'", repl, js_obj, flags=re.DOTALL)
-
-    @staticmethod
-    def _quote_unquoted_keys(js_obj: str) -> str:
-        # Turn bare keys like 1080p: or main: into "1080p": / "main":
-        return re.sub(r"(\s*)([A-Za-z0-9_]+)\s*:", r'\1"\2":', js_obj)
-
-    def _js_object_to_json(self, js_obj: str) -> str:
-        """Convert a JS object literal into JSON string so json.loads can parse. [web:90]."""
-        s = self._strip_trailing_commas(js_obj)
-        s = self._single_to_double_quoted_strings(s)
-        return self._quote_unquoted_keys(s)
-
-    def _find_stream_block(self, html: str) -> str | None:
-        """Find the raw JS assignment text containing stream_data. [web:90]."""
-        for pat in self.STREAM_BLOCK_PATTERNS:
-            if m := pat.search(html):
-                return m.group(0)
-        return None
-
-    def _extract_stream_dict(self, html: str) -> dict | None:
-        """Extract and JSON-decode the stream_data object from the page. [web:90]."""
-        MAX_HTML_SIZE = 2 * 1024 * 1024  # 2MB limit
-        if len(html) > MAX_HTML_SIZE:
-            # Optionally, log a warning here
-            return None
-        block = self._find_stream_block(html)
-        if not block:
-            return None
-        # Keep from first '{' to last '}' inclusive
-        obj_body = re.sub(r"^[^{]*\{", "{", block, flags=re.DOTALL)
-        obj_body = re.sub(r";\s*$", "", obj_body.strip())
-        json_like = self._js_object_to_json(obj_body)
-        try:
-            data = json.loads(json_like)
-            if isinstance(data, dict):
-                return data
-        except Exception:
-            return None
-        return None
+    def _extract_stream_dict(html: str) -> dict | None:
+        """Extract and parse the stream_data object from the page. [web:90]."""
+        data = find_js_assignment(html, "stream_data")
+        return data if isinstance(data, dict) else None
 
-    def _fallback_find_by_quality(self, html: str) -> dict[str, list[str]]:
+    @classmethod
+    def _fallback_find_by_quality(cls, html: str) -> dict[str, list[str]]:
         """Fallback: scrape quality-specific direct URLs via regex if JSON decode fails. [web:90]."""
         found: dict[str, list[str]] = {}
-        for q, pat in self.FALLBACK_PATTERNS.items():
+        for q, pat in cls.FALLBACK_PATTERNS.items():
             if matches := pat.findall(html) or []:
                 found[q] = matches
         return found
@@ -233,7 +183,14 @@ class SpankBangResolver(BaseResolver):
                     text = await resp.text()
                     msg = f"HTTP {resp.status} fetching page: {text[:200]}"
                     raise ExtractionFailedException(msg)
-                html = await resp.text()
+                # The page is only needed up to the stream_data block
+                _, html = await self._read_until(
+                    resp,
+                    self.STREAM_DATA_PATTERN,
+                    overlap=self.STREAM_DATA_MAX_LENGTH,
+                )
+        except RateLimitedException:
+            raise
         except Exception as e:
             msg = f"Failed to fetch page: {e}"
             raise ExtractionFailedException(msg) from e
@@ -255,10 +212,12 @@ class SpankBangResolver(BaseResolver):
             filename = f"video_{domain}_{path_part}_{url_hash}"
 
         # Parse stream_data JSON
-        data = self._extract_stream_dict(html)
+        data = await self._parse(self._extract_stream_dict, html)
 
         # Fallback direct scrape for typical quality URLs
-        fallback = {} if data else self._fallback_find_by_quality(html)
+        fallback = (
+            {} if data else await self._parse(self._fallback_find_by_quality, html)
+        )
 
         # Choose best quality link
         best_url = self._choose_best_url(data, fallback)
@@ -276,9 +235,15 @@ class SpankBangResolver(BaseResolver):
         if mime_type is None:
             mime_type = "application/octet-stream"
 
+        # The page never lists a size; probe the stream only when asked to
+        size = None
+        if probe_policy.get() == "always":
+            final_name, size, mime_type = await self._fetch_file_details(
+                best_url, filename=final_name, mime_type=mime_type
+            )
         return LinkResult(
             url=best_url,
             filename=final_name,
             mime_type=mime_type,
-            size=None,
+            size=size,
         )
@@ -3,17 +3,23 @@
 from __future__ import annotations
 
 import re
-from typing import ClassVar
+from typing import TYPE_CHECKING, ClassVar
 from urllib.parse import ParseResult, urlparse
 
 import aiohttp
-from lxml.etree import HTML
 
-from truelink.exceptions import ExtractionFailedException, InvalidURLException
+from truelink.exceptions import (
+    ExtractionFailedException,
+    InvalidURLException,
+    RateLimitedException,
+)
 from truelink.types import FolderResult, LinkResult
 
 from .base import BaseResolver
 
+if TYPE_CHECKING:
+    from lxml.html import HtmlElement
+
 
 class StreamtapeResolver(BaseResolver):
     """Resolver for Streamtape URLs."""
@@ -33,9 +39,13 @@ class StreamtapeResolver(BaseResolver):
     # Use only streamtape.net as fallback domain
     FALLBACK_DOMAIN: ClassVar[str] = "streamtape.net"
 
+    @staticmethod
+    def _is_link_script(element: HtmlElement) -> bool:
+        return "ideoooolink" in (element.text or "")
+
     async def _try_with_fallback_domain(
         self, original_url: str
-    ) -> tuple[str, ParseResult]:
+    ) -> tuple[HtmlElement, ParseResult]:
         """Try accessing the URL with streamtape.net if the original fails."""
         parsed_url = urlparse(original_url)
         original_domain = parsed_url.netloc
@@ -46,8 +56,10 @@ class StreamtapeResolver(BaseResolver):
                 original_url, allow_redirects=True
             ) as response:
                 if response.status == 200:
-                    html_content = await response.text()
-                    return html_content, parsed_url
+                    html, _ = await self._parse_until(
+                        response, self._is_link_script, tag="script"
+                    )
+                    return html, parsed_url
         except aiohttp.ClientError:
             pass  # Continue to fallback
 
@@ -61,8 +73,12 @@ class StreamtapeResolver(BaseResolver):
                     fallback_url, allow_redirects=True
                 ) as response:
                     if response.status == 200:
-                        html_content = await response.text()
-                        return html_content, urlparse(fallback_url)
+                        html, _ = await self._parse_until(
+                            response, self._is_link_script, tag="script"
+                        )
+                        return html, urlparse(fallback_url)
+            except RateLimitedException:
+                raise
             except Exception as e:
                 msg = f"Both original domain and {self.FALLBACK_DOMAIN} failed"
                 raise ExtractionFailedException(msg) from e
@@ -78,8 +94,7 @@ class StreamtapeResolver(BaseResolver):
             )
 
             # Try with fallback domain if original fails
-            html_content, parsed_url = await self._try_with_fallback_domain(url)
-            html = HTML(html_content)
+            html, parsed_url = await self._try_with_fallback_domain(url)
 
             script_elements = html.xpath(
                 "//script[contains(text(),'ideoooolink')]/text()"
@@ -126,4 +141,3 @@ class StreamtapeResolver(BaseResolver):
                 raise
             msg = f"Unexpected error while resolving Streamtape URL: {e}"
             raise ExtractionFailedException(msg) from e
-
@@ -6,7 +6,11 @@ import base64
 import re
 from typing import ClassVar
 
-from truelink.exceptions import ExtractionFailedException, InvalidURLException
+from truelink.exceptions import (
+    ExtractionFailedException,
+    InvalidURLException,
+    RateLimitedException,
+)
 from truelink.types import FileItem, FolderResult, LinkResult
 
 from .base import BaseResolver
@@ -17,6 +21,9 @@ class SwissTransferResolver(BaseResolver):
 
     DOMAINS: ClassVar[list[str]] = ["swisstransfer.com"]
 
+    # Maximum number of download tokens requested at once for multi-file transfers
+    TOKEN_CONCURRENCY: ClassVar[int] = 8
+
     async def _get_file_metadata(
         self,
         transfer_id: str,
@@ -90,6 +97,39 @@ class SwissTransferResolver(BaseResolver):
             token_text = await response.text()
             return token_text.strip().replace('"', "")
 
+    async def _build_file_item(
+        self,
+        file_info: dict,
+        password_str: str | None,
+        container_uuid: str,
+        download_host: str,
+        transfer_id: str,
+    ) -> FileItem | None:
+        """Generate a download token for one file of a multi-file transfer."""
+        self._count_file()
+        file_uuid = file_info["UUID"]
+        token = await self._generate_download_token(
+            password_str,
+            container_uuid,
+            file_uuid,
+        )
+        if not token:
+            return None
+
+        item_download_url = f"https://{download_host}/api/download/{transfer_id}/{file_uuid}?token={token}"
+        filename, size, mime_type = await self._fetch_file_details(
+            item_download_url,
+            filename=file_info["fileName"],
+            size=file_info.get("fileSizeInBytes"),
+        )
+        return FileItem(
+            url=item_download_url,
+            filename=filename,
+            mime_type=mime_type,
+            size=size,
+            path="",
+        )
+
     async def resolve(self, url: str) -> LinkResult | FolderResult:
         """Resolve SwissTransfer.com URL."""
         match = re.match(
@@ -165,54 +205,55 @@ class SwissTransferResolver(BaseResolver):
 
             direct_download_url = f"https://{download_host}/api/download/{transfer_id}/{file_uuid}?token={token}"
 
-            return LinkResult(
-                url=direct_download_url,
+            filename, size, mime_type = await self._fetch_file_details(
+                direct_download_url,
                 filename=file_display_name,
                 size=file_size_bytes,
             )
+            return LinkResult(
+                url=direct_download_url,
+                filename=filename,
+                mime_type=mime_type,
+                size=size,
+            )
 
-        folder_contents: list[FileItem] = []
-        total_folder_size = 0
-
-        for file_info in files_list:
-            file_uuid = file_info.get("UUID")
-            file_display_name = file_info.get("fileName")
-            file_size_bytes = file_info.get("fileSizeInBytes")
-
-            if not (file_uuid and file_display_name):
-                continue
-
-            try:
-                token = await self._generate_download_token(
+        valid_files = [
+            file_info
+            for file_info in files_list
+            if file_info.get("UUID")
+            and file_info.get("fileName")
+            and self._wants_file(
+                file_info["fileName"], file_info.get("fileSizeInBytes")
+            )
+        ]
+        folder = FolderResult(title=folder_name, contents=[], total_size=0)
+        errors = await self._gather_files(
+            folder,
+            (
+                self._build_file_item(
+                    file_info,
                     password_str,
                     container_uuid,
-                    file_uuid,
+                    download_host,
+                    transfer_id,
                 )
-                if not token:
-                    continue
-            except ExtractionFailedException:
-                continue
-
-            item_download_url = f"https://{download_host}/api/download/{transfer_id}/{file_uuid}?token={token}"
-            folder_contents.append(
-                FileItem(
-                    url=item_download_url,
-                    filename=file_display_name,
-                    size=file_size_bytes,
-                    path="",
-                ),
-            )
-            if file_size_bytes is not None:
-                total_folder_size += file_size_bytes
+                for file_info in valid_files
+            ),
+            self.TOKEN_CONCURRENCY,
+        )
 
-        if not folder_contents:
+        for error in errors:
+            # A file whose token request failed is skipped; rate limits, an
+            # exhausted budget and unexpected errors fail the transfer
+            if isinstance(error, RateLimitedException) or not isinstance(
+                error, ExtractionFailedException
+            ):
+                raise error
+
+        if not folder.contents and not self._filtering():
             msg = "SwissTransfer error: No valid files could be processed in the multi-file transfer."
             raise ExtractionFailedException(
                 msg,
-            )
+            ) from (errors[0] if errors else None)
 
-        return FolderResult(
-            title=folder_name,
-            contents=folder_contents,
-            total_size=total_folder_size,
-        )
+        return folder
@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import re
 from typing import ClassVar
 from urllib.parse import quote
 
-from truelink.exceptions import ExtractionFailedException
+from truelink.exceptions import ExtractionFailedException, RateLimitedException
 from truelink.types import FileItem, FolderResult, LinkResult
 
 from .base import BaseResolver
@@ -34,6 +35,20 @@ class TeraboxResolver(BaseResolver):
         "terabox.club",
     ]
 
+    # Maximum number of metadata probes run at once for folder items
+    PROBE_CONCURRENCY: ClassVar[int] = 8
+
+    SIZE_PATTERN: ClassVar[re.Pattern] = re.compile(
+        r"^\s*([\d.]+)\s*([KMGT]?B)\s*$", re.IGNORECASE
+    )
+    SIZE_UNITS: ClassVar[dict[str, int]] = {
+        "B": 1,
+        "KB": 1024,
+        "MB": 1024**2,
+        "GB": 1024**3,
+        "TB": 1024**4,
+    }
+
     async def resolve(self, url: str) -> LinkResult | FolderResult:
         """Resolve Terabox URL."""
         if "/file/" in url and ("terabox.com" in url or "teraboxapp.com" in url):
@@ -87,55 +102,44 @@ class TeraboxResolver(BaseResolver):
                         "Terabox API error: Missing download link for single file.",
                     )
 
-                (
-                    header_filename,
-                    header_size,
-                    mime_type,
-                ) = await self._fetch_file_details(
-                    direct_link,
-                )
-
+                item = await self._build_folder_item(file_data)
                 return LinkResult(
-                    url=direct_link,
-                    filename=header_filename,
-                    mime_type=mime_type,
-                    size=header_size,
+                    url=item.url,
+                    filename=item.filename,
+                    mime_type=item.mime_type,
+                    size=item.size,
                 )
 
-            folder_contents: list[FileItem] = []
-            total_size = 0
             folder_title = extracted_info[0].get("📂 Title", "Terabox Folder")
 
-            for item_data in extracted_info:
-                item_link = item_data.get("🔽 Direct Download Link")
-                item_filename, item_size, mime_type = await self._fetch_file_details(
-                    item_link,
-                )
-                if not item_link:
-                    continue
-
-                folder_contents.append(
-                    FileItem(
-                        url=item_link,
-                        filename=item_filename,
-                        mime_type=mime_type,
-                        size=item_size,
-                        path="",
-                    ),
+            wanted = [
+                item_data
+                for item_data in extracted_info
+                # A rounded display size could reject a file at a size bound
+                if self._wants_file(
+                    item_data.get("📂 Title") or None,
+                    self._parse_size(item_data.get("📏 Size")),
                 )
-                total_size += item_size
-
-            if not folder_contents:
+            ]
+            folder = FolderResult(title=folder_title, contents=[], total_size=0)
+            errors = await self._gather_files(
+                folder,
+                (self._build_folder_item(item_data) for item_data in wanted),
+                self.PROBE_CONCURRENCY,
+            )
+            for error in errors:
+                # A row that fails to resolve is skipped; rate limits, an exhausted
+                # budget and unexpected errors fail the folder
+                if isinstance(error, RateLimitedException) or not isinstance(
+                    error, ExtractionFailedException
+                ):
+                    raise error
+
+            if not folder.contents and not self._filtering():
                 self._raise_extraction_failed(
                     "Terabox: No valid files found in folder data from API.",
                 )
 
-            return FolderResult(
-                title=folder_title,
-                contents=folder_contents,
-                total_size=total_size,
-            )
-
         except (ExtractionFailedException, ValueError) as e:
             if isinstance(e, ExtractionFailedException):
                 raise
@@ -143,4 +147,43 @@ class TeraboxResolver(BaseResolver):
             raise ExtractionFailedException(
                 msg,
             ) from e
-
+        else:
+            return folder
+
+    async def _build_folder_item(self, item_data: dict) -> FileItem | None:
+        """Build a file item from API metadata, probing for missing fields."""
+        item_link = item_data.get("🔽 Direct Download Link")
+        if not item_link:
+            return None
+        self._count_file()
+
+        raw_size = item_data.get("📏 Size")
+        filename, size, mime_type = await self._fetch_file_details(
+            item_link,
+            filename=item_data.get("📂 Title") or None,
+            size=self._parse_size(raw_size),
+        )
+        if size is None:
+            size = self._parse_display_size(raw_size)
+
+        return FileItem(
+            url=item_link,
+            filename=filename,
+            mime_type=mime_type,
+            size=size,
+            path="",
+        )
+
+    def _parse_display_size(self, size_val: str | float | None) -> int | None:
+        """Parse a rounded, human-readable size such as ``12.5 MB``."""
+        if not isinstance(size_val, str):
+            return None
+        match = self.SIZE_PATTERN.match(size_val)
+        if not match:
+            return None
+        try:
+            return int(
+                float(match.group(1)) * self.SIZE_UNITS[match.group(2).upper()]
+            )
+        except ValueError:
+            return None
@@ -2,28 +2,34 @@
 
 from __future__ import annotations
 
-from typing import ClassVar
-
-from lxml.html import fromstring
+from typing import TYPE_CHECKING, ClassVar
 
 from truelink.exceptions import ExtractionFailedException
 from truelink.types import FolderResult, LinkResult
 
 from .base import BaseResolver
 
+if TYPE_CHECKING:
+    from lxml.html import HtmlElement
+
 
 class UploadEeResolver(BaseResolver):
     """Resolver for Upload.ee URLs."""
 
     DOMAINS: ClassVar[list[str]] = ["upload.ee"]
 
+    @staticmethod
+    def _is_download_link(element: HtmlElement) -> bool:
+        return element.get("id") == "d_l"
+
     async def resolve(self, url: str) -> LinkResult | FolderResult:
         """Resolve Upload.ee URL."""
         try:
             async with await self._get(url) as response:
-                response_text = await response.text()
-
-            html = fromstring(response_text)
+                html, _ = await self._parse_until(
+                    response, self._is_download_link, tag="a"
+                )
+            page_text = html.text_content()
 
             direct_link_elements = html.xpath("//a[@id='d_l']/@href")
 
@@ -40,8 +46,8 @@ class UploadEeResolver(BaseResolver):
                             f"Upload.ee error: {error_messages[0].strip()}",
                         )
                     if (
-                        "File not found" in response_text
-                        or "File has been deleted" in response_text
+                        "File not found" in page_text
+                        or "File has been deleted" in page_text
                     ):
                         self._raise_extraction_failed(
                             "Upload.ee error: File not found or has been deleted.",
@@ -13,6 +13,13 @@ from .base import BaseResolver
 class XfeedResolver(BaseResolver):
     DOMAINS: ClassVar[list[str]] = ["xfeed.com", "www.xfeed.com"]
 
+    D_URL_PATTERN: ClassVar[re.Pattern] = re.compile(
+        r'd_url:\s*["\']([^"\']*\.mp4)["\']'
+    )
+    EMBED_URL_PATTERN: ClassVar[re.Pattern] = re.compile(
+        r'window\.EMBED_URL\s*=\s*["\']([^"\']+)["\']'
+    )
+
     async def resolve(self, url: str) -> LinkResult:
         async with await self._get(
             url,
@@ -21,10 +28,17 @@ class XfeedResolver(BaseResolver):
             if r.status != 200:
                 msg = f"Xfeed HTTP {r.status}"
                 raise ExtractionFailedException(msg)
-            html = await r.text()
+            # Search for .mp4 URL pattern in the page
+            mp4_match, html = await self._read_until(r, self.D_URL_PATTERN)
+            embed_match = self.EMBED_URL_PATTERN.search(html)
+            if (
+                mp4_match
+                and not embed_match
+                and not mp4_match.group(1).startswith("http")
+            ):
+                # A path needs the embed host, which may come later in the page
+                embed_match, _ = await self._read_until(r, self.EMBED_URL_PATTERN)
 
-        # Search for .mp4 URL pattern in the page
-        mp4_match = re.search(r'd_url:\s*["\']([^"\']*\.mp4)["\']', html)
         if not mp4_match:
             # Fallback: search for any .mp4 path
             mp4_match = re.search(r'["\']([^"\']*\.mp4)["\']', html)
@@ -45,9 +59,6 @@ class XfeedResolver(BaseResolver):
 
             # Get host from EMBED_URL or use default
             host = "vxf3d.cachefly.net"  # default
-            embed_match = re.search(
-                r'window\.EMBED_URL\s*=\s*["\']([^"\']+)["\']', html
-            )
             if embed_match:
                 host = urlparse(embed_match.group(1)).netloc
 
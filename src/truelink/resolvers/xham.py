@@ -5,10 +5,10 @@ from __future__ import annotations
 from typing import ClassVar
 from urllib.parse import urlparse, urlunparse
 
-from truelink.exceptions import ExtractionFailedException
+from truelink.exceptions import ExtractionFailedException, RateLimitedException
 from truelink.types import FolderResult, LinkResult
 
-from .base import BaseResolver
+from .base import BaseResolver, probe_policy
 
 
 class XhamResolver(BaseResolver):
@@ -124,6 +124,11 @@ class XhamResolver(BaseResolver):
             size = (
                 chosen.get("file_size") or None
             )  # may be absent; keep None if not provide
+            # Keep what the API listed; probe the stream only when asked to
+            if probe_policy.get() == "always":
+                filename, size, mime_type = await self._fetch_file_details(
+                    link_url, filename=filename, size=size, mime_type=mime_type
+                )
             return LinkResult(
                 url=link_url,
                 filename=filename,
@@ -131,7 +136,8 @@ class XhamResolver(BaseResolver):
                 size=size,
             )
 
+        except RateLimitedException:
+            raise
         except Exception as e:
             msg = f"Failed to resolve domain URL: {e}"
             raise ExtractionFailedException(msg) from e
-
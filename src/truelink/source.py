@@ -0,0 +1,130 @@
+"""Pool of local addresses to make outbound connections from."""
+
+from __future__ import annotations
+
+import ipaddress
+from collections import Counter
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+SOURCE_STRATEGIES = ("round_robin", "least_loaded")
+
+
+class SourceAddressPool:
+    """Spreads resolves over the local addresses of a multi-IP host.
+
+    Providers that limit downloads per IP count every resolve made from the
+    machine's default address together. With a pool, each resolve attempt binds
+    its connections to one of ``addresses``, chosen per provider host:
+
+    - ``"round_robin"`` cycles through the addresses for each host.
+    - ``"least_loaded"`` picks the address with the fewest resolves running
+      against that host, then the one used least for it.
+    """
+
+    def __init__(
+        self, addresses: Iterable[str], *, strategy: str = "round_robin"
+    ) -> None:
+        """Initialize the pool.
+
+        Args:
+            addresses: Local IPv4 or IPv6 addresses assigned to this machine
+            strategy: ``"round_robin"`` or ``"least_loaded"``
+
+        Raises:
+            ValueError: If an address is invalid, none is given or the strategy
+                is unknown
+
+        """
+        self.addresses = [str(ipaddress.ip_address(a)) for a in addresses]
+        if not self.addresses:
+            msg = "SourceAddressPool needs at least one address"
+            raise ValueError(msg)
+        if strategy not in SOURCE_STRATEGIES:
+            msg = (
+                f"Invalid strategy {strategy!r}, expected one of {SOURCE_STRATEGIES}"
+            )
+            raise ValueError(msg)
+        self.strategy = strategy
+        self._cursors: Counter[str] = Counter()
+        # Resolves running and started, per (address, host)
+        self._active: Counter[tuple[str, str]] = Counter()
+        self._started: Counter[tuple[str, str]] = Counter()
+        self._requests: Counter[str] = Counter()
+        self._failures: Counter[str] = Counter()
+
+    def select(self, url: str) -> str:
+        """Pick the address to resolve a URL from.
+
+        Args:
+            url: The URL being resolved
+
+        Returns:
+            A local address
+
+        """
+        host = (urlparse(url).hostname or "").lower()
+        if self.strategy == "least_loaded":
+            return min(
+                self.addresses,
+                key=lambda a: (self._active[a, host], self._started[a, host]),
+            )
+        cursor = self._cursors[host]
+        self._cursors[host] += 1
+        return self.addresses[cursor % len(self.addresses)]
+
+    @contextmanager
+    def use(self, address: str, url: str) -> Iterator[None]:
+        """Count a resolve as running from an address while the body runs.
+
+        Args:
+            address: The address picked for the resolve
+            url: The URL being resolved
+
+        """
+        key = (address, (urlparse(url).hostname or "").lower())
+        self._active[key] += 1
+        self._started[key] += 1
+        try:
+            yield
+        finally:
+            self._active[key] -= 1
+
+    def report(self, address: str, *, ok: bool) -> None:
+        """Record a request made from an address.
+
+        Args:
+            address: The address used
+            ok: Whether a response arrived
+
+        """
+        self._requests[address] += 1
+        if not ok:
+            self._failures[address] += 1
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Return usage per address.
+
+        Returns:
+            Dictionary of addresses to the number of resolves running and
+            started from them, and of requests and failed requests made
+
+        """
+        usage = {
+            address: {
+                "active": 0,
+                "resolves": 0,
+                "requests": self._requests[address],
+                "failures": self._failures[address],
+            }
+            for address in self.addresses
+        }
+        for (address, _), count in self._active.items():
+            usage[address]["active"] += count
+        for (address, _), count in self._started.items():
+            usage[address]["resolves"] += count
+        return usage
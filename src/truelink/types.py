@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import json
-from dataclasses import asdict, dataclass, is_dataclass
+from dataclasses import asdict, dataclass, field, is_dataclass
 
 
 def custom_asdict_factory(data: object) -> object:
@@ -56,6 +56,7 @@ class LinkResult(PrettyPrintDataClass):
         mime_type (str, optional): The MIME type of the file (e.g., "video/mp4").
         size (int, optional): Size of the file in bytes.
         headers (dict, optional): Custom headers needed for the download (e.g., {"Authorization": "Bearer token"}).
+        usage (Usage, optional): Requests, bytes and time the resolve used.
 
     Example:
         ```python
@@ -75,6 +76,7 @@ class LinkResult(PrettyPrintDataClass):
     mime_type: str | None = None
     size: int | None = None
     headers: dict | None = None
+    usage: Usage | None = None
 
 
 @dataclass
@@ -121,6 +123,11 @@ class FolderResult(PrettyPrintDataClass):
         contents (list[FileItem]): List of files contained in the folder.
         total_size (int): Total size of all files in bytes.
         headers (dict, optional): Custom headers needed for downloads.
+        usage (Usage, optional): Requests, bytes and time the resolve used, and
+            whether a budget cut it short.
+        errors (list[FolderError]): Subfolders that could not be listed and
+            files that could not be resolved. The crawl went on without them,
+            so ``contents`` lacks those files.
 
     Example:
         ```python
@@ -153,3 +160,141 @@ class FolderResult(PrettyPrintDataClass):
     contents: list[FileItem]
     total_size: int = 0
     headers: dict | None = None
+    usage: Usage | None = None
+    errors: list[FolderError] = field(default_factory=list)
+
+
+@dataclass
+class FolderPage(PrettyPrintDataClass):
+    """One page of the files of a folder, returned by resolve_page().
+
+    Attributes:
+        title (str): The name of the folder.
+        contents (list[FileItem]): Files on this page. Their ``path`` is the
+            folder holding them, relative to the top of the share.
+        cursor (str, optional): Opaque cursor for the next page, or None after
+            the last page.
+        total_size (int): Total size of the files on this page in bytes.
+        headers (dict, optional): Custom headers needed for downloads.
+        usage (Usage, optional): Requests, bytes and time the page used.
+        errors (list[FolderError]): Files on this page that could not be
+            resolved. The page went on without them.
+
+    Example:
+        ```python
+        {
+            "title": "Folder Name",
+            "contents": [
+                {
+                    "url": "direct_download_url_1",
+                    "filename": "file1.mkv",
+                    "size": 1234567,
+                    "path": "Season 1"
+                }
+            ],
+            "cursor": "eyJ2IjogMSwgLi4ufQ",
+            "total_size": 1234567
+        }
+        ```
+
+    """
+
+    title: str
+    contents: list[FileItem]
+    cursor: str | None = None
+    total_size: int = 0
+    headers: dict | None = None
+    usage: Usage | None = None
+    errors: list[FolderError] = field(default_factory=list)
+
+
+@dataclass
+class FolderError(PrettyPrintDataClass):
+    """Subfolder or file of a folder result that could not be crawled.
+
+    Attributes:
+        path (str): Path of the subfolder, or of the file including its name,
+            within the folder structure.
+        node (str, optional): Provider ID of the subfolder; None for a file.
+        error (str): Why listing the subfolder, after retries, or resolving the
+            file failed.
+
+    Example:
+        ```python
+        {
+            "path": "Season 1/Extras",
+            "node": "a1b2c3",
+            "error": "GoFile API error 500: error-internal"
+        }
+        ```
+
+    """
+
+    path: str
+    node: str | None
+    error: str
+
+
+@dataclass
+class Usage(PrettyPrintDataClass):
+    """Resources a resolve used.
+
+    Results served from the cache have no usage, since serving them made no
+    requests.
+
+    Attributes:
+        requests (int): HTTP requests made, including metadata probes and retries.
+        bytes_read (int): Response body bytes received.
+        files (int): Files in the result.
+        wall_time (float): Seconds from the start of the resolve to its result,
+            including waits imposed by the provider.
+        exhausted (str, optional): The budget limit that ran out, e.g.
+            ``"max_files"``. The folder result then only holds the files found
+            until then.
+
+    Example:
+        ```python
+        {
+            "requests": 152,
+            "bytes_read": 1843221,
+            "files": 50,
+            "wall_time": 12.7,
+            "exhausted": "max_files"
+        }
+        ```
+
+    """
+
+    requests: int = 0
+    bytes_read: int = 0
+    files: int = 0
+    wall_time: float = 0.0
+    exhausted: str | None = None
+
+
+@dataclass
+class CrawlProgress(PrettyPrintDataClass):
+    """Progress of a folder crawl, passed to the ``progress`` callback of resolve.
+
+    Attributes:
+        folders (int): Folder listings fetched so far.
+        pending (int): Listings and files queued or in progress.
+        files (int): Files found so far.
+        errors (int): Subfolders and files given up on so far.
+
+    Example:
+        ```python
+        {
+            "folders": 12,
+            "pending": 40,
+            "files": 310,
+            "errors": 0
+        }
+        ```
+
+    """
+
+    folders: int = 0
+    pending: int = 0
+    files: int = 0
+    errors: int = 0
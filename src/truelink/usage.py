@@ -0,0 +1,107 @@
+"""Accounting and budgets for the resources a resolve uses."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, NoReturn
+
+from truelink.exceptions import BudgetExceededException
+from truelink.types import Usage
+
+if TYPE_CHECKING:
+    from truelink.types import FolderResult, LinkResult
+
+
+@dataclass(frozen=True)
+class Budget:
+    """Limits on what a single resolve may use; None means no limit.
+
+    Request and byte limits are checked before each request, so a resolve stops
+    at the first request that would go over them. The file limit is checked
+    before each file of a folder is resolved.
+
+    Attributes:
+        max_requests (int, optional): HTTP requests, including metadata probes
+            and retries.
+        max_files (int, optional): Files in a folder result.
+        max_bytes_read (int, optional): Response body bytes received.
+
+    """
+
+    max_requests: int | None = None
+    max_files: int | None = None
+    max_bytes_read: int | None = None
+
+
+class UsageMeter:
+    """Counts what one resolve uses and enforces its budget."""
+
+    def __init__(self, budget: Budget | None = None) -> None:
+        """Initialize the meter.
+
+        Args:
+            budget: Limits for the resolve (optional)
+
+        """
+        self.budget = budget or Budget()
+        self.requests = 0
+        self.bytes_read = 0
+        self.files = 0
+        # Name of the limit that ran out, if one did
+        self.exhausted: str | None = None
+        # Folder result being built, returned if the budget runs out
+        self.partial: FolderResult | None = None
+        self._start = time.monotonic()
+
+    def _exhaust(self, limit: str) -> NoReturn:
+        self.exhausted = limit
+        msg = f"Resolve budget exhausted: {limit}={getattr(self.budget, limit)}"
+        raise BudgetExceededException(msg)
+
+    def request(self) -> None:
+        """Count a request about to be made.
+
+        Raises:
+            BudgetExceededException: If the budget has no room for it
+
+        """
+        budget = self.budget
+        if budget.max_requests is not None and self.requests >= budget.max_requests:
+            self._exhaust("max_requests")
+        if (
+            budget.max_bytes_read is not None
+            and self.bytes_read >= budget.max_bytes_read
+        ):
+            self._exhaust("max_bytes_read")
+        self.requests += 1
+
+    def read(self, size: int) -> None:
+        """Count response body bytes received."""
+        self.bytes_read += size
+
+    def file(self) -> None:
+        """Count a folder file about to be resolved.
+
+        Raises:
+            BudgetExceededException: If the budget has no room for it
+
+        """
+        if self.budget.max_files is not None and self.files >= self.budget.max_files:
+            self._exhaust("max_files")
+        self.files += 1
+
+    def elapsed(self) -> float:
+        """Return the seconds since the resolve started."""
+        return time.monotonic() - self._start
+
+    def usage(self, result: LinkResult | FolderResult) -> Usage:
+        """Return what the resolve used to produce a result."""
+        contents = getattr(result, "contents", None)
+        return Usage(
+            requests=self.requests,
+            bytes_read=self.bytes_read,
+            files=1 if contents is None else len(contents),
+            wall_time=self.elapsed(),
+            exhausted=self.exhausted,
+        )
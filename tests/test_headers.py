@@ -0,0 +1,119 @@
+"""Tests for truelink.headers."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+
+import pytest
+
+from truelink.headers import (
+    content_disposition_filename,
+    parse_content_disposition,
+    parse_retry_after,
+)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ('attachment; filename="movie.mkv"', "movie.mkv"),
+        ('inline;filename="a b.txt";', "a b.txt"),
+        ("attachment; filename=bare name.zip", "bare name.zip"),
+        ('attachment; filename="../../etc/passwd"', "passwd"),
+        ('attachment; filename="C:\\\\dir\\\\file.bin"', "file.bin"),
+        ('attachment; filename=""', None),
+        ("attachment", None),
+    ],
+)
+def test_plain_filename(value: str, expected: str | None) -> None:
+    """A plain filename parameter, with directory parts dropped."""
+    assert content_disposition_filename(value) == expected
+
+
+def test_quoted_pair() -> None:
+    """Backslash escapes in a quoted-string are undone."""
+    value = r'attachment; filename="say \"hi\".txt"'
+    assert content_disposition_filename(value) == 'say "hi".txt'
+    assert parse_content_disposition(value)[1]["filename"] == 'say "hi".txt'
+
+
+def test_quoted_semicolon() -> None:
+    """A semicolon inside quotes does not end the parameter."""
+    value = 'attachment; filename="a;b.txt"; size=3'
+    assert content_disposition_filename(value) == "a;b.txt"
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("attachment; filename*=UTF-8''na%C3%AFve.txt", "naïve.txt"),
+        ("attachment; filename*=utf-8'en'%E2%82%AC%20rates.pdf", "€ rates.pdf"),
+        ("attachment; filename*=iso-8859-1''caf%E9.txt", "café.txt"),
+        (
+            "attachment; filename=\"fallback.txt\"; filename*=UTF-8''real.txt",
+            "real.txt",
+        ),
+        (
+            "attachment; filename*=UTF-8''real.txt; filename=\"fallback.txt\"",
+            "real.txt",
+        ),
+    ],
+)
+def test_extended_filename(value: str, expected: str) -> None:
+    """filename* is decoded and preferred over filename."""
+    assert content_disposition_filename(value) == expected
+
+
+def test_unknown_charset_falls_back_to_filename() -> None:
+    """An undecodable filename* leaves the plain filename in use."""
+    value = "attachment; filename=\"plain.txt\"; filename*=x-nope''other.txt"
+    assert content_disposition_filename(value) == "plain.txt"
+    assert parse_content_disposition(value)[1]["filename"] == "plain.txt"
+
+
+def test_bare_percent_encoded_extended_value() -> None:
+    """filename* without a charset is read as percent-encoded UTF-8."""
+    value = "attachment; filename*=%E6%97%A5%E6%9C%AC.txt"
+    assert content_disposition_filename(value) == "日本.txt"
+
+
+def test_encoded_words() -> None:
+    """RFC 2047 encoded words in filename are decoded."""
+    value = 'attachment; filename="=?UTF-8?B?w6l0w6kudHh0?="'
+    assert content_disposition_filename(value) == "été.txt"
+
+
+def test_parse_content_disposition() -> None:
+    """Type and names are lowercased; extended values win."""
+    disposition, params = parse_content_disposition(
+        "Attachment; FileName=\"a.txt\"; filename*=UTF-8''b.txt; size=10"
+    )
+    assert disposition == "attachment"
+    assert params == {"filename": "b.txt", "size": "10"}
+    assert parse_content_disposition('filename="a.txt"')[0] is None
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("120", 120.0),
+        (" 0 ", 0.0),
+        (None, None),
+        ("", None),
+        ("-5", None),
+        ("soon", None),
+        ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0),
+    ],
+)
+def test_retry_after(value: str | None, expected: float | None) -> None:
+    """Seconds, past dates and invalid values."""
+    assert parse_retry_after(value) == expected
+
+
+def test_retry_after_future_date() -> None:
+    """A date in the future is the time left until it."""
+    when = datetime.now(UTC) + timedelta(seconds=90)
+    delay = parse_retry_after(format_datetime(when, usegmt=True))
+    assert delay is not None
+    assert 85 <= delay <= 90
@@ -0,0 +1,137 @@
+"""Tests for truelink.jsliteral."""
+
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from truelink.jsliteral import JSLiteralError, find_js_assignment, parse_js_literal
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ('"double"', "double"),
+        ("'single'", "single"),
+        ("`template`", "template"),
+        ("'it\\'s'", "it's"),
+        ('"say \\"hi\\""', 'say "hi"'),
+        ("`two\nlines`", "two\nlines"),
+        ("''", ""),
+    ],
+)
+def test_quotes(text: str, expected: str) -> None:
+    """Strings in every quote style."""
+    assert parse_js_literal(text) == (expected, len(text))
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        (r"'a\nb\tc'", "a\nb\tc"),
+        (r"'\x41B\u{43}'", "ABC"),
+        (r"'\u{1F600}'", "\U0001f600"),
+        (r"'😀'", "\U0001f600"),
+        (r"'\/\q'", "/q"),
+        ("'line\\\ncontinued'", "linecontinued"),
+        (r"'\0'", "\0"),
+    ],
+)
+def test_escapes(text: str, expected: str) -> None:
+    """Simple, hex, unicode and line continuation escapes."""
+    assert parse_js_literal(text)[0] == expected
+
+
+@pytest.mark.parametrize("escape", [r"\u{110000}", r"\u{FFFFFFFFFF}"])
+def test_code_point_out_of_range(escape: str) -> None:
+    """Escapes past U+10FFFF raise JSLiteralError with their offset."""
+    with pytest.raises(JSLiteralError) as excinfo:
+        parse_js_literal(f'["ab{escape}"]')
+    assert excinfo.value.pos == 4
+
+
+def test_out_of_range_assignment_is_skipped() -> None:
+    """find_js_assignment moves on to the next assignment."""
+    text = r"data = '\u{110000}'; data = {ok: 1}"
+    assert find_js_assignment(text, "data") == {"ok": 1}
+
+
+def test_comments() -> None:
+    """Line and block comments are skipped between tokens."""
+    text = """{
+        // a line comment
+        a: 1, /* a block
+        comment */ b: [2 /* inline */, 3],
+        c: "not // a comment"
+    }"""
+    assert parse_js_literal(text)[0] == {
+        "a": 1,
+        "b": [2, 3],
+        "c": "not // a comment",
+    }
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("[1, 2, ]", [1, 2]),
+        ("{a: 1,}", {"a": 1}),
+        ("[]", []),
+        ("{ }", {}),
+    ],
+)
+def test_trailing_commas(text: str, expected: object) -> None:
+    """A comma before the closing bracket is allowed."""
+    assert parse_js_literal(text)[0] == expected
+
+
+def test_nesting() -> None:
+    """Objects and arrays nest, with bare and quoted keys."""
+    text = "{sources: [{'1080p': {url: 'a', size: 1e3}}, [null, true]], $x: -0x10}"
+    assert parse_js_literal(text)[0] == {
+        "sources": [{"1080p": {"url": "a", "size": 1000.0}}, [None, True]],
+        "$x": -16,
+    }
+
+
+def test_deep_nesting() -> None:
+    """Nesting past the recursion limit raises JSLiteralError."""
+    with pytest.raises(JSLiteralError):
+        parse_js_literal("[" * 100_000)
+
+
+def test_words() -> None:
+    """undefined, NaN and Infinity are accepted."""
+    value = parse_js_literal("[undefined, NaN, Infinity, false]")[0]
+    assert value[0] is None
+    assert math.isnan(value[1])
+    assert value[2:] == [math.inf, False]
+
+
+def test_end_offset() -> None:
+    """The offset returned is just past the literal."""
+    text = "  {a: 1}; rest"
+    value, end = parse_js_literal(text)
+    assert value == {"a": 1}
+    assert text[end:] == "; rest"
+
+
+@pytest.mark.parametrize("text", ["{a 1}", "[1 2]", "'open", "{: 1}", "nope", ""])
+def test_invalid(text: str) -> None:
+    """Malformed literals raise JSLiteralError."""
+    with pytest.raises(JSLiteralError):
+        parse_js_literal(text)
+
+
+def test_find_js_assignment() -> None:
+    """Declarations and property assignments, but not other names."""
+    text = """
+        var otherdata = [0];
+        if (data == 1) {}
+        const data = {a: [1, 2]};
+        window.data = 'late';
+    """
+    assert find_js_assignment(text, "data") == {"a": [1, 2]}
+    assert find_js_assignment("window.cfg = {x: 1}", "cfg") == {"x": 1}
+    assert find_js_assignment("var other = 1", "data") is None